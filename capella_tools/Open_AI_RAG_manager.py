@@ -12,7 +12,6 @@
 
 import sys
 
-from openai import OpenAI
 from IPython.display import display, Markdown
 from IPython.core.display import HTML
 from ipywidgets import widgets
@@ -34,10 +33,13 @@ from pyvis.network import Network
 import nbformat
 from docx import Document
 import PyPDF2
-from capella_tools.model_configurator import get_api_key, get_base_url, get_model
+from capella_tools.model_configurator import get_api_key, get_base_url, get_model, get_openai_client
+from capella_tools.rag_context import DocumentRetriever, YAMLContextBuilder, count_tokens
 Network(notebook=True)
 import traceback
+import html
 from pathlib import Path
+from openai import BadRequestError
 
 
 class ChatGPTAnalyzer:
@@ -79,15 +81,69 @@ class ChatGPTAnalyzer:
         print(f"🤖 Model: {self.llm_model}")
         self.yaml_content = yaml_content or ""
         self.chat_active = True
+        self.stream = False                  # get_response shows tokens as they arrive
+        self.stream_refresh_interval = 0.25  # Seconds between updates of the streamed output
+        self.last_response_timing = None     # Time to first token and total time of the last response
+        self.context_builder = None          # Packs the YAML into a token budget (see set_context_budget)
+        self.context_budget = None           # Token limits of set_context_budget
+        self.prompts = []                    # User prompts, used to rank the YAML objects
+        self.document_retriever = None       # Chunked retrieval over attached files (see enable_document_retrieval)
+        self.document_top_k = 5              # Attached-file chunks sent per request
+        self._documents_message = None
         self.messages = []
+        self._yaml_message = None
         if self.yaml_content:
-            self.messages.append({
+            self._yaml_message = {
                 "role": "system",
-                "content": f"You are an expert in analyzing YAML files for system design. Here is the YAML file:\n---\n{self.yaml_content}\n---",
-            })
+                "content": self._yaml_system_content(self.yaml_content),
+            }
+            self.messages.append(self._yaml_message)
+
+    @staticmethod
+    def _yaml_system_content(yaml_content):
+        return f"You are an expert in analyzing YAML files for system design. Here is the YAML file:\n---\n{yaml_content}\n---"
+
+    def set_context_budget(self, max_context_tokens, reserve_response_tokens=4000, reserve_history_tokens=4000):
+        """
+        Send only the YAML objects most relevant to the prompt, within a token budget.
 
+        Before each request, the objects of the YAML are ranked by BM25
+        relevance to the latest prompts and packed into what is left of
+        max_context_tokens after the response reserve and the conversation
+        history (at least reserve_history_tokens). What was dropped is printed
+        and kept in context_builder.last_report.
+
+        :param max_context_tokens: Context window of the model, or a lower cost limit.
+        :param reserve_response_tokens: Tokens kept free for the response.
+        :param reserve_history_tokens: Tokens kept free for the conversation history as it grows.
+        """
+        if self.context_builder is None:
+            self.context_builder = YAMLContextBuilder(self.yaml_content, model=self.llm_model)
+        self.context_budget = {
+            "max_context_tokens": max_context_tokens,
+            "reserve_response_tokens": reserve_response_tokens,
+            "reserve_history_tokens": reserve_history_tokens,
+        }
+
+    def _apply_context_budget(self):
+        """Replace the YAML system message with the objects that fit the budget for the latest prompts."""
+        if self.context_budget is None or self._yaml_message is None:
+            return
+        history_tokens = sum(
+            count_tokens(message["content"], self.llm_model)
+            for message in self.messages if message is not self._yaml_message and message.get("content")
+        )
+        budget = (self.context_budget["max_context_tokens"] - self.context_budget["reserve_response_tokens"]
+                  - max(history_tokens, self.context_budget["reserve_history_tokens"])
+                  - count_tokens(self._yaml_system_content(""), self.llm_model))
+        if budget <= 0:
+            print(f"⚠️ The conversation ({history_tokens} tokens) leaves no room for the YAML in the context budget.")
+        yaml_context = self.context_builder.build(" ".join(self.prompts[-2:]), max(budget, 0))
+        self._yaml_message["content"] = self._yaml_system_content(yaml_context)
+        self.context_builder.print_report()
 
     def submit_prompt(self, user_prompt, is_initial=True):
+        self.prompts.append(user_prompt)
         user_prompt = user_prompt + " Format the response in .html format." if is_initial else user_prompt
         self.messages.append({"role": "user", "content": user_prompt})
         display(Markdown(f"**Your prompt:** {user_prompt}"))
@@ -95,7 +151,7 @@ class ChatGPTAnalyzer:
     initial_prompt = lambda self, prompt: self.submit_prompt(prompt, is_initial=True)
     follow_up_prompt = lambda self, prompt: self.submit_prompt(prompt, is_initial=False)
 
-    def add_text_file_to_messages(self, filepath):
+    def _read_file_text(self, filepath):
         ext = os.path.splitext(filepath)[1].lower()
         if ext not in self.ALLOWED_EXTENSIONS:
             raise ValueError(f"Unsupported file type '{ext}'. Allowed types are: {', '.join(self.ALLOWED_EXTENSIONS)}")
@@ -106,12 +162,62 @@ class ChatGPTAnalyzer:
         elif ext in self.PDF_EXTS:
             with open(filepath, 'rb') as f:
                 reader = PyPDF2.PdfReader(f)
-                content = "\n".join(page.extract_text() for page in reader.pages if page.extract_text())
+                pages = (page.extract_text() for page in reader.pages)
+                content = "\n".join(text for text in pages if text)
         elif ext in self.DOCX_EXTS:
             doc = Document(filepath)
             content = "\n".join([p.text for p in doc.paragraphs])
         else:
             content = ""
+        return content
+
+    def enable_document_retrieval(self, embedding_manager=None, top_k=5, store_dir="document_store",
+                                  chunk_tokens=400, overlap_tokens=50):
+        """
+        Send only the most relevant chunks of attached files with each prompt.
+
+        After this, add_text_file_to_messages splits a file into chunks and
+        embeds them once (stored in store_dir by file hash, so re-attaching
+        a file is a cache hit); each request then carries the top_k chunks for
+        the latest prompts instead of the whole files.
+
+        :param embedding_manager: EmbeddingManager to embed with (default: the
+            default embeddings configuration).
+        """
+        if embedding_manager is None:
+            from capella_tools.capella_embeddings_manager import EmbeddingManager
+            embedding_manager = EmbeddingManager()
+        self.document_retriever = DocumentRetriever(embedding_manager, store_dir=store_dir,
+                                                    chunk_tokens=chunk_tokens, overlap_tokens=overlap_tokens)
+        self.document_top_k = top_k
+
+    def _apply_document_retrieval(self):
+        """Refresh the message holding the attached-file chunks for the latest prompts."""
+        if self.document_retriever is None or not self.document_retriever.documents:
+            return
+        excerpts = self.document_retriever.context(" ".join(self.prompts[-2:]), self.document_top_k)
+        content = f"Relevant excerpts of the attached files:\n---\n{excerpts}\n---"
+        if self._documents_message is None:
+            self._documents_message = {"role": "system", "content": content}
+            position = self.messages.index(self._yaml_message) + 1 if self._yaml_message in self.messages else 0
+            self.messages.insert(position, self._documents_message)
+        else:
+            self._documents_message["content"] = content
+
+    def add_text_file_to_messages(self, filepath):
+        content = self._read_file_text(filepath)
+
+        if self.document_retriever is not None:
+            attached = len(self.document_retriever.documents)
+            chunks = self.document_retriever.add_file(filepath, content)
+            if len(self.document_retriever.documents) == attached:
+                return  # same content attached before
+            self.messages.append({
+                "role": "user",
+                "content": f"File `{filepath}` was added for analysis; its relevant excerpts are provided with each prompt."
+            })
+            print(f"✅ File `{filepath}` added for retrieval ({chunks} chunk(s)).")
+            return
 
         self.messages.append({
             "role": "user",
@@ -119,55 +225,123 @@ class ChatGPTAnalyzer:
         })
         print(f"✅ File `{filepath}` added to messages for analysis.")
         
-    def get_response(self):
-        """Send messages to ChatGPT and get a response with separate token usage info."""
+    @staticmethod
+    def _clean_response(assistant_message):
+        """Strip code fences around the response and remove <script>/<style> tags."""
+        if assistant_message.startswith("```html"):
+            assistant_message = assistant_message[7:]
+        if assistant_message.endswith("```"):
+            assistant_message = assistant_message[:-3]
+        if assistant_message.startswith("```python"):
+            assistant_message = assistant_message[9:]
+        soup = BeautifulSoup(assistant_message, "html.parser")
+        for tag in soup(["script", "style"]):
+            tag.decompose()
+        return str(soup)
+
+    @staticmethod
+    def _is_html_response(assistant_message_cleaned):
+        return "<table" in assistant_message_cleaned or "<html" in assistant_message_cleaned
+
+    def _completion_options(self):
+        return dict(
+            messages=self.messages,
+            model=self.llm_model,
+            seed=42,            #  repeatability
+            temperature=0.0,    #  deterministic choice of highest-probability token
+            top_p=1.0,          #  disables nucleus sampling (keeps distribution intact)
+            presence_penalty=0, #  don't bias against repetition unless you want to
+            frequency_penalty=0 #  same here
+        )
+
+    def _stream_completion(self, client, start):
+        """
+        Stream a completion into an updating widget.
+
+        Returns (full text, usage or None, seconds to the first token). The
+        partial text is cleaned like the final one before it is shown, at most
+        every self.stream_refresh_interval seconds.
+        """
+        live = widgets.HTML(value="<i>Waiting for the first token...</i>")
+        display(live)
+        options = self._completion_options()
+        try:
+            stream = client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **options)
+        except BadRequestError:
+            # Some OpenAI-compatible servers reject stream_options; stream without usage then.
+            stream = client.chat.completions.create(stream=True, **options)
+        parts = []
+        usage = None
+        first_token_s = None
+        last_refresh = 0.0
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if first_token_s is None:
+                first_token_s = time.perf_counter() - start
+            parts.append(delta)
+            now = time.perf_counter()
+            if now - last_refresh >= self.stream_refresh_interval:
+                last_refresh = now
+                partial = self._clean_response("".join(parts))
+                live.value = partial if "<" in partial else f"<pre style='white-space: pre-wrap'>{html.escape(partial)}</pre>"
+        live.close()
+        return "".join(parts), usage, first_token_s
+
+    def get_response(self, stream=None):
+        """
+        Send messages to ChatGPT and get a response with separate token usage info.
+
+        :param stream: Show the response while it is generated (default: self.stream).
+            The final, cleaned response is displayed as without streaming.
+        """
         # inside your Open_AI_RAG_manager
+        stream = self.stream if stream is None else stream
 
         try:
-            client = OpenAI(api_key=self.api_key, base_url=self.llm_url )
-            response = client.chat.completions.create(
-                messages=self.messages,
-                model=self.llm_model,
-                seed=42,            #  repeatability
-                temperature=0.0,    #  deterministic choice of highest-probability token
-                top_p=1.0,          #  disables nucleus sampling (keeps distribution intact)
-                presence_penalty=0, #  don't bias against repetition unless you want to
-                frequency_penalty=0 #  same here
-            )
-            assistant_message = response.choices[0].message.content
-            usage = response.usage
+            client = get_openai_client(api_key=self.api_key, base_url=self.llm_url)
+            self._apply_document_retrieval()
+            self._apply_context_budget()
+            start = time.perf_counter()
+            if stream:
+                assistant_message, usage, first_token_s = self._stream_completion(client, start)
+            else:
+                response = client.chat.completions.create(**self._completion_options())
+                assistant_message = response.choices[0].message.content
+                usage = response.usage
+                first_token_s = None
+            total_s = time.perf_counter() - start
+            self.last_response_timing = {"time_to_first_token_s": first_token_s, "total_s": total_s}
             token_usage_info = (
                 f"Tokens used: prompt={usage.prompt_tokens}, "
                 f"completion={usage.completion_tokens}, total={usage.total_tokens}"
             ) if usage else "Token usage unavailable."
-    
+            if first_token_s is not None:
+                token_usage_info += f"  \nTime to first token: {first_token_s:.2f}s, total: {total_s:.2f}s"
+            else:
+                token_usage_info += f"  \nTotal time: {total_s:.2f}s"
+
             self.messages.append({"role": "assistant", "content": assistant_message})
-            
-            # Strip unwanted code fences
-            if assistant_message.startswith("```html"):
-                assistant_message = assistant_message[7:]
-            if assistant_message.endswith("```"):
-                assistant_message = assistant_message[:-3]
-            if assistant_message.startswith("```python"):
-                assistant_message = assistant_message[9:]
-            # Clean up with BeautifulSoup
-
-            soup = BeautifulSoup(assistant_message, "html.parser")
-            for tag in soup(["script", "style"]):
-                tag.decompose()
-            assistant_message_cleaned = str(soup)
-    
+
+            # Strip unwanted code fences and clean up with BeautifulSoup
+            assistant_message_cleaned = self._clean_response(assistant_message)
+
             # Display response and then token usage separately
-            if "<table" in assistant_message_cleaned or "<html" in assistant_message_cleaned:
+            if self._is_html_response(assistant_message_cleaned):
                 display(HTML(assistant_message_cleaned))
             else:
                 display(Markdown(f"**Response:**\n\n{assistant_message_cleaned}"))
-    
+
             # Display token info separately
             display(Markdown(f"**Token Usage Info:**\n\n{token_usage_info}"))
-    
+
             return assistant_message_cleaned
-    
+
         except Exception as e:
             error_type = type(e).__name__
             tb = traceback.format_exc()
@@ -11,12 +11,16 @@ import re
 import unicodedata
 import sys
 from pathlib import Path
-from openai import OpenAI, APIConnectionError, APITimeoutError, APIStatusError, BadRequestError
+from openai import APIConnectionError, APITimeoutError, APIStatusError, BadRequestError, RateLimitError
 from IPython.display import display, Markdown
 from IPython.core.display import HTML
 import numpy as np
 import json
 import os
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from bs4 import BeautifulSoup
 from ipywidgets import widgets
@@ -25,8 +29,306 @@ import time
 from IPython import get_ipython
 from jupyter_ui_poll import ui_events
 import time
+import random
+import threading
 import traceback
-from capella_tools.model_configurator import get_api_key, get_base_url, get_model
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from capella_tools.model_configurator import get_api_key, get_base_url, get_model, get_openai_client
+from capella_tools.embedding_index import (
+    BM25Index, build_index, index_file, load_index, recall_at_k, reciprocal_rank_fusion, rows_checksum,
+)
+
+
+class _TokenBucket:
+    """Thread-safe token bucket holding at most one minute of budget."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        """Block until ``amount`` tokens are available and take them."""
+        # A request larger than the bucket waits for a full bucket.
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _json_default(value):
+    """json.dump fallback for NumPy vectors (e.g. rows of a memory-mapped store)."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _normalized_matrix(items):
+    """Stack the "embedding" of each item into a row-normalized float32 matrix."""
+    if not items:
+        return np.zeros((0, 0), dtype=np.float32)
+    matrix = np.asarray([item["embedding"] for item in items], dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0  # zero vectors keep a similarity of 0
+    matrix /= norms
+    return matrix
+
+
+def _binary_items_file(npy_file):
+    """Metadata side-car of a binary embedding store: model.npy -> model.items.json."""
+    return Path(npy_file).with_suffix(".items.json")
+
+
+def _write_binary_store(npy_file, meta, items):
+    """
+    Write items with an "embedding" as a row-normalized float32 .npy matrix
+    plus a JSON side-car holding the meta and the items without vectors.
+    """
+    items = [item for item in items if item.get("embedding") is not None]
+    matrix = _normalized_matrix(items)
+    meta = dict(meta, format="npy", count=len(items), dim=int(matrix.shape[1]), normalized=True)
+    npy_file = Path(npy_file)
+    tmp_file = npy_file.with_name(npy_file.name + ".tmp")
+    with open(tmp_file, "wb") as f:
+        np.save(f, matrix)
+    os.replace(tmp_file, npy_file)
+    items_file = _binary_items_file(npy_file)
+    with open(items_file, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": meta,
+            "items": [{k: v for k, v in item.items() if k != "embedding"} for item in items],
+        }, f)
+    return meta
+
+
+def _read_binary_store(npy_file):
+    """
+    Open a binary embedding store without reading the vectors.
+
+    The matrix is memory-mapped read-only, so loading is near-instant and
+    several kernels opening the same file share its pages. Each item gets its
+    matrix row (a view, not a copy) as "embedding".
+    Returns (meta, items, matrix).
+    """
+    with open(_binary_items_file(npy_file), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    meta = data.get("meta")
+    items = data.get("items", [])
+    matrix = np.load(npy_file, mmap_mode="r")
+    if len(items) != matrix.shape[0]:
+        raise ValueError(f"{npy_file} has {matrix.shape[0]} vectors but its side-car lists {len(items)} items")
+    # Plain ndarray views of the mapped buffer; slicing a memmap row by row is slow.
+    for item, row in zip(items, np.asarray(matrix)):
+        item["embedding"] = row
+    return meta, items, matrix
+
+
+def convert_embedding_file(json_file, npy_file=None):
+    """
+    Convert a JSON embedding file ({"meta","items"} or legacy list) to the binary store.
+
+    :param json_file: Existing JSON embedding file.
+    :param npy_file: Target .npy file (default: json_file with a .npy suffix).
+    :return: Path of the .npy file; its side-cars are <name>.items.json and <name>.npy.meta.json.
+    """
+    npy_file = Path(npy_file) if npy_file else Path(json_file).with_suffix(".npy")
+    with open(json_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        meta, items = {}, data
+    else:
+        meta, items = data.get("meta") or {}, data.get("items", [])
+    meta = _write_binary_store(npy_file, meta, items)
+    _write_meta_file(npy_file, meta, meta["count"])
+    print(f"✅ Converted {meta['count']} embeddings from {json_file} to {npy_file}")
+    return npy_file
+
+
+def _meta_file(embedding_file):
+    """Meta side-car of an embedding file: model.json -> model.json.meta.json, model.npy -> model.npy.meta.json."""
+    embedding_file = Path(embedding_file)
+    return embedding_file.with_name(embedding_file.name + ".meta.json")
+
+
+def _write_meta_file(embedding_file, meta, count):
+    """
+    Write the meta side-car of an embedding file, so freshness checks need not parse the vectors.
+
+    The side-car records the embedding file size; a side-car that does not
+    match its embedding file (e.g. the file was rewritten by an older version)
+    is ignored by _read_meta_file.
+    """
+    with open(_meta_file(embedding_file), "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "count": count, "file_size": os.path.getsize(embedding_file)}, f)
+
+
+def _read_meta_file(embedding_file):
+    """Return (meta, count) from the meta side-car, or None if it is missing or stale."""
+    try:
+        with open(_meta_file(embedding_file), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("file_size") != os.path.getsize(embedding_file):
+            return None
+        return data.get("meta"), data.get("count", 0)
+    except (OSError, ValueError):
+        return None
+
+
+def _checkpoint_file(embedding_file):
+    """Checkpoint of an embedding run: model.json -> model.json.checkpoint.jsonl."""
+    embedding_file = Path(embedding_file)
+    return embedding_file.with_name(embedding_file.name + ".checkpoint.jsonl")
+
+
+class EmbeddingCheckpoint:
+    """
+    Append-only JSON Lines log of completed embeddings.
+
+    Each line holds one object's UUID, text hash, LLM model and vector. Lines
+    are flushed and fsync'ed per append, so a crash loses at most the batch in
+    flight; a torn last line is skipped when reading.
+
+    :param path: The .checkpoint.jsonl file.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+
+    def load(self, model):
+        """Return {uuid: (text_hash, embedding)} of the entries made with ``model``."""
+        entries = {}
+        if not self.path.exists():
+            return entries
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn write of an interrupted run
+                if entry.get("llm_model") == model and entry.get("embedding") is not None:
+                    entries[entry.get("uuid")] = (entry.get("text_hash"), entry["embedding"])
+        return entries
+
+    def append(self, model, objects):
+        """Durably append the objects' embeddings."""
+        if not objects:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        for obj in objects:
+            self._file.write(json.dumps({
+                "uuid": obj.get("uuid"),
+                "text_hash": obj.get("text_hash"),
+                "llm_model": model,
+                "embedding": obj["embedding"],
+            }, default=_json_default) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Delete the checkpoint, e.g. once its embeddings are saved."""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+
+
+class QueryEmbeddingCache:
+    """
+    LRU cache of query text -> embedding vector, per embedding model.
+
+    Keys are the model name and the query text with case and whitespace
+    normalized, so repeated and near-identical queries skip the API. With a
+    path, entries are also kept in a small SQLite file and survive restarts.
+
+    :param max_size: Entries kept in memory.
+    :param path: Optional SQLite file for a persistent cache.
+    :param max_disk_entries: Entries kept in the SQLite file.
+    """
+
+    def __init__(self, max_size=256, path=None, max_disk_entries=10000):
+        self.max_size = max_size
+        self.max_disk_entries = max_disk_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "model TEXT, query TEXT, vector BLOB, used REAL, PRIMARY KEY (model, query))"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def normalize(text):
+        return " ".join(str(text).casefold().split())
+
+    def get(self, model, text):
+        """Return the cached vector (float32 array) or None."""
+        key = (model, self.normalize(text))
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT vector FROM query_embeddings WHERE model = ? AND query = ?", key).fetchone()
+                if row is not None:
+                    vector = np.frombuffer(row[0], dtype=np.float32)
+                    self._db.execute(
+                        "UPDATE query_embeddings SET used = ? WHERE model = ? AND query = ?", (time.time(), *key))
+                    self._db.commit()
+                    self._remember(key, vector)
+            if vector is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return vector
+
+    def put(self, model, text, vector):
+        key = (model, self.normalize(text))
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._remember(key, vector)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO query_embeddings VALUES (?, ?, ?, ?)",
+                    (*key, vector.tobytes(), time.time()))
+                self._db.execute(
+                    "DELETE FROM query_embeddings WHERE rowid IN (SELECT rowid FROM query_embeddings "
+                    "ORDER BY used DESC LIMIT -1 OFFSET ?)", (self.max_disk_entries,))
+                self._db.commit()
+
+    def _remember(self, key, vector):
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
 
 
 class EmbeddingManager:
@@ -80,8 +382,7 @@ class EmbeddingManager:
         self.llm_url = nonempty(base_url) or nonempty(config.get("base_url")) or get_base_url()
         self.model = nonempty(model) or nonempty(config.get("model")) or get_model()
 
-        from openai import OpenAI
-        self.client = OpenAI(api_key=self.api_key, base_url=self.llm_url)
+        self.client = get_openai_client(api_key=self.api_key, base_url=self.llm_url)
 
         print(f"✅ EmbeddingManager initialized")
         print(f"🔐 API Key: {'Provided' if api_key else 'Loaded from secrets'}")
@@ -99,6 +400,24 @@ class EmbeddingManager:
         self.selection_done = False       # ✅ Flag to signal completion
         self.embeddings = []              # The list of items currently in memory
         self._last_loaded_meta = None     # Meta from file (if any)
+        self._loaded_signature = None     # Embedding file signature self.embeddings matches (see load_embeddings)
+        self.batch_size = 64              # Texts per embeddings request
+        self.max_batch_tokens = 8000      # Estimated tokens per embeddings request
+        self.max_concurrent_requests = 1  # Embeddings requests in flight
+        self.max_retries = 4              # Retries on connection errors, timeouts and 429
+        self.checkpoint_embeddings = True # Log completed vectors to <embedding file>.checkpoint.jsonl
+        self._matrix = None               # Normalized float32 embedding matrix (see _get_matrix)
+        self._matrix_items = []           # Item of each matrix row
+        self._matrix_source = None        # (id, len) of the embeddings list the matrix was built from
+        self._matrix_checksum = None      # UUID checksum of the matrix rows (see _rows_checksum)
+        self._field_rows = {}             # field -> value -> matrix rows (see _filter_rows)
+        self._lexical = None              # (BM25Index, exact-match rows) of the matrix rows
+        self.query_cache = QueryEmbeddingCache()  # Query text -> vector (see set_query_cache)
+        self.ann_index = None             # Optional ANN index (see build_ann_index)
+        self.ann_threshold = 20000        # Below this many vectors, search exactly
+        self.compression = None           # CompressedIndex parameters applied at save time (see set_compression)
+        self._request_bucket = None       # Requests/minute limiter (see set_concurrency)
+        self._token_bucket = None         # Tokens/minute limiter (see set_concurrency)
 
     # ---------- File + meta handling ----------
 
@@ -111,28 +430,47 @@ class EmbeddingManager:
     def _now_iso(self) -> str:
         return datetime.now(timezone.utc).replace(tzinfo=timezone.utc).isoformat().replace("+00:00", "Z")
 
+    def _is_binary_store(self):
+        """True if the embedding file is a binary .npy store (see _write_binary_store)."""
+        return Path(self.embedding_file).suffix.lower() == ".npy"
+
     def save_embeddings(self):
-        """Save embeddings + meta to a JSON file (backward compatible loader)."""
+        """Save embeddings + meta to a JSON file (backward compatible loader), or to a binary .npy store."""
         meta = {
             "created_at": self._now_iso(),
             "llm_model": self.model,
             "capella_model_name": self._capella_model_name_from_aird(),
         }
-        payload = {
-            "meta": meta,
-            "items": self.embeddings,
-        }
-        with open(self.embedding_file, "w", encoding="utf-8") as f:
-            json.dump(payload, f)
+        if self._is_binary_store():
+            meta = _write_binary_store(self.embedding_file, meta, self.embeddings)
+            count = meta["count"]
+        else:
+            payload = {
+                "meta": meta,
+                "items": self.embeddings,
+            }
+            with open(self.embedding_file, "w", encoding="utf-8") as f:
+                json.dump(payload, f, default=_json_default)
+            count = len(self.embeddings)
+        _write_meta_file(self.embedding_file, meta, count)
+        # Everything the checkpoint held is in the embedding file now.
+        EmbeddingCheckpoint(_checkpoint_file(self.embedding_file)).remove()
         self._last_loaded_meta = meta
+        self._loaded_signature = self._embedding_file_signature()
+        if self.compression is not None and self.embeddings:
+            self.build_ann_index("compressed", **self.compression)
+            self.save_ann_index()
 
     def set_files(self, model_file, embedding_file):
-        """Set model (.aird) file and embedding file."""
+        """Set model (.aird) file and embedding file (.json, or .npy for the binary store)."""
         self.model_file = model_file
         self.embedding_file = embedding_file
 
     def _read_embedding_file(self):
         """Internal: read the embedding file JSON and normalize shape."""
+        if self._is_binary_store():
+            meta, items, _ = _read_binary_store(self.embedding_file)
+            return meta, items
         with open(self.embedding_file, "r", encoding="utf-8") as f:
             data = json.load(f)
 
@@ -146,6 +484,36 @@ class EmbeddingManager:
 
         return meta, items
 
+    def _embedding_file_signature(self):
+        """(path, size, mtime) of the embedding file, or None if it does not exist."""
+        try:
+            stat = os.stat(self.embedding_file)
+        except OSError:
+            return None
+        return (os.path.abspath(self.embedding_file), stat.st_size, stat.st_mtime_ns)
+
+    def _embeddings_match_file(self):
+        """True if self.embeddings were loaded from (or saved to) the embedding file as it is now."""
+        signature = self._embedding_file_signature()
+        return signature is not None and signature == self._loaded_signature
+
+    def _read_embedding_meta(self):
+        """
+        Return (meta, count) of the embedding file, reading only the meta side-car.
+
+        Files without a valid side-car (written before side-cars existed) are
+        read in full once and get a side-car for the next check.
+        """
+        cached = _read_meta_file(self.embedding_file)
+        if cached is not None:
+            return cached
+        meta, items = self._read_embedding_file()
+        try:
+            _write_meta_file(self.embedding_file, meta, len(items))
+        except OSError as e:
+            print(f"⚠️ Could not write meta side-car {_meta_file(self.embedding_file)}: {e}")
+        return meta, len(items)
+
     def is_embedding_up_to_date(self):
         """
         Check whether the current embedding file matches the model + metadata
@@ -181,7 +549,7 @@ class EmbeddingManager:
             return False
 
         try:
-            meta, _ = self._read_embedding_file()
+            meta, _ = self._read_embedding_meta()
         except Exception as e:
             print(f"❌ Failed to read embedding file JSON: {e}")
             return False
@@ -223,7 +591,7 @@ class EmbeddingManager:
         if not os.path.exists(self.embedding_file):
             return {"path": self.embedding_file, "meta": None, "count": 0}
 
-        meta, items = self._read_embedding_file()
+        meta, count = self._read_embedding_meta()
         # If legacy, meta will be None; fabricate a minimal meta for convenience
         if meta is None:
             meta = {
@@ -231,7 +599,7 @@ class EmbeddingManager:
                 "llm_model": None,
                 "capella_model_name": self._capella_model_name_from_aird(),
             }
-        return {"path": self.embedding_file, "meta": meta, "count": len(items)}
+        return {"path": self.embedding_file, "meta": meta, "count": count}
 
     def retrieve_embedding_artifact(self):
         """
@@ -264,16 +632,81 @@ class EmbeddingManager:
             raise ValueError(f"Empty embedding text for uuid={obj.get('uuid')}")
         return metadata_text
 
-    def _create_embedding_once(self, text: str, *, context: str = ""):
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token count (about 4 characters per token), used to size batches."""
+        return len(text) // 4 + 1
+
+    def _make_batches(self, texts, batch_size=None, max_batch_tokens=None):
+        """Split text indices into batches of at most batch_size texts and max_batch_tokens tokens."""
+        batch_size = max(1, batch_size or self.batch_size)
+        max_batch_tokens = max_batch_tokens or self.max_batch_tokens
+        batches = []
+        current = []
+        current_tokens = 0
+        for index, text in enumerate(texts):
+            tokens = self._estimate_tokens(text)
+            if current and (len(current) >= batch_size or current_tokens + tokens > max_batch_tokens):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def set_concurrency(self, max_concurrent_requests=1, requests_per_minute=None, tokens_per_minute=None):
+        """
+        Configure concurrent embedding generation.
+
+        :param max_concurrent_requests: Embeddings requests in flight at once.
+        :param requests_per_minute: Request rate limit, or None for no limit.
+        :param tokens_per_minute: Estimated token rate limit, or None for no limit.
+        """
+        self.max_concurrent_requests = max(1, int(max_concurrent_requests))
+        self._request_bucket = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._token_bucket = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def _wait_for_rate_limit(self, texts):
+        if self._request_bucket is not None:
+            self._request_bucket.acquire(1)
+        if self._token_bucket is not None:
+            self._token_bucket.acquire(sum(self._estimate_tokens(text) for text in texts))
+
+    @staticmethod
+    def _retry_delay(attempt, error):
+        """Seconds to wait before retry ``attempt``: Retry-After if the server sent one, else exponential backoff with jitter."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+            value = headers.get(header)
+            if value is None:
+                continue
+            try:
+                return max(0.0, float(value) * scale) + random.uniform(0, 0.5)
+            except ValueError:
+                pass  # HTTP-date form, fall back to backoff
+        backoff = min(60.0, 2.0 * (2 ** attempt))
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        """Hash of an embedding text, stored per item to detect changed objects."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _create_embeddings_once(self, texts, *, context: str = ""):
         start = time.time()
         try:
             response = self.client.embeddings.create(
-                input=[text],
+                input=texts,
                 model=self.model,
             )
+            if len(response.data) != len(texts):
+                raise ValueError(f"Expected {len(texts)} embeddings, got {len(response.data)}")
             elapsed = time.time() - start
-            print(f"✅ Embedding created in {elapsed:.2f}s [{context}]")
-            return response.data[0].embedding
+            print(f"✅ {len(texts)} embedding(s) created in {elapsed:.2f}s [{context}]")
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
         except APIConnectionError as e:
             elapsed = time.time() - start
             print(f"❌ APIConnectionError after {elapsed:.2f}s [{context}]")
@@ -302,10 +735,14 @@ class EmbeddingManager:
             print(f"   Base URL: {self.llm_url}")
             print(f"   Model: {self.model}")
             print(f"   Detail: {repr(e)}")
-            print(f"   Text length: {len(text)}")
-            print(f"   Text repr: {repr(text[:500])}")
-            print(f"   Code points: {[hex(ord(c)) for c in text[:80]]}")
-            self._save_failed_payload(text, context, e)
+            if len(texts) == 1:
+                text = texts[0]
+                print(f"   Text length: {len(text)}")
+                print(f"   Text repr: {repr(text[:500])}")
+                print(f"   Code points: {[hex(ord(c)) for c in text[:80]]}")
+                self._save_failed_payload(text, context, e)
+            else:
+                print(f"   Batch size: {len(texts)}")
             raise
         except Exception as e:
             elapsed = time.time() - start
@@ -315,17 +752,49 @@ class EmbeddingManager:
             print(traceback.format_exc())
             raise
 
-    def _create_embedding(self, text: str, *, context: str = "", retries: int = 2):
+    def _create_embeddings(self, texts, *, context: str = "", retries: int = None):
+        retries = self.max_retries if retries is None else retries
         for attempt in range(retries + 1):
+            self._wait_for_rate_limit(texts)
             try:
-                return self._create_embedding_once(text, context=context)
-            except (APIConnectionError, APITimeoutError) as e:
+                return self._create_embeddings_once(texts, context=context)
+            except (APIConnectionError, APITimeoutError, RateLimitError) as e:
                 if attempt >= retries:
                     raise
-                wait = 2 * (attempt + 1)
-                print(f"🔁 Retrying in {wait}s [{context}] because of {type(e).__name__}")
+                wait = self._retry_delay(attempt, e)
+                print(f"🔁 Retrying in {wait:.1f}s [{context}] because of {type(e).__name__}")
                 time.sleep(wait)
 
+    def _create_embedding_once(self, text: str, *, context: str = ""):
+        return self._create_embeddings_once([text], context=context)[0]
+
+    def _create_embedding(self, text: str, *, context: str = "", retries: int = None):
+        return self._create_embeddings([text], context=context, retries=retries)[0]
+
+    def _embed_batch(self, indices, texts, objects, *, context: str = ""):
+        """
+        Embed the texts at the given indices in one request.
+
+        If the request is rejected, the batch is split in halves and retried
+        until the failing texts are isolated. Connection errors and timeouts
+        or rate limiting (after the retries) fail the whole batch, as splitting
+        would not help.
+        Returns a list of (index, embedding or None, exception or None).
+        """
+        try:
+            vectors = self._create_embeddings([texts[i] for i in indices], context=context)
+            return [(i, vector, None) for i, vector in zip(indices, vectors)]
+        except (APIConnectionError, APITimeoutError, RateLimitError) as e:
+            return [(i, None, e) for i in indices]
+        except Exception as e:
+            if len(indices) == 1:
+                return [(indices[0], None, e)]
+            print(f"✂️ Batch of {len(indices)} failed ({type(e).__name__}), splitting it to isolate the failing object(s)")
+            mid = len(indices) // 2
+            first = self._embed_batch(indices[:mid], texts, objects, context=f"{context} part 1")
+            second = self._embed_batch(indices[mid:], texts, objects, context=f"{context} part 2")
+            return first + second
+
     def test_connection(self):
         print("🔎 Testing embeddings connection...")
         print(f"   Base URL: {self.llm_url}")
@@ -334,41 +803,125 @@ class EmbeddingManager:
         print(f"✅ Connection test passed. Vector length = {len(test_vec)}")
         return True
 
-    def generate_object_embeddings(self, objects, continue_on_error=False):
+    def _embedding_checkpoint(self):
+        """Checkpoint of the embedding file, or None if checkpointing is off or no file is set."""
+        if not self.checkpoint_embeddings or not self.embedding_file:
+            return None
+        return EmbeddingCheckpoint(_checkpoint_file(self.embedding_file))
+
+    def generate_object_embeddings(self, objects, continue_on_error=False, batch_size=None, max_batch_tokens=None,
+                                   max_concurrent_requests=None, resume=True):
+        """
+        Create the embedding of each object, many objects per request.
+
+        With more than one concurrent request the batches are sent from a
+        thread pool, within the limits set by set_concurrency(). Results are
+        collected in this thread, so progress and failure counts stay exact.
+
+        :param objects: Object dicts (see create_model_embeddings); "embedding" is set on each.
+        :param continue_on_error: Keep going when objects fail and report them in
+            <embedding file>.failures.json instead of raising.
+        :param batch_size: Texts per request (default: self.batch_size).
+        :param max_batch_tokens: Estimated tokens per request (default: self.max_batch_tokens).
+        :param max_concurrent_requests: Requests in flight (default: self.max_concurrent_requests).
+        :param resume: Take the vectors of objects whose UUID, text hash and LLM
+            model are in the checkpoint of an interrupted run instead of embedding
+            them again. With False, the checkpoint is discarded.
+        :return: The objects that got an embedding, in input order.
+
+        Completed vectors are appended to <embedding file>.checkpoint.jsonl as
+        each request finishes (unless self.checkpoint_embeddings is False);
+        save_embeddings removes the checkpoint.
+        """
         print(f"Creating embeddings for {len(objects)} objects using {self.model}")
         overall_start = time.time()
         failed = []
-        completed = []
-
-        for idx, obj in enumerate(objects, start=1):
-            metadata_text = self._build_embedding_text(obj)
-            print(f"[{idx}/{len(objects)}] Embedding: {obj.get('name', '<unnamed>')} ({obj.get('type', 'Unknown')})")
-            try:
-                obj["embedding"] = self._create_embedding(
-                    metadata_text,
-                    context=f"object={obj.get('name', '<unnamed>')} uuid={obj.get('uuid')}"
-                )
-                completed.append(obj)
-            except Exception as e:
-                failed.append({
-                    "uuid": obj.get("uuid"),
-                    "name": obj.get("name"),
-                    "type": obj.get("type"),
-                    "error_type": type(e).__name__,
-                    "error": repr(e),
-                })
-                print(f"⚠️ Failed: {obj.get('name', '<unnamed>')} ({type(e).__name__})")
-                if not continue_on_error:
-                    raise
-
-            if idx == 1 or idx % 25 == 0 or idx == len(objects):
-                print(f"📍 Progress: {idx}/{len(objects)} processed")
-
+        embedded = set()
+
+        texts = [self._build_embedding_text(obj) for obj in objects]
+        checkpoint = self._embedding_checkpoint()
+        pending = list(range(len(objects)))
+        if checkpoint is not None:
+            if resume:
+                resumed = checkpoint.load(self.model)
+                pending = []
+                for idx, obj in enumerate(objects):
+                    text_hash = self._text_hash(texts[idx])
+                    entry = resumed.get(obj.get("uuid"))
+                    if entry is not None and entry[0] == text_hash:
+                        obj["embedding"] = entry[1]
+                        obj["text_hash"] = text_hash
+                        embedded.add(idx)
+                    else:
+                        pending.append(idx)
+                if embedded:
+                    print(f"⏩ Resuming: {len(embedded)} object(s) taken from checkpoint {checkpoint.path}")
+            else:
+                checkpoint.remove()
+        batches = [
+            [pending[i] for i in batch]
+            for batch in self._make_batches([texts[idx] for idx in pending], batch_size, max_batch_tokens)
+        ]
+        workers = max(1, max_concurrent_requests or self.max_concurrent_requests)
+        print(f"📦 {len(batches)} request(s) of up to {batch_size or self.batch_size} objects, {workers} in flight")
+
+        pool = None
+        if workers == 1:
+            results = (
+                self._embed_batch(indices, texts, objects, context=f"batch {batch_idx}/{len(batches)}")
+                for batch_idx, indices in enumerate(batches, start=1)
+            )
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers)
+            futures = [
+                pool.submit(self._embed_batch, indices, texts, objects, context=f"batch {batch_idx}/{len(batches)}")
+                for batch_idx, indices in enumerate(batches, start=1)
+            ]
+            results = (future.result() for future in as_completed(futures))
+
+        processed = len(embedded)
+        try:
+            for batch_results in results:
+                done = []
+                for idx, vector, error in batch_results:
+                    if error is None:
+                        obj = objects[idx]
+                        obj["embedding"] = vector
+                        obj["text_hash"] = self._text_hash(texts[idx])
+                        embedded.add(idx)
+                        done.append(obj)
+                if checkpoint is not None:
+                    checkpoint.append(self.model, done)
+                for idx, vector, error in batch_results:
+                    if error is None:
+                        continue
+                    obj = objects[idx]
+                    failed.append((idx, {
+                        "uuid": obj.get("uuid"),
+                        "name": obj.get("name"),
+                        "type": obj.get("type"),
+                        "error_type": type(error).__name__,
+                        "error": repr(error),
+                    }))
+                    print(f"⚠️ Failed: {obj.get('name', '<unnamed>')} ({type(error).__name__})")
+                    if not continue_on_error:
+                        raise error
+
+                processed += len(batch_results)
+                print(f"📍 Progress: {processed}/{len(objects)} processed")
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+            if checkpoint is not None:
+                checkpoint.close()
+
+        completed = [obj for idx, obj in enumerate(objects) if idx in embedded]
         self.embeddings = completed
         elapsed = time.time() - overall_start
         print(f"✅ Generated embeddings for {len(self.embeddings)} object(s) in {elapsed:.1f}s")
 
         if failed:
+            failed = [entry for _, entry in sorted(failed, key=lambda f: f[0])]
             failure_file = Path(self.embedding_file).with_suffix(".failures.json")
             with open(failure_file, "w", encoding="utf-8") as f:
                 json.dump(failed, f, indent=2)
@@ -377,6 +930,62 @@ class EmbeddingManager:
 
         return completed
 
+    def _reusable_embeddings(self):
+        """Return {uuid: item} from the embedding file if it was made with the current LLM model."""
+        if not self.embedding_file or not os.path.exists(self.embedding_file):
+            return {}
+        if self._embeddings_match_file():
+            # Already in memory: no need to parse the file again.
+            meta, items = self._last_loaded_meta, self.embeddings
+        else:
+            try:
+                meta, items = self._read_embedding_file()
+            except Exception as e:
+                print(f"⚠️ Cannot reuse embeddings, failed to read {self.embedding_file}: {e}")
+                return {}
+        if not meta or meta.get("llm_model") != self.model:
+            return {}
+        return {item.get("uuid"): item for item in items if item.get("embedding") is not None}
+
+    def _stored_text_hash(self, item):
+        if item.get("text_hash"):
+            return item["text_hash"]
+        # Items written before text hashes were stored: rebuild the text from the item.
+        try:
+            return self._text_hash(self._build_embedding_text(item))
+        except ValueError:
+            return None
+
+    def refresh_object_embeddings(self, objects, continue_on_error=False, **kwargs):
+        """
+        Embed only new or changed objects, reusing the stored vectors of the others.
+
+        An object is unchanged when the embedding file has its UUID with the
+        same hash of _build_embedding_text. Objects no longer in ``objects``
+        are dropped. Extra keyword arguments go to generate_object_embeddings.
+
+        :return: All objects with an embedding, in input order.
+        """
+        previous = self._reusable_embeddings()
+        to_embed = []
+        for obj in objects:
+            text_hash = self._text_hash(self._build_embedding_text(obj))
+            old = previous.get(obj.get("uuid"))
+            if old is not None and self._stored_text_hash(old) == text_hash:
+                obj["embedding"] = old["embedding"]
+                obj["text_hash"] = text_hash
+            else:
+                to_embed.append(obj)
+        current = {obj.get("uuid") for obj in objects}
+        dropped = sum(1 for uuid in previous if uuid not in current)
+        print(f"♻️ Reusing {len(objects) - len(to_embed)} embedding(s), "
+              f"embedding {len(to_embed)} new or changed, dropping {dropped} deleted")
+
+        if to_embed:
+            self.generate_object_embeddings(to_embed, continue_on_error=continue_on_error, **kwargs)
+        self.embeddings = [obj for obj in objects if obj.get("embedding") is not None]
+        return self.embeddings
+
     def create_model_embeddings(self, model):
         def get_project_requirements(model):
             """Get all requirements not located in a phase and created by TC requirement integration"""
@@ -453,108 +1062,79 @@ class EmbeddingManager:
                 "target_component": ""
             }
 
-        def add_unique_object(obj_list, new_obj):
-            if not any(obj.get('uuid') == new_obj.get('uuid') for obj in obj_list):
-                obj_list.append(new_obj)
+        PROJECT = "Project"
+        OA = "Operational Analysis OA"
+        SA = "System Analysis SA"
+        LA = "Logical Architecture LA"
+        PA = "Physical Architecture PA"
+
+        # (phases, collection, info builder), each collection visited once.
+        # OA requirements are listed in every phase, as before.
+        collections = [
+            ((PROJECT,), lambda: get_project_requirements(model), get_req_info),
+            ((OA, SA, LA, PA), lambda: model.oa.all_requirements, get_req_info),
+            ((OA,), lambda: model.oa.all_entities, get_object_info),
+            ((OA,), lambda: model.oa.all_activities, get_object_info),
+            ((OA,), lambda: model.oa.all_capabilities, get_object_info),
+            ((OA,), lambda: model.oa.all_entity_exchanges, get_object_info),
+            ((OA,), lambda: model.oa.all_processes, get_object_info),
+            ((OA,), lambda: model.oa.diagrams, get_diagram_info),
+            ((SA,), lambda: model.sa.all_components, get_object_info),
+            ((SA,), lambda: model.sa.all_capabilities, get_object_info),
+            ((SA,), lambda: model.sa.all_function_exchanges, get_object_info),
+            ((SA,), lambda: model.sa.all_functions, get_object_info),
+            ((SA,), lambda: model.sa.all_missions, get_object_info),
+            ((SA,), lambda: model.sa.all_functional_chains, get_object_info),
+            ((SA,), lambda: model.sa.diagrams, get_diagram_info),
+            ((LA,), lambda: model.la.all_capabilities, get_object_info),
+            ((LA,), lambda: model.la.all_components, get_object_info),
+            ((LA,), lambda: model.la.all_functions, get_object_info),
+            ((LA,), lambda: model.la.all_function_exchanges, get_object_info),
+            ((LA,), lambda: model.la.all_functional_chains, get_object_info),
+            ((LA,), lambda: model.la.all_interfaces, get_object_info),
+            ((LA,), lambda: model.la.component_exchanges, get_component_exchange_info),
+            ((LA,), lambda: model.la.actor_exchanges, get_component_exchange_info),
+            ((LA,), lambda: model.la.diagrams, get_diagram_info),
+            ((PA,), lambda: model.pa.all_components, get_physical_component_info),
+            ((PA,), lambda: model.pa.all_functions, get_object_info),
+            ((PA,), lambda: model.pa.all_functional_chains, get_object_info),
+            ((PA,), lambda: model.pa.all_function_exchanges, get_object_info),
+            ((PA,), lambda: model.pa.all_capabilities, get_object_info),
+            ((PA,), lambda: model.pa.all_component_exchanges, get_component_exchange_info),
+            ((PA,), lambda: model.pa.all_physical_exchanges, get_component_exchange_info),
+            ((PA,), lambda: model.pa.all_physical_links, get_component_exchange_info),
+            ((PA,), lambda: model.pa.all_physical_paths, get_object_info),
+            ((PA,), lambda: model.pa.diagrams, get_diagram_info),
+        ]
+
+        def collect_objects():
+            """
+            One pass over the collections into a UUID-keyed dict.
+
+            An object keeps the info (and "phase") of its first occurrence;
+            "phases" lists every phase it appears in.
+            """
+            objects = {}
+            for phases, collection, get_info in collections:
+                for obj in collection():
+                    entry = objects.get(obj.uuid)
+                    if entry is None:
+                        entry = objects[obj.uuid] = get_info(obj, phases[0])
+                        entry["phases"] = []
+                    for phase in phases:
+                        if phase not in entry["phases"]:
+                            entry["phases"].append(phase)
+            return list(objects.values())
 
         if self.is_embedding_up_to_date():
+            if self._embeddings_match_file():
+                print("Embeddings already loaded")
+                return
             print("Loading embeddings")
             self.load_embeddings()
         else:
             print("Creating Embeddings")
-            object_data = []
-
-            # Project-level requirements
-            phase = "Project"
-            for component in get_project_requirements(model):
-                add_unique_object(object_data, get_req_info(component, phase))
-
-            # OA
-            phase = "Operational Analysis OA"
-            for component in model.oa.all_requirements:
-                add_unique_object(object_data, get_req_info(component, phase))
-            for component in model.oa.all_entities:
-                add_unique_object(object_data, get_object_info(component, phase))
-            for obj in model.oa.all_activities:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.oa.all_capabilities:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.oa.all_entity_exchanges:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.oa.all_processes:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.oa.diagrams:
-                add_unique_object(object_data, get_diagram_info(obj, phase))
-
-            # SA
-            phase = "System Analysis SA"
-            # NOTE: This currently reuses OA requirements for downstream phases.
-            for component in model.oa.all_requirements:
-                add_unique_object(object_data, get_req_info(component, phase))
-            for component in model.sa.all_components:
-                add_unique_object(object_data, get_object_info(component, phase))
-            for obj in model.sa.all_capabilities:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.sa.all_function_exchanges:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.sa.all_functions:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.sa.all_missions:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.sa.all_functional_chains:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.sa.diagrams:
-                add_unique_object(object_data, get_diagram_info(obj, phase))
-
-            # LA
-            phase = "Logical Architecture LA"
-            # NOTE: This currently reuses OA requirements for downstream phases.
-            for component in model.oa.all_requirements:
-                add_unique_object(object_data, get_req_info(component, phase))
-            for obj in model.la.all_capabilities:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for component in model.la.all_components:
-                add_unique_object(object_data, get_object_info(component, phase))
-            for obj in model.la.all_functions:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.la.all_function_exchanges:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.la.all_functional_chains:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.la.all_interfaces:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.la.component_exchanges:
-                add_unique_object(object_data, get_component_exchange_info(obj, phase))
-            for obj in model.la.actor_exchanges:
-                add_unique_object(object_data, get_component_exchange_info(obj, phase))
-            for obj in model.la.diagrams:
-                add_unique_object(object_data, get_diagram_info(obj, phase))
-
-            # PA
-            phase = "Physical Architecture PA"
-            # NOTE: This currently reuses OA requirements for downstream phases.
-            for component in model.oa.all_requirements:
-                add_unique_object(object_data, get_req_info(component, phase))
-            for component in model.pa.all_components:
-                add_unique_object(object_data, get_physical_component_info(component, phase))
-            for obj in model.pa.all_functions:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.pa.all_functional_chains:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.pa.all_function_exchanges:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.pa.all_capabilities:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.pa.all_component_exchanges:
-                add_unique_object(object_data, get_component_exchange_info(obj, phase))
-            for obj in model.pa.all_physical_exchanges:
-                add_unique_object(object_data, get_component_exchange_info(obj, phase))
-            for obj in model.pa.all_physical_links:
-                add_unique_object(object_data, get_component_exchange_info(obj, phase))
-            for obj in model.pa.all_physical_paths:
-                add_unique_object(object_data, get_object_info(obj, phase))
-            for obj in model.pa.diagrams:
-                add_unique_object(object_data, get_diagram_info(obj, phase))
+            object_data = collect_objects()
 
             phase_counts = {}
             type_counts = {}
@@ -567,13 +1147,28 @@ class EmbeddingManager:
                 print(f"   - {phase_name}: {count}")
             print(f"📦 Total collected: {len(object_data)}")
 
-            # Generate + save
-            self.generate_object_embeddings(object_data)
+            # Generate (new or changed objects only) + save
+            self.refresh_object_embeddings(object_data)
             print("Saving embeddings")
             self.save_embeddings()
 
     def load_embeddings(self):
-        """Load embeddings (list) from a file; tolerate legacy format."""
+        """Load embeddings (list) from a file; tolerate legacy format. Binary stores are memory-mapped."""
+        if self._is_binary_store():
+            meta, items, matrix = _read_binary_store(self.embedding_file)
+            self._last_loaded_meta = meta
+            self.embeddings = items
+            # The stored rows are already normalized: search the memory map directly.
+            self._matrix = matrix
+            self._matrix_checksum = None
+            self._field_rows = {}
+            self._lexical = None
+            self._matrix_items = items
+            self._matrix_source = (id(self.embeddings), len(self.embeddings))
+            self._loaded_signature = self._embedding_file_signature()
+            self._load_compressed_index()
+            print("embeddings loaded.")
+            return
         with open(self.embedding_file, "r", encoding="utf-8") as f:
             data = json.load(f)
         if isinstance(data, list):
@@ -583,6 +1178,9 @@ class EmbeddingManager:
         else:
             self._last_loaded_meta = data.get("meta")
             self.embeddings = data.get("items", [])
+        self._build_matrix()
+        self._loaded_signature = self._embedding_file_signature()
+        self._load_compressed_index()
         print("embeddings loaded.")
 
     # ---------- Similarity search ----------
@@ -595,15 +1193,364 @@ class EmbeddingManager:
             return 0.0
         return np.dot(vec1, vec2) / (norm1 * norm2)
 
-    def find_similar_objects(self, query, top_n=10):
+    def _build_matrix(self):
+        """Stack the embeddings into one row-normalized float32 matrix with a parallel item list."""
+        items = [obj for obj in self.embeddings if obj.get("embedding") is not None]
+        self._matrix = _normalized_matrix(items)
+        self._matrix_checksum = None
+        self._field_rows = {}
+        self._lexical = None
+        self._matrix_items = items
+        self._matrix_source = (id(self.embeddings), len(self.embeddings))
+
+    def _get_matrix(self):
+        """Return (matrix, items), rebuilding them if self.embeddings was replaced or resized."""
+        if self._matrix is None or self._matrix_source != (id(self.embeddings), len(self.embeddings)):
+            self._build_matrix()
+        return self._matrix, self._matrix_items
+
+    def _filter_rows(self, filters):
+        """
+        Return the matrix rows matching all filters, or None if no filter is set.
+
+        Each filter value is one value or a list of accepted values. The rows
+        of each field value are indexed once per matrix, so filtering is a few
+        array lookups and intersections.
+        """
+        filters = {field: value for field, value in filters.items() if value}
+        if not filters:
+            return None
+        _, items = self._get_matrix()
+        rows = None
+        for field, wanted in filters.items():
+            index = self._field_rows.get(field)
+            if index is None:
+                groups = {}
+                for row, item in enumerate(items):
+                    # An object listed in several phases matches each of them.
+                    values = item.get("phases") if field == "phase" else None
+                    for value in values or [item.get(field)]:
+                        groups.setdefault(value, []).append(row)
+                index = self._field_rows[field] = {
+                    value: np.asarray(value_rows, dtype=np.int64) for value, value_rows in groups.items()
+                }
+            values = [wanted] if isinstance(wanted, str) else list(wanted)
+            matched = np.unique(np.concatenate([index.get(value, np.empty(0, dtype=np.int64)) for value in values]))
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+        return rows
+
+    def _rank(self, query_embedding, top_n, rows=None):
+        """
+        Return the top_n (item, similarity) pairs for a query vector, best first.
+
+        :param rows: Only score these matrix rows (see _filter_rows); None scores all.
+        """
+        matrix, items = self._get_matrix()
+        if not items or top_n <= 0 or (rows is not None and len(rows) == 0):
+            return []
+        if rows is None:
+            rows = np.arange(len(items))
+            index = self._usable_ann_index(items)
+        else:
+            index = None  # filtered queries only score the matching rows, exactly
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return [(items[i], 0.0) for i in rows[:top_n]]
+        query = query / norm
+        if index is not None:
+            found, scores = index.search(query, top_n)
+            return [(items[i], float(score)) for i, score in zip(found, scores)]
+        scores = (matrix if len(rows) == len(items) else matrix[rows]) @ query
+        if top_n < len(rows):
+            top = np.argpartition(-scores, top_n - 1)[:top_n]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(items[rows[i]], float(scores[i])) for i in top]
+
+    # ---------- Approximate nearest-neighbour index ----------
+
+    def _usable_ann_index(self, items):
+        """The ANN index if it is large enough to pay off and was built for these rows."""
+        index = self.ann_index
+        if index is None or len(items) < self.ann_threshold or index.count != len(items):
+            return None
+        if index.checksum != self._rows_checksum():
+            print("ℹ️ ANN index is stale, using exact search. Rebuild it with build_ann_index().")
+            self.ann_index = None
+            return None
+        return index
+
+    def _rows_checksum(self):
+        """Checksum of the UUIDs of the matrix rows, computed once per matrix."""
+        _, items = self._get_matrix()
+        if self._matrix_checksum is None:
+            self._matrix_checksum = rows_checksum(item.get("uuid") for item in items)
+        return self._matrix_checksum
+
+    def build_ann_index(self, kind="ivf", **params):
+        """
+        Build an approximate nearest-neighbour index over the loaded embeddings.
+
+        It is used by find_similar_objects once there are at least
+        ann_threshold vectors; below that, exact search is fast enough.
+
+        :param kind: "ivf" (NumPy only) or "hnsw" (needs hnswlib).
+        :param params: Index parameters, e.g. n_lists/n_probe for "ivf" or
+            M/ef_construction/ef for "hnsw" (see capella_tools.embedding_index).
+        :return: The index.
+        """
+        matrix, items = self._get_matrix()
+        start = time.time()
+        self.ann_index = build_index(matrix, kind, checksum=self._rows_checksum(), **params)
+        print(f"✅ Built {kind} index over {len(items)} vectors in {time.time() - start:.1f}s")
+        return self.ann_index
+
+    def save_ann_index(self):
+        """Save the ANN index next to the embedding file. Returns its path."""
+        path = index_file(self.embedding_file, self.ann_index.kind)
+        self.ann_index.save(path)
+        return path
+
+    def load_ann_index(self, kind="ivf", **params):
+        """
+        Load the ANN index saved next to the embedding file, if there is one.
+
+        :param params: Query-time overrides, e.g. n_probe for "ivf" or ef for "hnsw".
+        :return: The index, or None if no index file exists.
+        """
+        path = index_file(self.embedding_file, kind)
+        if not path.exists():
+            return None
+        matrix, _ = self._get_matrix()
+        self.ann_index = load_index(path, matrix, kind, **params)
+        return self.ann_index
+
+    # ---------- Compression ----------
+
+    def set_compression(self, reduce="pca", dim=256, quantize="int8", rerank=4):
+        """
+        Keep a compressed copy of the vectors for search, built and saved with the embeddings.
+
+        save_embeddings then also writes <embedding file stem>.cmp.npz and
+        load_embeddings loads it. Like the other ANN indexes it is used from
+        ann_threshold vectors on; the full vectors stay in the embedding file
+        for incremental refresh and for reranking. Use compression_report()
+        to pick the settings.
+
+        :param reduce: None, "pca" or "random" (projection to ``dim`` dimensions).
+        :param dim: Dimensions after the projection.
+        :param quantize: None or "int8".
+        :param rerank: Candidates per result rescored with the full vectors (0: no reranking).
+        """
+        if reduce is None and quantize is None:
+            self.compression = None
+        else:
+            self.compression = {"reduce": reduce, "dim": dim, "quantize": quantize, "rerank": rerank}
+
+    def _load_compressed_index(self):
+        if self.compression is not None:
+            self.load_ann_index("compressed", rerank=self.compression["rerank"])
+
+    def compression_report(self, configs=None, queries=None, n_queries=100, ks=(1, 5, 10, 20), seed=0):
+        """
+        Measure recall@k and speed of compression settings against exact search.
+
+        :param configs: CompressedIndex parameter dicts to compare (default: a
+            few PCA, random projection and int8 combinations, with and without
+            reranking).
+        :param queries: Query texts (embedded once each); by default n_queries
+            stored vectors are used as queries, with no API calls.
+        :return: One dict per config with its size per vector, compression
+            ratio, explained variance (PCA), recall@k and ms per query.
+        """
+        matrix, items = self._get_matrix()
+        if not items:
+            print("⚠️ No embeddings loaded.")
+            return []
+        if configs is None:
+            dim = min(256, matrix.shape[1])
+            configs = [
+                {"reduce": None, "quantize": "int8", "rerank": 0},
+                {"reduce": "pca", "dim": dim, "quantize": None, "rerank": 0},
+                {"reduce": "pca", "dim": dim, "quantize": "int8", "rerank": 0},
+                {"reduce": "pca", "dim": dim, "quantize": "int8", "rerank": 4},
+                {"reduce": "random", "dim": dim, "quantize": "int8", "rerank": 4},
+            ]
+        if queries:
+            query_vectors = np.asarray([self._embed_query(query) for query in queries], dtype=np.float32)
+            norms = np.linalg.norm(query_vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            query_vectors /= norms
+        else:
+            rng = np.random.default_rng(seed)
+            query_vectors = np.asarray(matrix[np.sort(rng.choice(len(items), min(n_queries, len(items)),
+                                                                 replace=False))], dtype=np.float32)
+        full_bytes = matrix.shape[1] * 4
+        report = []
+        print(f"📊 Compression vs exact search over {len(items)} vectors of {matrix.shape[1]} dimensions "
+              f"({full_bytes} bytes each), {len(query_vectors)} queries")
+        for config in configs:
+            start = time.time()
+            index = build_index(matrix, "compressed", **config)
+            build_s = time.time() - start
+            recall = recall_at_k(index, matrix, query_vectors, ks)
+            row = {
+                "config": config,
+                "bytes_per_vector": index.bytes_per_vector,
+                "compression_ratio": full_bytes / index.bytes_per_vector,
+                "explained_variance": index.explained_variance,
+                "recall": {k: recall[k] for k in ks if k in recall},
+                "ms_per_query": recall.get("ms_per_query"),
+                "build_s": build_s,
+            }
+            report.append(row)
+            recalls = ", ".join(f"@{k}={value:.3f}" for k, value in row["recall"].items())
+            variance = f", variance {row['explained_variance']:.1%}" if row["explained_variance"] is not None else ""
+            print(f"   - {config}: {row['bytes_per_vector']} B ({row['compression_ratio']:.0f}x{variance}), "
+                  f"recall {recalls}, {row['ms_per_query']:.2f} ms/query")
+        return report
+
+    def set_query_cache(self, max_size=256, path=None):
+        """
+        Configure the query embedding cache.
+
+        :param max_size: Queries kept in memory (0 turns the cache off).
+        :param path: Optional SQLite file to keep query vectors across sessions.
+        """
+        if self.query_cache is not None:
+            self.query_cache.close()
+        self.query_cache = QueryEmbeddingCache(max_size=max_size, path=path) if max_size else None
+
+    def _embed_query(self, query):
+        """Embedding of a query text, from the query cache when possible."""
         query_text = self._sanitize_embedding_text(query)
-        query_embedding = self._create_embedding(query_text, context=f"query={query_text[:80]}")
-        similarities = []
-        for obj in self.embeddings:
-            similarity = self.cosine_similarity(query_embedding, obj["embedding"])
-            similarities.append((obj, similarity))
-        similarities = sorted(similarities, key=lambda x: x[1], reverse=True)
-        return similarities[:top_n]
+        if self.query_cache is not None:
+            vector = self.query_cache.get(self.model, query_text)
+            if vector is not None:
+                return vector
+        vector = self._create_embedding(query_text, context=f"query={query_text[:80]}")
+        if self.query_cache is not None:
+            self.query_cache.put(self.model, query_text, vector)
+        return vector
+
+    def embed_query(self, query):
+        """Public form of _embed_query, for other retrievers sharing this configuration."""
+        return self._embed_query(query)
+
+    def embed_texts(self, texts, context="texts"):
+        """
+        Embed plain texts (e.g. document chunks) with the batching and retries of the object embeddings.
+
+        :return: One vector per text, in input order.
+        """
+        texts = [self._sanitize_embedding_text(text) for text in texts]
+        vectors = [None] * len(texts)
+        batches = self._make_batches(texts)
+        for batch_idx, indices in enumerate(batches, start=1):
+            batch_vectors = self._create_embeddings([texts[i] for i in indices],
+                                                    context=f"{context} {batch_idx}/{len(batches)}")
+            for i, vector in zip(indices, batch_vectors):
+                vectors[i] = vector
+        return vectors
+
+    # ---------- Lexical and hybrid search ----------
+
+    @staticmethod
+    def _lexical_text(obj):
+        parts = [
+            obj.get("name", ""),
+            obj.get("type", ""),
+            " ".join(obj.get("phases") or [obj.get("phase", "")]),
+            obj.get("source_component", ""),
+            obj.get("target_component", ""),
+        ]
+        return " ".join(str(p) for p in parts if p)
+
+    def _get_lexical_index(self):
+        """BM25 index and exact name/UUID lookup of the matrix rows, built once per matrix."""
+        _, items = self._get_matrix()
+        if self._lexical is None:
+            bm25 = BM25Index().build([self._lexical_text(item) for item in items])
+            exact = {}
+            for row, item in enumerate(items):
+                for key in (item.get("uuid"), item.get("name")):
+                    if key:
+                        exact.setdefault(QueryEmbeddingCache.normalize(key), []).append(row)
+            self._lexical = (bm25, exact)
+        return self._lexical
+
+    def _lexical_search(self, query, top_n, rows=None):
+        """
+        Exact name/UUID matches first, then BM25 results.
+
+        Returns (matrix rows, scores, whether there was an exact match).
+        Exact matches score 1.0; BM25 scores are scaled by the best BM25 score.
+        """
+        bm25, exact = self._get_lexical_index()
+        exact_rows = exact.get(QueryEmbeddingCache.normalize(query), [])
+        if rows is not None:
+            allowed = set(rows.tolist())
+            exact_rows = [row for row in exact_rows if row in allowed]
+        found, scores = bm25.search(query, top_n + len(exact_rows), rows=rows)
+        if len(scores):
+            scores = scores / scores.max()
+        ranked = [(row, 1.0) for row in exact_rows]
+        ranked += [(int(row), float(score)) for row, score in zip(found, scores) if row not in exact_rows]
+        ranked = ranked[:top_n]
+        return [row for row, _ in ranked], [score for _, score in ranked], bool(exact_rows)
+
+    def find_similar_objects(self, query, top_n=10, *, mode="vector", phase=None, type=None,
+                             source_component=None, target_component=None, capella_model=None):
+        """
+        Rank the embedded objects by similarity to a query.
+
+        The optional filters narrow the search before scoring; each takes one
+        value or a list of accepted values, e.g. phase="Logical Architecture LA"
+        or type=["LogicalComponent", "LogicalFunction"]. capella_model selects
+        the source models of a MultiModelEmbeddingManager.
+
+        :param mode: "vector" (cosine similarity of embeddings), "lexical" (BM25
+            over name/type/phase/components, no API call) or "hybrid" (both,
+            fused by reciprocal rank). In "lexical" and "hybrid" mode a query
+            that exactly matches an object's name or UUID returns those objects
+            first without calling the embedding API.
+        :return: List of (object, similarity), best first. Vector and hybrid
+            results carry the cosine similarity; lexical results carry the BM25
+            score scaled to 0..1 (1.0 for exact matches).
+        """
+        if mode not in ("vector", "lexical", "hybrid"):
+            raise ValueError(f"Unknown search mode: {mode}")
+        rows = self._filter_rows({
+            "phase": phase,
+            "type": type,
+            "source_component": source_component,
+            "target_component": target_component,
+            "capella_model": capella_model,
+        })
+        if rows is not None and len(rows) == 0:
+            return []
+        if mode == "vector":
+            return self._rank(self._embed_query(query), top_n, rows=rows)
+
+        _, items = self._get_matrix()
+        lexical_rows, lexical_scores, exact_hit = self._lexical_search(query, top_n, rows=rows)
+        if mode == "lexical" or exact_hit:
+            return [(items[row], score) for row, score in zip(lexical_rows, lexical_scores)]
+
+        # Hybrid: fuse a deeper cut of both rankings, then report cosine similarities.
+        depth = max(top_n * 5, 50)
+        query_embedding = self._embed_query(query)
+        row_of = {id(item): row for row, item in enumerate(items)}
+        vector_rows = [row_of[id(item)] for item, _ in self._rank(query_embedding, depth, rows=rows)]
+        lexical_rows, _, _ = self._lexical_search(query, depth, rows=rows)
+        fused = reciprocal_rank_fusion(vector_rows, lexical_rows)[:top_n]
+        matrix, _ = self._get_matrix()
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        similarities = matrix[fused] @ (query_vector / norm) if norm and fused else np.zeros(len(fused))
+        return [(items[row], float(similarity)) for row, similarity in zip(fused, similarities)]
 
     # ---------- Interactive helpers (unchanged) ----------
 
@@ -702,8 +1649,8 @@ class EmbeddingManager:
             except (ValueError, IndexError):
                 print("\nInvalid input. Please enter valid indices or retry.")
 
-    def query_and_select_top_objects(self, prompt, top_n=20):
-        ranked_objects = self.find_similar_objects(prompt)
+    def query_and_select_top_objects(self, prompt, top_n=20, **filters):
+        ranked_objects = self.find_similar_objects(prompt, top_n=top_n, **filters)
         print("\nThis is a list of ranked Objects Based on Query:")
         for i, (obj, similarity) in enumerate(ranked_objects[:top_n]):
             print(
@@ -716,3 +1663,124 @@ class EmbeddingManager:
         return selected_objects
 
 
+class MultiModelEmbeddingManager(EmbeddingManager):
+    """
+    One search matrix over the embeddings of several Capella models.
+
+    Each model keeps its own embedding file and is refreshed on its own, with
+    the same freshness check, incremental refresh and checkpointing as a
+    single-model EmbeddingManager. Every item is tagged with its model name as
+    "capella_model", so queries span all models or are narrowed with
+    find_similar_objects(..., capella_model="Variant A").
+
+    Example:
+        manager = MultiModelEmbeddingManager()
+        manager.add_model("variant_a/Variant A.aird", "variant_a.npy")
+        manager.add_model("variant_b/Variant B.aird", "variant_b.npy")
+        manager.create_model_embeddings(model_a, "Variant A")
+        manager.create_model_embeddings(model_b, "Variant B")
+        manager.find_similar_objects("battery", capella_model="Variant B")
+    """
+
+    def __init__(self, model=None, base_url=None, api_key=None, config_name=None):
+        super().__init__(model=model, base_url=base_url, api_key=api_key, config_name=config_name)
+        self.sources = {}          # Capella model name -> model file, embedding file and its items
+        self._active_source = None # Name of the model being refreshed (see _model_source)
+
+    def add_model(self, model_file, embedding_file):
+        """
+        Register a Capella model and its embedding file.
+
+        :return: The model name (stem of the .aird file) used as "capella_model".
+        """
+        name = Path(model_file).stem
+        self.sources[name] = {
+            "model_file": model_file,
+            "embedding_file": embedding_file,
+            "items": [],
+            "meta": None,
+            "signature": None,
+        }
+        return name
+
+    def remove_model(self, name):
+        """Drop a model from the search matrix (its embedding file is kept)."""
+        del self.sources[name]
+        self._combine()
+
+    def _combine(self):
+        """Point self.embeddings at the items of all models; the matrix is rebuilt on the next query."""
+        self.embeddings = [item for source in self.sources.values() for item in source["items"]]
+
+    @contextmanager
+    def _model_source(self, name):
+        """Make one model current, so the single-model methods work on its files and items."""
+        if name not in self.sources:
+            raise KeyError(f"Unknown Capella model '{name}'; known: {', '.join(self.sources) or 'none'}")
+        source = self.sources[name]
+        self._active_source = name
+        self.model_file = source["model_file"]
+        self.embedding_file = source["embedding_file"]
+        self.embeddings = source["items"]
+        self._last_loaded_meta = source["meta"]
+        self._loaded_signature = source["signature"]
+        try:
+            yield source
+        finally:
+            for item in self.embeddings:
+                item["capella_model"] = name
+            source["items"] = self.embeddings
+            source["meta"] = self._last_loaded_meta
+            source["signature"] = self._loaded_signature
+            self._active_source = None
+            self.model_file = ""
+            self.embedding_file = ""
+            self._combine()
+
+    def _source_name(self, name):
+        if name is not None:
+            return name
+        if len(self.sources) != 1:
+            raise ValueError("Pass the Capella model name when several models are registered.")
+        return next(iter(self.sources))
+
+    def create_model_embeddings(self, model, name=None):
+        """
+        Load or refresh the embeddings of one registered model.
+
+        Only that model's embedding file is checked and, if stale, refreshed;
+        the other models stay in memory as they are.
+
+        :param model: The capellambse model.
+        :param name: Name returned by add_model (optional with a single model).
+        """
+        with self._model_source(self._source_name(name)):
+            super().create_model_embeddings(model)
+
+    def is_embedding_up_to_date(self):
+        """Whether the current model's embedding file (or, outside a refresh, every model's) is up to date."""
+        if self._active_source is not None:
+            return super().is_embedding_up_to_date()
+        up_to_date = True
+        for name in self.sources:
+            with self._model_source(name):
+                up_to_date = super().is_embedding_up_to_date() and up_to_date
+        return up_to_date
+
+    def load_embeddings(self):
+        """Load the embedding files of all registered models into one search matrix."""
+        if self._active_source is not None:
+            return super().load_embeddings()
+        for name in self.sources:
+            with self._model_source(name):
+                if not self._embeddings_match_file():
+                    super().load_embeddings()
+        print(f"✅ {len(self.embeddings)} embeddings of {len(self.sources)} model(s) loaded.")
+
+    def save_embeddings(self):
+        """Save the current model's embeddings, or, outside a refresh, those of every model."""
+        if self._active_source is not None:
+            return super().save_embeddings()
+        for name in self.sources:
+            with self._model_source(name):
+                super().save_embeddings()
@@ -0,0 +1,149 @@
+# Copyright Siemens AG
+# Licensed under the Apache License, Version 2.0 (see full text in LICENSES/Apache-2.0.txt)
+
+# Dot-files are licensed under CC0-1.0 (see full text in LICENSES/CC0-1.0.txt)
+
+# To provide the same look and feel across platforms, this library is bundled
+# with the OpenSans font (capellambse/OpenSans-Regular.ttf).
+# The OpenSans font is Copyright 2020 The Open Sans Project Authors,
+# licensed under OFL-1.1 (see full text in LICENSES/OFL-1.1.txt)
+
+
+#capella_type_registry
+"""
+Registry of what the tools do with each Capella type.
+
+One entry per class name (and optionally per ``nature``, e.g. the NODE and
+BEHAVIOR PhysicalComponents) says which CapellaYAMLHandler method walks the
+references of an object, which method renders its YAML and whether it has a
+context diagram. The YAML manager and capellambse_helper both dispatch through
+get_handler(), so a new Capella type is added here in one place.
+"""
+
+
+class TypeHandler:
+    """Handlers registered for one Capella type."""
+
+    __slots__ = ("walker", "renderer", "context_diagram")
+
+    def __init__(self, walker=None, renderer=None, context_diagram=False):
+        self.walker = walker
+        self.renderer = renderer
+        self.context_diagram = context_diagram
+
+    def merged(self, other):
+        """Return a handler using the fields set on ``other`` and ``self`` for the rest."""
+        return TypeHandler(
+            walker=other.walker or self.walker,
+            renderer=other.renderer or self.renderer,
+            context_diagram=other.context_diagram or self.context_diagram,
+        )
+
+    def __repr__(self):
+        return (f"TypeHandler(walker={self.walker!r}, renderer={self.renderer!r}, "
+                f"context_diagram={self.context_diagram!r})")
+
+
+# (class name, nature or None) -> TypeHandler
+_HANDLERS = {}
+# Python type -> (handler, {nature: handler}), filled on first use of a type.
+_RESOLVED = {}
+
+
+def register_type(*class_names, nature=None, walker=None, renderer=None, context_diagram=None):
+    """
+    Register handlers for one or more Capella class names.
+
+    Fields that are not given keep their registered value, so the YAML
+    handlers and the context diagram flag can be registered separately.
+
+    :param class_names: Class names as in ``obj.__class__.__name__``
+    :param nature: Only for objects with this ``nature`` (e.g. "NODE"); fields
+        not set for the nature fall back to the registration without nature.
+    :param walker: Name of the CapellaYAMLHandler method tracking the references
+    :param renderer: Name of the CapellaYAMLHandler method rendering the YAML
+    :param context_diagram: Whether the object has a context diagram
+    """
+    for class_name in class_names:
+        handler = _HANDLERS.setdefault((class_name, nature), TypeHandler())
+        if walker is not None:
+            handler.walker = walker
+        if renderer is not None:
+            handler.renderer = renderer
+        if context_diagram is not None:
+            handler.context_diagram = context_diagram
+    _RESOLVED.clear()
+
+
+def _resolve(cls):
+    name = cls.__name__
+    handler = _HANDLERS.get((name, None), TypeHandler())
+    natures = {
+        nature: handler.merged(nature_handler)
+        for (class_name, nature), nature_handler in _HANDLERS.items()
+        if class_name == name and nature is not None
+    }
+    return handler, natures
+
+
+def get_handler(obj):
+    """
+    Return the TypeHandler of an object.
+
+    One dict lookup on the object's type, plus one on ``obj.nature`` for types
+    registered per nature. Unregistered types get an empty handler.
+    """
+    cls = type(obj)
+    resolved = _RESOLVED.get(cls)
+    if resolved is None:
+        resolved = _RESOLVED[cls] = _resolve(cls)
+    handler, natures = resolved
+    if natures:
+        return natures.get(getattr(obj, "nature", None), handler)
+    return handler
+
+
+# YAML reference walkers and renderers (methods of CapellaYAMLHandler).
+register_type("LogicalComponent", "SystemComponent", walker="_track_component", renderer="_render_component")
+register_type("Entity", walker="_track_entity", renderer="_render_entity")
+register_type("PhysicalComponent", nature="NODE",
+              walker="_track_node_component", renderer="_render_node_component")
+register_type("PhysicalComponent", nature="BEHAVIOR",
+              walker="_track_behavior_component", renderer="_render_behavior_component")
+register_type("Requirement", walker="_track_requirement", renderer="_render_requirement")
+register_type("CapellaOutgoingRelation", renderer="_render_capella_outgoing_relation")
+register_type("LogicalFunction", "SystemFunction", "PhysicalFunction",
+              walker="_track_function", renderer="_render_function")
+register_type("OperationalActivity", walker="_track_operational_activity", renderer="_render_operational_activity")
+register_type("OperationalCapability", walker="_track_operational_capability",
+              renderer="_render_operational_capability")
+register_type("Capability", walker="_track_capability", renderer="_render_capability")
+register_type("CapabilityRealization", walker="_track_capability_realization",
+              renderer="_render_capability_realization")
+register_type("OperationalProcess", walker="_track_operational_process", renderer="_render_operational_process")
+register_type("FunctionalChain", walker="_track_functional_chain", renderer="_render_functional_chain")
+register_type("StateMachine", walker="_track_state_machine", renderer="_render_state_machine")
+register_type("State", walker="_track_state", renderer="_render_state")
+register_type("InitialPseudoState", walker="_track_initial_pseudo_state", renderer="_render_initial_pseudo_state")
+register_type("StateTransition", walker="_track_state_transition", renderer="_render_state_transition")
+register_type("PropertyValueGroup", walker="_track_property_value_group", renderer="_render_property_value_group")
+register_type("StringPropertyValue", "FloatPropertyValue", "IntegerPropertyValue",
+              renderer="_render_property_value")
+register_type("FunctionalExchange", walker="_track_functional_exchange", renderer="_render_functional_exchange")
+register_type("Interaction", walker="_track_interaction", renderer="_render_interaction")
+register_type("ComponentExchange", walker="_track_component_exchange", renderer="_render_component_exchange")
+register_type("CommunicationMean", renderer="_render_communication_mean")
+register_type("PhysicalLink", walker="_track_physical_link", renderer="_render_physical_link")
+register_type("PhysicalPath", walker="_track_physical_path", renderer="_render_physical_path")
+register_type("ExchangeItem", walker="_track_exchange_item", renderer="_render_exchange_item")
+register_type("ExchangeItemElement", walker="_track_exchange_item_element", renderer="_render_exchange_item_element")
+register_type("FunctionInputPort", "FunctionOutputPort", "PhysicalPort", "ComponentPort",
+              walker="_track_port", renderer="_render_port")
+register_type("Diagram", walker="_track_diagram", renderer="_render_diagram")
+register_type("Part", walker="_track_part", renderer="_render_part")
+register_type("Traceability_Artifact", renderer="_render_traceability_artifact")
+
+# Types that capellambse_helper.display_context_diagram can show.
+register_type("Entity", "OperationalActivity", "OperationalCapability", "Mission", "Capability",
+              "SystemFunction", "LogicalComponent", "ComponentExchange", "LogicalFunction",
+              "PhysicalComponent", "PhysicalFunction", context_diagram=True)
@@ -18,6 +18,7 @@ from IPython.core.display import HTML
 from IPython import display
 import pandas as pd 
 import jinja2
+from capella_tools.capella_type_registry import get_handler
 
 
 def filter_property_value(value):
@@ -45,17 +46,8 @@ def filter_property_value(value):
 
 
 def display_context_diagram(obj):
-    if obj.__class__.__name__ == "Entity" or \
-        obj.__class__.__name__ == "OperationalActivity" or \
-        obj.__class__.__name__ == "OperationalCapability" or \
-        obj.__class__.__name__ == "Mission" or \
-        obj.__class__.__name__ == "Capability" or \
-        obj.__class__.__name__ == "SystemFunction" or \
-        obj.__class__.__name__ == "LogicalComponent" or \
-        obj.__class__.__name__ == "ComponentExchange" or \
-        obj.__class__.__name__ == "LogicalFunction" or \
-        obj.__class__.__name__ == "PhysicalComponent" or \
-        obj.__class__.__name__ == "PhysicalFunction" :
+    """Display the context diagram of an object whose type has one (see capella_type_registry)."""
+    if get_handler(obj).context_diagram:
         display.display(obj.context_diagram)
     else :
         display.display(Markdown(f"The object:{obj.name} cannot be displayed in a Context Diagram."))
@@ -12,911 +12,20 @@
 
 
 import yaml
-from jinja2 import Template
+import jinja2
 import capellambse
 import re
+import os
+import math
+import json
+import hashlib
 import base64
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from capella_tools.capella_type_registry import get_handler
 
-class CapellaYAMLHandler:
-    def __init__(self,parser=None):
-        self.file_name = None
-        self.referenced_objects = []
-        self.primary_objects = []
-        self.parser = parser
-        self.realizing_refs = False
-        self.realized_refs = False
-        self.yaml_content = """
----  
-# YAML file for system model relationships
-model:
-  schema:
-    primary_uuid: Unique identifier for the primary object
-    ref_uuid: Unique identifier for a referenced object
-  objects:
-"""
-
-
-    def set_realizing_refs(self, True_or_False):
-        self.realizing_refs = True_or_False
-
-
-    def set_realized_refs(self, True_or_False):
-        self.realized_refs = True_or_False
-
-    def generate_teamcenter_yaml_snippet(self, uuid, indent="    "):
-        """
-        Generate Teamcenter metadata snippet with proper YAML indentation.
-    
-        Args:
-            uuid (str): UUID of the Capella element.
-            indent (str): Indentation string (default: 4 spaces).
-    
-        Returns:
-            str: YAML-formatted metadata string with consistent indentation.
-        """
-        if not self.parser:
-            return ""
-    
-        item = self.parser.get_by_id(uuid)
-        if not item:
-            return ""
-    
-        lines = []
-        if item.get("itemId"):
-            lines.append(f"{indent}teamcenter item id: {item['itemId']}")
-        if item.get("revisionId"):
-            lines.append(f"{indent}teamcenter revision id: {item['revisionId']}")
-        if item.get("url"):
-            lines.append(f"{indent}teamcenter url: {item['url']}")
-    
-        return "\n".join(lines)
-
-    
-    def get_yaml_content(self):
-        stripped_yaml_content = "\n".join([line for line in self.yaml_content.splitlines() if line.strip()])
-        """Returen the Yaml content created."""
-        return stripped_yaml_content
-    
-    def write_output_file(self):
-        """Generate a file capella_model.yaml"""
-        self.file_name = "capella_model.yaml"
-        # Initialize the file with a header
-        stripped_yaml_content = "\n".join([line for line in self.yaml_content.splitlines() if line.strip()])
-        with open(self.file_name, 'w') as f:
-            f.write("# YAML file for Capella objects\n")
-            f.write(stripped_yaml_content + "\n")
-
-    def display(self):
-        """Display the content of the yaml_content."""
-        print(self.yaml_content)
-
-    def get_entire_model(self, model):
-     
-        def add_unique_object(obj_list, new_obj):
-            """
-            Adds a new object to the list if not already present.
-            """
-              
-            if  new_obj not in   obj_list:
-                obj_list.append(new_obj)
-
-        
-        object_data = []
-        #OA  
-        phase = "Operational Analysis OA"
-        for component in model.oa.all_entities:  
-            add_unique_object(object_data,component)
-        for obj in model.oa.all_activities:  
-        
-            add_unique_object(object_data, obj)
-        for obj in model.oa.all_capabilities:  
-        
-            add_unique_object(object_data, obj)
-        for obj in model.oa.all_entity_exchanges:  
-        
-            add_unique_object(object_data, obj)
-        for obj in model.oa.all_processes:  
-        
-            add_unique_object(object_data, obj)
-        #SA
-        phase = "System Analysis SA"
-        for component in model.sa.all_components: 
-        
-            add_unique_object(object_data, component)
-        for obj in model.sa.all_capabilities:  
-        
-            add_unique_object(object_data, obj )
-        for obj in model.sa.all_function_exchanges:  
-        
-            add_unique_object(object_data,obj )
-        for obj in model.sa.all_functions:  
-        
-            add_unique_object(object_data,obj )
-        for obj in model.sa.all_missions:  
-        
-            add_unique_object(object_data,obj )
-        for obj in model.sa.all_functional_chains:  
-        
-            add_unique_object(object_data,obj )
-        #LA
-        phase = "Logical Architecture LA"
-        for obj in model.la.all_capabilities:  
-        
-            add_unique_object(object_data, obj)
-        for component in model.la.all_components:  
-        
-            add_unique_object(object_data, obj )
-        for obj in model.la.all_functions:  
-        
-            add_unique_object(object_data, obj )
-        for obj in model.la.all_functional_chains:  
-        
-            add_unique_object(object_data, obj )
-        for obj in model.la.all_interfaces:  
-        
-            add_unique_object(object_data, obj )
-        for obj in model.la.component_exchanges:  
-        
-            add_unique_object(object_data, obj )
-        for obj in model.la.actor_exchanges:  
-        
-            add_unique_object(object_data, obj )
-        #PA
-        phase = "Physical Architecture PA"
-        for component in model.pa.all_components:  
-        
-            add_unique_object(object_data,component )
-        for obj in model.pa.all_functions:  
-        
-            add_unique_object(object_data,obj)
-        for obj in model.pa.all_functional_chains:  
-            add_unique_object(object_data,obj)
-        for obj in model.pa.all_capabilities:  
-            add_unique_object(object_data,obj)
-        for obj in model.pa.all_component_exchanges:  
-            add_unique_object(object_data,obj)
-        for obj in model.pa.all_physical_exchanges:  
-            add_unique_object(object_data,obj)
-        for obj in model.pa.all_physical_links:  
-            add_unique_object(object_data,obj)
-        for obj in model.pa.all_physical_paths:  
-            add_unique_object(object_data,obj)
-        for obj in model.pa.all_physical_exchanges:  
-            add_unique_object(object_data,obj)
-        num_elements = len(object_data)
-
-        print("Number of model objects:", num_elements)
-        return object_data    
-         
-    def generate_yaml_referenced_objects(self):
-        """generate YAML content of referenced objects."""
-        for ref_obj in self.referenced_objects:
-            if ref_obj not in self.primary_objects :
-                self.generate_yaml(ref_obj) 
-
-    def generate_traceability_related_objects(self, model, Tstore):
-        """generate YAML content of referenced objects."""
-        #for ref_obj in self.referenced_objects:
-        #            self.generate_yaml(ref_obj)  
-        artifacts = Tstore.all_artifacts
-        for artifact in artifacts:      
-            for link in artifact.artifact_links :
-                 #print(link.link_type, link.artifact_uuid,link.model_element_uuid)
-                 model_element = model.by_uuid(link.model_element_uuid)
-                 #print("Linked Model Element",model_element.name)
-                 if model_element in self.referenced_objects or  model_element in self.primary_objects :
-                    #print("Adding Artifact",artifact.name,artifact.uuid)
-                    self.referenced_objects.append(artifact)
-      
-    def _track_referenced_objects(self, obj):
-        """Track referenced objects to allow further expansion as primary objects."""
-        if obj.__class__.__name__ ==  "LogicalComponent" or obj.__class__.__name__ ==  "SystemComponent"  :  
-            for comp in obj.components:
-                if comp not in self.referenced_objects:
-                    self.referenced_objects.append(comp)
-            for port in obj.ports:
-                if port not in self.referenced_objects:
-                    self.referenced_objects.append(port)
-                for e in port.exchanges:
-                    if e not in self.referenced_objects:
-                        self.referenced_objects.append(e)
-            for func in obj.allocated_functions:
-                if func not in self.referenced_objects:
-                    self.referenced_objects.append(func)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-                for pv in apvg.property_values:
-                    if pv not in self.referenced_objects:
-                        self.referenced_objects.append(pv)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for sm in obj.state_machines:
-                if sm not in self.referenced_objects:
-                    self.referenced_objects.append(sm)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-            if self.realizing_refs:
-                for rr in obj.realizing_components:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)
-            if self.realized_refs:
-                for rr in obj.realized_components:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)            
-
-        if obj.__class__.__name__ ==  "Entity" :  
-            for ent in obj.entities:
-                if ent not in self.referenced_objects:
-                    self.referenced_objects.append(ent)
-            for act in obj.activities:
-                if act not in self.referenced_objects:
-                    self.referenced_objects.append(act)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-                for pv in apvg.property_values:
-                    if pv not in self.referenced_objects:
-                        self.referenced_objects.append(pv)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for sm in obj.state_machines:
-                if sm not in self.referenced_objects:
-                    self.referenced_objects.append(sm)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-            if self.realizing_refs:
-                for rr in obj.realizing_components:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)
-            if self.realized_refs:
-                for rr in obj.realized_components:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)        
-        
-        if obj.__class__.__name__  ==  "PhysicalComponent" and obj.nature  ==  "NODE":  
-            for dc in getattr(obj, "deployed_components", []):  # Ensure it's iterable
-                if hasattr(dc, "name") and hasattr(dc, "uuid"):  # Avoid AttributeError
-                    if dc not in self.referenced_objects:
-                        self.referenced_objects.append(dc)
-            for comp in obj.components:
-                if comp not in self.referenced_objects:
-                    self.referenced_objects.append(comp)
-            for physical_port in obj.physical_ports:
-                if physical_port not in self.referenced_objects:
-                    self.referenced_objects.append(physical_port)
-                for link in physical_port.links:
-                    if link not in self.referenced_objects:
-                        self.referenced_objects.append(link)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-            if self.realized_refs:
-                for rr in obj.realized_components:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)  
-
-        if obj.__class__.__name__  ==  "PhysicalComponent" and obj.nature  ==  "BEHAVIOR":  
-            for dc in obj.deployed_components:
-                    if dc not in self.referenced_objects:
-                        self.referenced_objects.append(dc)
-            for comp in obj.components:
-                if comp not in self.referenced_objects:
-                    self.referenced_objects.append(comp)
-            for port in obj.ports:
-                if port not in self.referenced_objects:
-                    self.referenced_objects.append(port)
-                for e in port.exchanges:
-                    if e not in self.referenced_objects:
-                        self.referenced_objects.append(e)
-            for func in obj.allocated_functions:
-                if func not in self.referenced_objects:
-                    self.referenced_objects.append(func)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-            if self.realized_refs:
-                for rr in obj.realized_components:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)  
-
-
-        if obj.__class__.__name__  ==  "Requirement" :  
-            for rel in obj.relations:
-                    if rel not in self.referenced_objects:
-                        self.referenced_objects.append(rel)
-                
-        if obj.__class__.__name__ ==  "LogicalFunction" or obj.__class__.__name__ ==  "SystemFunction" or obj.__class__.__name__ ==  "PhysicalFunction":
-            if obj.owner not in self.referenced_objects:
-                    self.referenced_objects.append(obj.owner)
-            for port in obj.inputs:
-                if port not in self.referenced_objects:
-                    self.referenced_objects.append(port)
-                for e in port.exchanges:
-                    if e not in self.referenced_objects:
-                        self.referenced_objects.append(e)
-            for port in obj.outputs:
-                if port not in self.referenced_objects:
-                    self.referenced_objects.append(port)
-                for e in port.exchanges:
-                    if e not in self.referenced_objects:
-                        self.referenced_objects.append(e)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-            if self.realizing_refs:
-                for rr in obj.realizing_functions:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)
-            if self.realized_refs:
-                for rr in obj.realized_functions:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr) 
-
-
-        if obj.__class__.__name__ ==  "OperationalActivity" :  
-            if obj.owner not in self.referenced_objects:
-                    self.referenced_objects.append(obj.owner)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for ain in obj.inputs:
-                if ain not in self.referenced_objects:
-                    self.referenced_objects.append(ain)
-            for out in obj.outputs:
-                if out not in self.referenced_objects:
-                    self.referenced_objects.append(out)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-            if self.realizing_refs:
-                for rr in obj.realizing_system_functions:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)
-
-
-        if obj.__class__.__name__ ==  "OperationalCapability" :  
-            for this_obj in obj.includes:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj.target)
-            for this_obj in obj.extends:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj.target)
-            for this_obj in obj.involved_entities:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj)
-            for this_obj in obj.involved_activities:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj)
-            for this_obj in obj.involved_processes:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj)         
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-            if self.realizing_refs:
-                for rr in obj.realizing_capabilities:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)
-
-
-        if obj.__class__.__name__ ==  "Capability"  :  
-            for this_obj in obj.includes:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj.target)
-            for this_obj in obj.extends:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj.target)
-            for this_obj in obj.involved_components:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj)
-            for this_obj in obj.involved_functions:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj)
-            for this_obj in obj.involved_chains:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj)         
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-
-        if obj.__class__.__name__ == "CapabilityRealization" :  
-
-            for this_obj in obj.involved_components:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj)
-            for this_obj in obj.involved_functions:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj)
-            for this_obj in obj.involved_chains:
-                if this_obj not in self.referenced_objects:
-                    self.referenced_objects.append(this_obj)         
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-
-        if  obj.__class__.__name__ ==  "OperationalProcess" :  
-            for inv in obj.involved:
-                if inv not in self.referenced_objects:
-                    self.referenced_objects.append(inv)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-            if self.realizing_refs:
-                for rr in obj.realizing_chains:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)
-            if self.realized_refs:
-                for rr in obj.realized_chains:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr) 
-
-        if obj.__class__.__name__ ==  "FunctionalChain"  :  
-            for inv in obj.involved:
-                if inv not in self.referenced_objects:
-                    self.referenced_objects.append(inv)
-            for inv in obj.involved_chains:
-                if inv not in self.referenced_objects:
-                    self.referenced_objects.append(inv)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-            if self.realizing_refs:
-                for rr in obj.realizing_chains:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)
-            if self.realized_refs:
-                for rr in obj.realized_chains:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr) 
-
-        if obj.__class__.__name__ ==  "StateTransition" :  
-            for eff in obj.effects:
-                if eff not in self.referenced_objects:
-                    self.referenced_objects.append(eff)
-            for t in obj.triggers:
-                if t not in self.referenced_objects:
-                    self.referenced_objects.append(t)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-
-        if obj.__class__.__name__ ==  "State" : 
-            for og in obj.outgoing_transitions:
-                if og not in self.referenced_objects:
-                    self.referenced_objects.append(og)
-            for inc in obj.incoming_transitions:
-                if inc not in self.referenced_objects:
-                    self.referenced_objects.append(inc)
-            for da in obj.do_activity:
-                if da not in self.referenced_objects:
-                    self.referenced_objects.append(da)
-            for en in obj.entries:
-                if en not in self.referenced_objects:
-                    self.referenced_objects.append(en)
-            for ex in obj.exits:
-                if ex not in self.referenced_objects:
-                    self.referenced_objects.append(ex)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-        if obj.__class__.__name__ ==  "InitialPseudoState" :  
-            for og in obj.outgoing_transitions:
-                if og not in self.referenced_objects:
-                    self.referenced_objects.append(og)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con)  
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-        
-        if obj.__class__.__name__ ==  "StateMachine" :  
-            for region in obj.regions:
-                for state in region.states:
-                    if state not in self.referenced_objects:
-                        self.referenced_objects.append(state)
-                for transition in region.transitions:
-                    if transition not in self.referenced_objects:
-                        self.referenced_objects.append(transition)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con) 
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-
-        if obj.__class__.__name__ ==  "PropertyValueGroup" :  
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con) 
-            for pvg in obj.property_value_groups:
-                if pvg not in self.referenced_objects:
-                    self.referenced_objects.append(pvg)
-            for pv in obj.property_values:
-                if pv not in self.referenced_objects:
-                    self.referenced_objects.append(pv)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-
-        if obj.__class__.__name__ ==  "FunctionalExchange" :
-            for ei in obj.exchange_items:
-                if ei not in self.referenced_objects:
-                    self.referenced_objects.append(ei)
-            #for fc in obj.involving_functional_chains:
-            #    if fc not in self.referenced_objects:
-            #        self.referenced_objects.append(fc)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con) 
-            for pvg in obj.property_value_groups:
-                if pvg not in self.referenced_objects:
-                    self.referenced_objects.append(pvg)
-            for pv in obj.property_values:
-                if pv not in self.referenced_objects:
-                    self.referenced_objects.append(pv)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-            if self.realizing_refs:
-                for rr in obj.realizing_functional_exchanges:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)
-            if self.realized_refs:
-                for rr in obj.realized_functional_exchanges:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr) 
-
-        if obj.__class__.__name__ ==  "Interaction" :
-            for ei in obj.exchange_items:
-                if ei not in self.referenced_objects:
-                    self.referenced_objects.append(ei)
-            #for op in obj.involving_operational_processes:
-            #    if op not in self.referenced_objects:
-            #        self.referenced_objects.append(op)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con) 
-            for pvg in obj.property_value_groups:
-                if pvg not in self.referenced_objects:
-                    self.referenced_objects.append(pvg)
-            for pv in obj.property_values:
-                if pv not in self.referenced_objects:
-                    self.referenced_objects.append(pv)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-        if obj.__class__.__name__ ==  "PhysicalLink" :
-            #print(obj)
-            for obj in obj.exchanges:
-                if obj not in self.referenced_objects:
-                    self.referenced_objects.append(obj)
-             # Only attempt to access `physical_paths` if the object has that attribute
-            if hasattr(obj, "physical_paths"):
-                for ppath in obj.physical_paths:
-                    if ppath not in self.referenced_objects:
-                        self.referenced_objects.append(ppath)          
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con) 
-            for pvg in obj.property_value_groups:
-                if pvg not in self.referenced_objects:
-                    self.referenced_objects.append(pvg)
-            for pv in obj.property_values:
-                if pv not in self.referenced_objects:
-                    self.referenced_objects.append(pv)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-
-        if obj.__class__.__name__ ==  "PhysicalPath" :
-            for inv in obj.involved_items:
-                if inv not in self.referenced_objects:
-                    self.referenced_objects.append(inv)
-            for obj in obj.exchanges:
-                if obj not in self.referenced_objects:
-                    self.referenced_objects.append(obj)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con) 
-            for pvg in obj.property_value_groups:
-                if pvg not in self.referenced_objects:
-                    self.referenced_objects.append(pvg)
-            for pv in obj.property_values:
-                if pv not in self.referenced_objects:
-                    self.referenced_objects.append(pv)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)                        
-               
-        if obj.__class__.__name__ ==  "ComponentExchange" :
-            for ei in obj.exchange_items:
-                if ei not in self.referenced_objects:
-                    self.referenced_objects.append(ei)
-            for afe in obj.allocated_functional_exchanges:
-                if afe not in self.referenced_objects:
-                    self.referenced_objects.append(afe)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con) 
-            for pvg in obj.property_value_groups:
-                if pvg not in self.referenced_objects:
-                    self.referenced_objects.append(pvg)
-            for pv in obj.property_values:
-                if pv not in self.referenced_objects:
-                    self.referenced_objects.append(pv)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-            if self.realizing_refs:
-                for rr in obj.realizing_component_exchanges:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr)
-            if self.realized_refs:
-                for rr in obj.realized_component_exchanges:
-                    if rr not in self.referenced_objects:
-                        self.referenced_objects.append(rr) 
-                    
-        if obj.__class__.__name__ ==  "ExchangeItem" :
-            for e in obj.elements:
-                if e not in self.referenced_objects:
-                    self.referenced_objects.append(e)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con) 
-            for pvg in obj.property_value_groups:
-                if pvg not in self.referenced_objects:
-                    self.referenced_objects.append(pvg)
-            for pv in obj.property_values:
-                if pv not in self.referenced_objects:
-                    self.referenced_objects.append(pv)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-                    
-        if obj.__class__.__name__ ==  "ExchangeItemElement" :
-            if obj.abstract_type not in self.referenced_objects:
-                self.referenced_objects.append(obj.abstract_type)
-            for apvg in obj.applied_property_value_groups:
-                if apvg not in self.referenced_objects:
-                    self.referenced_objects.append(apvg)
-            for apv in obj.applied_property_values:
-                if apv not in self.referenced_objects:
-                    self.referenced_objects.append(apv)
-            for con in obj.constraints:
-                if con not in self.referenced_objects:
-                    self.referenced_objects.append(con) 
-            for pvg in obj.property_value_groups:
-                if pvg not in self.referenced_objects:
-                    self.referenced_objects.append(pvg)
-            for pv in obj.property_values:
-                if pv not in self.referenced_objects:
-                    self.referenced_objects.append(pv)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-        if obj.__class__.__name__ ==  "Diagram" :
-            for node in obj.nodes:
-                if node not in self.referenced_objects:
-                    self.referenced_objects.append(node)
-        if obj.__class__.__name__ ==  "Part" :
-            if obj.type not in self.referenced_objects:
-                self.referenced_objects.append(obj.type)
-                
-        if obj.__class__.__name__  ==  "FunctionInputPort" or obj.__class__.__name__  ==  "FunctionOutputPort"  or obj.__class__.__name__  ==  "PhysicalPort" or obj.__class__.__name__  ==  "ComponentPort":   
-            if obj.owner not in self.referenced_objects:
-                self.referenced_objects.append(obj.owner)
-            for req in obj.requirements:
-                if req not in self.referenced_objects:
-                    self.referenced_objects.append(req)
-                    
-    def generate_yaml(self, obj):
-        
 
-        
-        def sanitize_description_images(html: str, img_dir: Path, prefix="img") -> str:
-            """
-            Extract base64-encoded images from HTML and replace them with file references.
-        
-            :param html: HTML content with embedded base64 images
-            :param img_dir: Path to the directory where image files will be saved
-            :param prefix: Filename prefix for images (default: 'img')
-            :return: Sanitized HTML with image references
-            """
-            if html is None:
-                return ""
-
-            img_dir.mkdir(parents=True, exist_ok=True)
-        
-            def replacer(match):
-                b64_data = match.group(1)
-                img_index = len(list(img_dir.glob(f"{prefix}_*.png"))) + 1
-                filename = f"{prefix}_{img_index}.png"
-                filepath = img_dir / filename
-        
-                # Write image file
-                with open(filepath, "wb") as f:
-                    f.write(base64.b64decode(b64_data))
-        
-                return f'<img src="{filename}"'
-        
-            # Match and replace <img src="data:image/png;base64,...">
-            pattern = r'<img\s+[^>]*src="data:image\/png;base64,([^"]+)"'
-            html = re.sub(pattern, replacer, html)
-        
-            return html
-
-
-        img_dir = Path("capella_yaml_images")        
-
-        """Generate YAML for primary objects and manage references."""
-
-        diagram = """
+_DIAGRAM_TEMPLATE = """
     - name: '{{ name }}'
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -926,8 +35,9 @@ model:
       - name: {{ n.name }}
         ref_uuid: {{ n.uuid }}
       {% endfor %}
-"""   
-        part = """
+"""
+
+_PART_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -935,9 +45,9 @@ model:
       reference object  :
       - name: {{ type_name }}
         ref_uuid: {{ type_uuid }}
-"""   
+"""
 
-        port_template = """
+_PORT_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -970,8 +80,8 @@ model:
       {% endfor %}
       {% endif %}
 """
-        
-        default_template = """
+
+_DEFAULT_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1001,7 +111,8 @@ model:
       {% endfor %}
       {% endif %}
 """
-        Requirement_template = """
+
+_REQUIREMENT_TEMPLATE = """
     - name: {{  name  }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1020,7 +131,7 @@ model:
       {% endif %}
 """
 
-        CapellaOutgoingRelation_template = """    
+_CAPELLA_OUTGOING_RELATION_TEMPLATE = """    
     - name: {{ long_name if long_name.strip() else type_name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1036,7 +147,8 @@ model:
        - name: {{ target_name }}
          ref_uuid: {{ target_uuid }}
 """
-        exchangeitem_template = """
+
+_EXCHANGE_ITEM_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1067,7 +179,8 @@ model:
       {% endif %}
 
 """
-        exchangeitemelement_template = """
+
+_EXCHANGE_ITEM_ELEMENT_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1097,8 +210,7 @@ model:
 
 """
 
-        
-        Traceability_artifact = """
+_TRACEABILITY_ARTIFACT_TEMPLATE = """
     - name: {{ name }}
       type: {{type}} Polarion Workitem Requirement
       primary_uuid: {{ uuid }}
@@ -1110,8 +222,9 @@ model:
          ref_uuid: {{ link.model_element_uuid}}
       {% endfor %}
       {% endif %}
-"""     
-        state_machine_template = """
+"""
+
+_STATE_MACHINE_TEMPLATE = """
     - name: {{ name }}
       type: {{type}} 
       primary_uuid: {{ uuid }}
@@ -1137,8 +250,9 @@ model:
         {% endfor %}
       {% endif %}
 
-"""     
-        state_template = """
+"""
+
+_STATE_TEMPLATE = """
     - name: {{ name }}
       type: {{ type }}
       primary_uuid: {{ uuid }}
@@ -1178,8 +292,9 @@ model:
           ref_uuid: {{ ex.uuid }}
         {% endfor %}
        {% endif %}
-"""    
-        psusdo_state_template = """
+"""
+
+_PSEUDO_STATE_TEMPLATE = """
     - name: {{ name }}
       type: {{ type }}
       primary_uuid: {{ uuid }}
@@ -1191,9 +306,9 @@ model:
           ref_uuid: {{ og.uuid }}
         {% endfor %}
       {% endif %}
-"""   
-        
-        transition_template = """
+"""
+
+_TRANSITION_TEMPLATE = """
     - name: {{ name }}
       type: {{ type }}
       primary_uuid: {{ uuid }}
@@ -1219,8 +334,9 @@ model:
           ref_uuid: {{ ef.uuid }}
         {% endfor %}
       {% endif %}
-"""  
-        interaction_template = """
+"""
+
+_INTERACTION_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1267,8 +383,9 @@ model:
          ref_uuid: {{ e.uuid }}
        {% endfor %}
       {% endif %}
-"""       
-        function_exchange_template = """
+"""
+
+_FUNCTION_EXCHANGE_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1329,7 +446,7 @@ model:
       {% endif %}  
 """
 
-        communication_mean_template = """
+_COMMUNICATION_MEAN_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1377,8 +494,8 @@ model:
       {% endfor %}
       {% endif %}
 """
-        
-        component_exchange_template = """
+
+_COMPONENT_EXCHANGE_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1438,7 +555,8 @@ model:
       {% endfor %}
       {% endif %}      
 """
-        physical_link_template = """
+
+_PHYSICAL_LINK_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1487,8 +605,7 @@ model:
       {% endif %}
 """
 
-        
-        op_template = """
+_OP_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1535,9 +652,9 @@ model:
          ref_uuid: {{ rc.uuid }}
       {% endfor %}
       {% endif %} 
-""" 
+"""
 
-        fc_template = """
+_FC_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1591,8 +708,9 @@ model:
          ref_uuid: {{ rc.uuid }}
       {% endfor %}
       {% endif %} 
-""" 
-        physicalpath_template = """
+"""
+
+_PHYSICAL_PATH_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1627,15 +745,17 @@ model:
       {% endfor %}
       {% endif %}
 
-""" 
-        property_value_template = """
+"""
+
+_PROPERTY_VALUE_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
       description: "{{ description | escape | replace('\n', ' ') }}"
       value :  {{ value }}
 """
-        property_value_group_template = """
+
+_PROPERTY_VALUE_GROUP_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1669,8 +789,9 @@ model:
       {% endfor %}
       {% endif %}
         
-""" 
-        logical_component_template = """
+"""
+
+_LOGICAL_COMPONENT_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1744,7 +865,7 @@ model:
       {% endif %}
 """
 
-        entity_template = """
+_ENTITY_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1804,7 +925,8 @@ model:
       {% endfor %}
       {% endif %}
 """
-        node_component_template = """
+
+_NODE_COMPONENT_TEMPLATE = """
     - name: {{ name }}
       type: {{type}} Node 
       primary_uuid: {{ uuid }}
@@ -1866,7 +988,7 @@ model:
       {% endif %}
 """
 
-        function_template = """
+_FUNCTION_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -1945,7 +1067,7 @@ model:
       {% endif %}
 """
 
-        activity_template = """
+_ACTIVITY_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -2018,7 +1140,7 @@ model:
       {% endif %}
 """
 
-        oc_template = """
+_OC_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -2079,7 +1201,7 @@ model:
       {% endif %}
 """
 
-        cap_template = """
+_CAP_TEMPLATE = """
     - name: {{ name }}
       type: {{type}}
       primary_uuid: {{ uuid }}
@@ -2138,893 +1260,2239 @@ model:
          ref_uuid: {{ rc.uuid }}
       {% endfor %}
       {% endif %}
-"""     
-        
-        # Build the data for the YAML generation
-        #print("Type:", obj.__class__.__name__)
-        if obj not in self.primary_objects:
-            self.primary_objects.append(obj)
-        if obj.__class__.__name__ ==  "LogicalComponent" or obj.__class__.__name__ ==  "SystemComponent" :    
-            data = {
-                "type" : obj.__class__.__name__,
-                "parent_uuid": obj.parent.uuid if obj.parent else None,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "is_human":obj.is_human,
-                "description" :obj.description,
-                "components" : [{"name": c.name , "uuid": c.uuid} for c in obj.components],
-                "allocated_functions": [{"name": f.name , "uuid": f.uuid} for f in obj.allocated_functions],
-                "ports": [{
-                    "name": p.name,
-                    "uuid": p.uuid,
-                    "description": p.description,
-                    "exchanges": [{"name": e.name, "uuid": e.uuid, "description": e.description,"source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid} for e in getattr(p, 'exchanges', [])]
-                         } for p in obj.ports],
-                 "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                 "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                 "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
-                 "state_machines": [{"name": sm.name, "uuid": sm.uuid} for sm in obj.state_machines],
-                 "realizing_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realizing_components] if self.realizing_refs else [],
-                 "realized_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_components] if self.realized_refs else []
-
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(logical_component_template)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content += template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-
-        # Build the data for the YAML generation
-        elif obj.__class__.__name__ ==  "Entity" :    
-            data = {
-                "type" : obj.__class__.__name__,
-                "parent_uuid": obj.parent.uuid if obj.parent else None,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "is_human":obj.is_human,
-                "is_actor":obj.is_actor,
-                "description" :obj.description,
-                "entities": [{"name": ent.name , "uuid": ent.uuid} for ent in obj.entities],
-                "allocated_activities": [{"name": a.name , "uuid": a.uuid} for a in obj.activities],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
-                "state_machines": [{"name": sm.name, "uuid": sm.uuid} for sm in obj.state_machines],
-                "realizing_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realizing_components] if self.realizing_refs else [],
-                "realized_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_components] if self.realized_refs else []
-
-            }
-            #print(data)
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(entity_template)
-
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-        # Build the data for the YAML generation      
-        elif  obj.__class__.__name__ ==  "OperationalProcess":    
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "involved": [{"name": inv.name , "uuid": inv.uuid, "type": inv.__class__.__name__ } for inv in obj.involved],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
-                "realizing_chains": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realizing_chains] if self.realizing_refs else [],
-                "realized_chains": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realized_chains] if self.realized_refs else []
-            }
-
-            
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(op_template)
-
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-        elif obj.__class__.__name__ ==  "FunctionalChain":    
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "involved": [{"name": inv.name , "uuid": inv.uuid, "type": inv.__class__.__name__ } for inv in obj.involved],
-                "involved_chains": [{"name": inv.name , "uuid": inv.uuid, "type": inv.__class__.__name__ } for inv in obj.involved_chains],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
-                "realizing_chains": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realizing_chains] if self.realizing_refs else [],
-                "realized_chains": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realized_chains] if self.realized_refs else []
-            }
-
-            
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(fc_template)
+"""
 
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
+# Template sources keyed by Capella class name. PhysicalComponent is rendered
+# differently depending on its nature, so those keys carry a ":<nature>" suffix.
+_TEMPLATE_SOURCES = {
+    "LogicalComponent": _LOGICAL_COMPONENT_TEMPLATE,
+    "SystemComponent": _LOGICAL_COMPONENT_TEMPLATE,
+    "PhysicalComponent:BEHAVIOR": _LOGICAL_COMPONENT_TEMPLATE,
+    "PhysicalComponent:NODE": _NODE_COMPONENT_TEMPLATE,
+    "Entity": _ENTITY_TEMPLATE,
+    "OperationalProcess": _OP_TEMPLATE,
+    "FunctionalChain": _FC_TEMPLATE,
+    "SystemFunction": _FUNCTION_TEMPLATE,
+    "LogicalFunction": _FUNCTION_TEMPLATE,
+    "PhysicalFunction": _FUNCTION_TEMPLATE,
+    "OperationalActivity": _ACTIVITY_TEMPLATE,
+    "OperationalCapability": _OC_TEMPLATE,
+    "Capability": _CAP_TEMPLATE,
+    "CapabilityRealization": _CAP_TEMPLATE,
+    "Interaction": _INTERACTION_TEMPLATE,
+    "FunctionalExchange": _FUNCTION_EXCHANGE_TEMPLATE,
+    "ComponentExchange": _COMPONENT_EXCHANGE_TEMPLATE,
+    "CommunicationMean": _COMMUNICATION_MEAN_TEMPLATE,
+    "PhysicalLink": _PHYSICAL_LINK_TEMPLATE,
+    "PhysicalPath": _PHYSICAL_PATH_TEMPLATE,
+    "FunctionInputPort": _PORT_TEMPLATE,
+    "FunctionOutputPort": _PORT_TEMPLATE,
+    "PhysicalPort": _PORT_TEMPLATE,
+    "ComponentPort": _PORT_TEMPLATE,
+    "StringPropertyValue": _PROPERTY_VALUE_TEMPLATE,
+    "FloatPropertyValue": _PROPERTY_VALUE_TEMPLATE,
+    "IntegerPropertyValue": _PROPERTY_VALUE_TEMPLATE,
+    "PropertyValueGroup": _PROPERTY_VALUE_GROUP_TEMPLATE,
+    "StateMachine": _STATE_MACHINE_TEMPLATE,
+    "State": _STATE_TEMPLATE,
+    "InitialPseudoState": _PSEUDO_STATE_TEMPLATE,
+    "StateTransition": _TRANSITION_TEMPLATE,
+    "ExchangeItem": _EXCHANGE_ITEM_TEMPLATE,
+    "ExchangeItemElement": _EXCHANGE_ITEM_ELEMENT_TEMPLATE,
+    "Traceability_Artifact": _TRACEABILITY_ARTIFACT_TEMPLATE,
+    "Diagram": _DIAGRAM_TEMPLATE,
+    "Part": _PART_TEMPLATE,
+    "Requirement": _REQUIREMENT_TEMPLATE,
+    "CapellaOutgoingRelation": _CAPELLA_OUTGOING_RELATION_TEMPLATE,
+    "_default": _DEFAULT_TEMPLATE,
+}
+
+
+def _create_template_environment():
+    """Create the Jinja environment shared by all YAML templates."""
+    try:
+        bytecode_cache = jinja2.FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        # No writable temp directory; templates are still cached in memory.
+        bytecode_cache = None
+    return jinja2.Environment(loader=jinja2.DictLoader(dict(_TEMPLATE_SOURCES)), bytecode_cache=bytecode_cache)
+
+
+_TEMPLATE_ENV = _create_template_environment()
+_COMPILED_TEMPLATES = {}
+
+
+def register_template(class_name, source):
+    """
+    Register (or replace) the Jinja template used to render a Capella class.
+
+    Objects whose class has no tailored handling in ``generate_yaml`` are
+    rendered with the template registered under their class name, falling back
+    to the default template. Such templates receive the default data (name,
+    uuid, description, property values, constraints) plus the object itself as
+    ``obj``, so any other attribute can be reached from the template.
+
+    :param class_name: Capella class name, e.g. "Mission". Use
+        "PhysicalComponent:NODE" / "PhysicalComponent:BEHAVIOR" for physical components.
+    :param source: Jinja template source for one YAML list item.
+    """
+    _TEMPLATE_ENV.loader.mapping[class_name] = source
+    _COMPILED_TEMPLATES.pop(class_name, None)
+
+
+def get_yaml_template(class_name):
+    """Return the compiled template registered for a class name, or None."""
+    template = _COMPILED_TEMPLATES.get(class_name)
+    if template is None and class_name in _TEMPLATE_ENV.loader.mapping:
+        template = _TEMPLATE_ENV.get_template(class_name)
+        _COMPILED_TEMPLATES[class_name] = template
+    return template
+
+
+class UUIDOrderedSet:
+    """
+    Ordered collection of model objects keyed by UUID.
+
+    Behaves like the list it replaces (``append``, ``in``, iteration, ``len``)
+    but membership tests are O(1) and an object is only stored once.
+    Insertion order is kept, and iterating while appending visits the newly
+    appended objects too, exactly like iterating a growing list.
+    """
+
+    def __init__(self, objects=None):
+        self._objects = []
+        self._keys = set()
+        for obj in objects or []:
+            self.add(obj)
+
+    @staticmethod
+    def _key(obj):
+        uuid = getattr(obj, "uuid", None)
+        return uuid if uuid is not None else ("id", id(obj))
+
+    def add(self, obj):
+        """Add an object if its UUID is not yet present. Returns True if added."""
+        key = self._key(obj)
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        self._objects.append(obj)
+        return True
+
+    append = add
+
+    def __contains__(self, obj):
+        return self._key(obj) in self._keys
+
+    def __iter__(self):
+        index = 0
+        while index < len(self._objects):
+            yield self._objects[index]
+            index += 1
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __getitem__(self, index):
+        return self._objects[index]
+
+    def clear(self):
+        self._objects.clear()
+        self._keys.clear()
+
+
+_YAML_HEADER = """
+---  
+# YAML file for system model relationships
+model:
+  schema:
+    primary_uuid: Unique identifier for the primary object
+    ref_uuid: Unique identifier for a referenced object
+  objects:
+"""
 
+_OUTPUT_FILE_HEADER = "# YAML file for Capella objects\n"
+
+
+class YAMLChunkWriter:
+    """
+    Write rendered YAML chunks while dropping blank lines as they arrive.
+
+    Each chunk is filtered on its own, so the document never has to be held
+    and re-split as a whole. Lines split across two chunks are joined before
+    filtering. Filtered text goes to ``stream`` (e.g. an open file) when one is
+    given, otherwise it is kept in a list of chunks.
+    """
+
+    def __init__(self, stream=None, strip_blank_lines=True):
+        self.stream = stream
+        self.strip_blank_lines = strip_blank_lines
+        self._chunks = []
+        self._partial = ""
+
+    def write(self, text):
+        """Filter one chunk of YAML and pass its non-blank lines on."""
+        if not self.strip_blank_lines:
+            self._emit(text)
+            return
+        lines = (self._partial + text).splitlines(keepends=True)
+        self._partial = ""
+        if lines and lines[-1].splitlines()[0] == lines[-1]:
+            # No line break yet, the rest of the line comes with the next chunk.
+            self._partial = lines.pop()
+        filtered = "".join(line.splitlines()[0] + "\n" for line in lines if line.strip())
+        if filtered:
+            self._emit(filtered)
+
+    def _emit(self, text):
+        if self.stream is not None:
+            self.stream.write(text)
+        else:
+            self._chunks.append(text)
+
+    def set_stream(self, stream):
+        """Send further output to ``stream``, starting with what was collected so far."""
+        for chunk in self._chunks:
+            stream.write(chunk)
+        self._chunks = []
+        self.stream = stream
+
+    def flush(self):
+        """Flush the stream. A pending partial line is kept for the next chunk."""
+        if self.stream is not None:
+            self.stream.flush()
+
+    def finish(self):
+        """Write the pending partial line, if any, and flush."""
+        if self._partial.strip():
+            self._emit(self._partial + "\n")
+        self._partial = ""
+        self.flush()
+
+    def pending(self):
+        """Return the pending partial line as it would be written, or ""."""
+        return self._partial + "\n" if self._partial.strip() else ""
+
+    def getvalue(self):
+        """Return the collected YAML, one non-blank line per line, without trailing newline."""
+        content = "".join(self._chunks) + self.pending()
+        return content[:-1] if content.endswith("\n") else content
+
+
+_UUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+_INCREMENTAL_CACHE_VERSION = 1
+
+
+def compute_element_fingerprints(model):
+    """
+    Hash every element of a model's XML files, keyed by UUID.
+
+    An element's hash covers its attributes and text, the hashes of its
+    children (so its whole subtree) and the ids of the elements referring to
+    it. Adding an exchange to a port therefore changes the hash of the port
+    and, through the subtree, the hash of the component owning the port.
+
+    :param model: capellambse.MelodyModel
+    :return: dict of UUID -> hex digest
+    """
+    elements = []
+    incoming = {}
+    for tree in model._loader.trees.values():
+        for element in tree.root.iter():
+            if not isinstance(element.tag, str):
+                continue  # comments and processing instructions
+            elements.append(element)
+            referrer = None
+            for name, value in element.attrib.items():
+                if name == "id":
+                    continue
+                for uuid in _UUID_RE.findall(value):
+                    if referrer is None:
+                        referrer = element.get("id") or next(
+                            (a.get("id") for a in element.iterancestors() if a.get("id")), "")
+                    incoming.setdefault(uuid, set()).add(referrer)
+
+    # Children come after their parent in document order, so walking the list
+    # backwards hashes every child before its parent.
+    digests = {}
+    fingerprints = {}
+    for element in reversed(elements):
+        h = hashlib.sha1(element.tag.encode())
+        for name, value in sorted(element.attrib.items()):
+            h.update(f"\0{name}={value}".encode())
+        h.update(f"\0{(element.text or '').strip()}".encode())
+        for child in element:
+            digest = digests.get(child)
+            if digest is not None:
+                h.update(digest)
+        uuid = element.get("id")
+        if uuid is not None:
+            for referrer in sorted(incoming.get(uuid, ())):
+                h.update(f"\0<{referrer}".encode())
+        digests[element] = h.digest()
+        if uuid is not None:
+            fingerprints[uuid] = h.hexdigest()
+    return fingerprints
+
+
+class IncrementalYAMLCache:
+    """
+    Side-car cache of rendered YAML fragments for incremental exports.
+
+    Each entry maps a UUID to the element's fingerprint (see
+    compute_element_fingerprints), the fingerprints of the elements its
+    fragment depends on, the objects it tracks as references and the rendered
+    fragment. An entry is reused while none of these fingerprints changed.
+    The dependencies are the UUIDs that appear in the fragment plus the
+    tracked references, so a renamed neighbour re-renders every element
+    listing it.
+    """
+
+    def __init__(self, cache_file, settings):
+        self.cache_file = str(cache_file)
+        self.settings = settings
+        self.items = {}
+        self.reused = 0
+        self.rendered = 0
+        self._model = None
+        self._fingerprints = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable YAML cache {self.cache_file}: {e}")
+            return
+        if data.get("meta") != self.settings:
+            print(f"ℹ️ YAML cache {self.cache_file} was made with other settings, rendering everything.")
+            return
+        self.items = data.get("items", {})
+
+    def fingerprints(self, model):
+        """Return the element fingerprints of ``model``, computed once per model."""
+        if model is not self._model:
+            self._model = model
+            self._fingerprints = compute_element_fingerprints(model)
+        return self._fingerprints
+
+    def lookup(self, uuid, key):
+        """Return the cached entry of ``uuid`` if it and its dependencies are unchanged."""
+        entry = self.items.get(uuid)
+        if entry is None or entry["hash"] != key:
+            return None
+        for dep, fingerprint in entry["deps"].items():
+            if self._fingerprints.get(dep) != fingerprint:
+                return None
+        return entry
+
+    def store(self, uuid, key, fragment, refs):
+        """Remember the rendered fragment of ``uuid`` and the references it tracked."""
+        deps = set(_UUID_RE.findall(fragment))
+        deps.update(ref for ref in refs if ref)
+        deps.discard(uuid)
+        self.items[uuid] = {
+            "hash": key,
+            "deps": {dep: self._fingerprints.get(dep) for dep in sorted(deps)},
+            "refs": refs,
+            "yaml": fragment,
+        }
+
+    def save(self):
+        """Write the cache, dropping elements that are no longer in the model."""
+        if self._model is not None:
+            self.items = {uuid: e for uuid, e in self.items.items() if uuid in self._fingerprints}
+        tmp_file = self.cache_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"meta": self.settings, "items": self.items}, f)
+        os.replace(tmp_file, self.cache_file)
+        print(f"♻️ YAML cache: {self.reused} objects reused, {self.rendered} rendered ({self.cache_file})")
+
+
+class ImageStore:
+    """
+    Content-addressed store for images embedded in descriptions.
+
+    Images are named after a hash of their decoded bytes, so an image used by
+    several elements is written once and gets the same file name in every
+    export, also across export_model worker processes. The file names already
+    in the directory are listed once into an in-memory manifest. Files are
+    written on a background thread pool; call flush() to wait for them.
+    """
+
+    def __init__(self, img_dir="capella_yaml_images", prefix="img", max_workers=4):
+        self.img_dir = Path(img_dir)
+        self.prefix = prefix
+        self.max_workers = max_workers
+        self._manifest = None
+        self._names = {}
+        self._pool = None
+        self._futures = []
+
+    def _load_manifest(self):
+        self.img_dir.mkdir(parents=True, exist_ok=True)
+        self._manifest = {p.name for p in self.img_dir.glob(f"{self.prefix}_*.png")}
+
+    def add(self, b64_data):
+        """
+        Store a base64-encoded PNG image and return its file name.
 
-# Build the data for the YAML generation
-        
-       
-        elif obj.__class__.__name__ ==  "SystemFunction" or obj.__class__.__name__ ==  "LogicalFunction" or obj.__class__.__name__ ==  "PhysicalFunction":    
-
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "owner_name" :obj.owner.name if obj.owner else None,
-                "owner_uuid" :obj.owner.uuid if obj.owner else None,
-                "child_functions" :[{"name": func.name, "uuid": func.uuid} for func in obj.functions],
-                "inputs": [{
-                    "name": p.name,
-                    "uuid": p.uuid,
-                    "description": p.description,
-                    "exchanges": [{"name": e.name, "uuid": e.uuid, "description":e.description, "source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid  } for e in getattr(p, 'exchanges', [])]
-                         } for p in obj.inputs],
-                "outputs": [{
-                    "name": p.name,
-                    "uuid": p.uuid,
-                    "description": p.description,
-                    "exchanges": [{"name": e.name, "uuid": e.uuid, "description":e.description, "source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid } for e in getattr(p, 'exchanges', [])]
-                         } for p in obj.outputs],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
-                "realizing_funcs": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realizing_functions] if self.realizing_refs else [],
-                "realized_funcs": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realized_functions] if self.realized_refs else []
-            }
-    
-            # Add referenced objects for expansion  
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(function_template)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-                       
- 
-
-        elif obj.__class__.__name__ ==  "OperationalActivity" : 
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "owner_name" :obj.owner.name if obj.owner else None,
-                "owner_uuid" :obj.owner.uuid if obj.owner else None,
-                "child activities" :[{"name": func.name, "uuid": func.uuid} for func in obj.activities],
-                "inputs": [{
-                    "name": p.name,
-                    "uuid": p.uuid,
-                    "description": p.description,
-                    "exchanges": [{"name": e.name, "uuid": e.uuid, "description":e.description, "source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid  } for e in getattr(p, 'exchanges', [])]
-                         } for p in obj.inputs],
-                "outputs": [{
-                    "name": p.name,
-                    "uuid": p.uuid,
-                    "description": p.description,
-                    "exchanges": [{"name": e.name, "uuid": e.uuid, "description":e.description, "source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid } for e in getattr(p, 'exchanges', [])]
-                         } for p in obj.outputs],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
-                "realizing_sys_funcs": [{"name": rr.name, "uuid": rr.uuid} for rr in obj.realizing_system_functions] if self.realizing_refs else []
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(activity_template)
+        :param b64_data: Base64 text of the image
+        :return: File name of the image inside img_dir
+        """
+        name = self._names.get(b64_data)
+        if name is not None:
+            return name
+        data = base64.b64decode(b64_data)
+        name = f"{self.prefix}_{hashlib.sha256(data).hexdigest()[:16]}.png"
+        self._names[b64_data] = name
+        if self._manifest is None:
+            self._load_manifest()
+        if name in self._manifest:
+            return name
+        self._manifest.add(name)
+        if self.max_workers:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            self._futures.append(self._pool.submit(self._write, self.img_dir / name, data))
+        else:
+            self._write(self.img_dir / name, data)
+        return name
+
+    @staticmethod
+    def _write(path, data):
+        # Write next to the target and rename, so a reader (or another export
+        # process writing the same image) never sees a partial file.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def sanitize_description_images(self, html):
+        """
+        Extract base64-encoded images from HTML and replace them with file references.
 
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-        
-# Build the data for the YAML generation
-
-        elif obj.__class__.__name__ ==  "OperationalCapability" : 
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "includes_capabilities" :[{"name": t_obj.target.name, "uuid": t_obj.target.uuid} for t_obj in obj.includes],
-                "extended_capabilities" :[{"name": t_obj.target.name, "uuid": t_obj.target.uuid} for t_obj in obj.extends],
-                "involved_activities" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_activities],
-                "involved_entities" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_entities],
-                "involved_operational_processes" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_processes],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
-                "realizing_caps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realizing_capabilities] if self.realizing_refs else []
-
-                        
-            }
+        :param html: HTML content with embedded base64 images
+        :return: Sanitized HTML with image references
+        """
+        if html is None:
+            return ""
+
+        def replacer(match):
+            return f'<img src="{self.add(match.group(1))}"'
+
+        # Match and replace <img src="data:image/png;base64,...">
+        pattern = r'<img\s+[^>]*src="data:image\/png;base64,([^"]+)"'
+        return re.sub(pattern, replacer, html)
+
+    def flush(self):
+        """Wait until all images are written. Raises the first write error, if any."""
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """Flush and stop the writer threads."""
+        self.flush()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class CapellaYAMLHandler:
+    def __init__(self,parser=None):
+        self.file_name = None
+        self.referenced_objects = UUIDOrderedSet()
+        self.primary_objects = UUIDOrderedSet()
+        self.parser = parser
+        self.realizing_refs = False
+        self.realized_refs = False
+        self._output_file = None
+        self._streamed_file = None
+        self._writer = YAMLChunkWriter()
+        self._writer.write(_YAML_HEADER)
+        self._incremental = None
+        self.image_store = ImageStore()
+
+    @property
+    def yaml_content(self):
+        """The YAML generated so far, with blank lines removed."""
+        return self.get_yaml_content()
+
+    @yaml_content.setter
+    def yaml_content(self, content):
+        self._streamed_file = None
+        self._writer = YAMLChunkWriter()
+        self._writer.write(content)
+
+    def _write(self, text):
+        """Append rendered YAML to the current output (memory or open file)."""
+        self._writer.write(text)
+
+
+    def set_realizing_refs(self, True_or_False):
+        self.realizing_refs = True_or_False
+
+
+    def set_realized_refs(self, True_or_False):
+        self.realized_refs = True_or_False
+
+
+    def set_incremental_cache(self, cache_file="capella_model.yaml.cache.json"):
+        """
+        Reuse the YAML of unchanged elements from a side-car cache file.
+
+        Only elements whose own subtree, referrers or listed neighbours changed
+        since the cache was written are rendered again. Call this after
+        set_realizing_refs/set_realized_refs; the cache is discarded when these
+        settings, the templates or the parser presence differ. The cache is
+        saved by write_output_file() or save_incremental_cache(). Description
+        images are only written when an element is rendered, so keep the image
+        directory next to the cache.
+
+        :param cache_file: Path of the JSON cache file, or None to turn the cache off.
+        """
+        if cache_file is None:
+            self._incremental = None
+            return
+        templates = hashlib.sha1(
+            json.dumps(_TEMPLATE_ENV.loader.mapping, sort_keys=True).encode()).hexdigest()
+        settings = {
+            "version": _INCREMENTAL_CACHE_VERSION,
+            "realizing_refs": bool(self.realizing_refs),
+            "realized_refs": bool(self.realized_refs),
+            "teamcenter": self.parser is not None,
+            "templates": templates,
+        }
+        self._incremental = IncrementalYAMLCache(cache_file, settings)
+
+    def save_incremental_cache(self):
+        """Write the incremental cache, if one is set."""
+        if self._incremental is not None:
+            self._incremental.save()
+
+    def _incremental_key(self, obj):
+        """Return the cache key of ``obj``, or None if it cannot be cached."""
+        model = getattr(obj, "_model", None)
+        if model is None or getattr(obj, "_element", None) is None \
+                or isinstance(obj, capellambse.model.AbstractDiagram):
+            return None
+        key = self._incremental.fingerprints(model).get(obj.uuid)
+        if key is not None and self.parser:
+            item = self.parser.get_by_id(obj.uuid)
+            key += ":" + hashlib.sha1(repr(item).encode()).hexdigest()
+        return key
+
+    def generate_teamcenter_yaml_snippet(self, uuid, indent="    "):
+        """
+        Generate Teamcenter metadata snippet with proper YAML indentation.
     
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
+        Args:
+            uuid (str): UUID of the Capella element.
+            indent (str): Indentation string (default: 4 spaces).
     
-            # Render the template
-            template = Template(oc_template)
-
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-
-        elif obj.__class__.__name__ ==  "Capability" : 
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "includes_capabilities" :[{"name": t_obj.target.name, "uuid": t_obj.target.uuid} for t_obj in obj.includes],
-                "extended_capabilities" :[{"name": t_obj.target.name, "uuid": t_obj.target.uuid} for t_obj in obj.extends],
-                "involved_functions" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_functions],
-                "involved_components" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_components],
-                "involved_chains" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_chains],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
+        Returns:
+            str: YAML-formatted metadata string with consistent indentation.
+        """
+        if not self.parser:
+            return ""
     
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
+        item = self.parser.get_by_id(uuid)
+        if not item:
+            return ""
     
-            # Render the template
-            template = Template(cap_template)
-
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-                        
-        elif  obj.__class__.__name__ == "CapabilityRealization" : 
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "involved_functions" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_functions],
-                "involved_components" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_components],
-                "involved_chains" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_chains],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
+        lines = []
+        if item.get("itemId"):
+            lines.append(f"{indent}teamcenter item id: {item['itemId']}")
+        if item.get("revisionId"):
+            lines.append(f"{indent}teamcenter revision id: {item['revisionId']}")
+        if item.get("url"):
+            lines.append(f"{indent}teamcenter url: {item['url']}")
     
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
+        return "\n".join(lines)
+
     
-            # Render the template
-            template = Template(cap_template)
+    def get_yaml_content(self):
+        """Returen the Yaml content created."""
+        content = ""
+        if self._streamed_file:
+            # Streaming mode: what was generated so far lives in the output file.
+            self._writer.flush()
+            with open(self._streamed_file, "r") as f:
+                content = f.read()[len(_OUTPUT_FILE_HEADER):]
+        content += self._writer.getvalue()
+        return content[:-1] if content.endswith("\n") else content
+
+    def open_output_file(self, file_name="capella_model.yaml"):
+        """
+        Stream the YAML to a file instead of collecting it in memory.
+
+        Everything collected in memory so far is written first, and each object
+        generated afterwards goes straight to it, so only one object's YAML is
+        held in memory at a time. Call write_output_file() to finish the file.
+        """
+        if self._output_file is not None:
+            self.write_output_file()
+        self.file_name = file_name
+        self._streamed_file = file_name
+        self._output_file = open(file_name, "w")
+        self._output_file.write(_OUTPUT_FILE_HEADER)
+        self._writer.set_stream(self._output_file)
+
+    def write_output_file(self, file_name="capella_model.yaml"):
+        """
+        Generate a file capella_model.yaml (or the given file name).
+
+        When streaming with open_output_file(), the file already holds the
+        content and is only flushed and closed. An incremental cache set with
+        set_incremental_cache() is saved as well, and pending image writes
+        are waited for.
+        """
+        self.image_store.flush()
+        self.save_incremental_cache()
+        if self._output_file is not None:
+            self._writer.finish()
+            self._output_file.close()
+            self._output_file = None
+            self._writer.stream = None
+            return
+        self.file_name = file_name
+        with open(self.file_name, 'w') as f:
+            f.write(_OUTPUT_FILE_HEADER)
+            f.write(self._writer.getvalue() + "\n")
+
+    def display(self):
+        """Display the content of the yaml_content."""
+        print(self.yaml_content)
 
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-                        
+    def get_entire_model(self, model):
+     
+        def add_unique_object(obj_list, new_obj):
+            """
+            Adds a new object to the set if not already present.
+            """
               
-# Build the data for the YAML generation
-        
-        elif obj.__class__.__name__ ==  "Interaction" :
-          
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "source_activity": obj.source.owner.name,
-                "source_activity_uuid": obj.source.owner.uuid,
-                "target_activity": obj.target.owner.name, 
-                "target_activity_uuid": obj.target.owner.uuid ,
-                "involving_ops" :[{"name": op.name, "uuid": op.uuid} for op in obj.involving_operational_processes ],
-                "exchange_items": [{"name": ei.name, "uuid": ei.uuid} for ei in obj.exchange_items],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(interaction_template)
+            obj_list.add(new_obj)
 
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data) 
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
         
-        elif obj.__class__.__name__ ==  "FunctionalExchange" : 
-            #print(obj)
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "source_function": obj.source.name,
-                "source_function_uuid": obj.source.uuid,
-                "target_function": obj.target.name , 
-                "target_function_uuid": obj.target.uuid ,
-                "involving_fcs" :[{"name": fc.name, "uuid": fc.uuid} for fc in obj.involving_functional_chains ],
-                "exchange_items": [{"name": ei.name, "uuid": ei.uuid} for ei in obj.exchange_items],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
-                "realizing_func_exchs": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realizing_functional_exchanges] if self.realizing_refs else [],
-                "realized_func_exchs": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_functional_exchanges] if self.realized_refs else []
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(function_exchange_template)
-
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
+        object_data = UUIDOrderedSet()
+        #OA  
+        phase = "Operational Analysis OA"
+        for component in model.oa.all_entities:  
+            add_unique_object(object_data,component)
+        for obj in model.oa.all_activities:  
         
-        elif obj.__class__.__name__ ==  "ComponentExchange" : 
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "source_component": obj.source.owner.name,
-                "source_component_uuid": obj.source.owner.uuid,
-                "target_component": obj.target.owner.name, 
-                "target_component_uuid": obj.target.owner.uuid ,
-                "exchange_items": [{"name": ei.name, "uuid": ei.uuid} for ei in obj.exchange_items],
-                "allocated_functional_exchanges": [{"name": fe.name, "uuid": fe.uuid} for fe in obj.allocated_functional_exchanges],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
-                "realizing_comp_exchs": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realizing_component_exchanges] if self.realizing_refs else [],
-                "realized_comp_exchs": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_component_exchanges] if self.realized_refs else []
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(component_exchange_template)
-
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-        elif obj.__class__.__name__ ==  "CommunicationMean" : 
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "source_entity": obj.source.name,
-                "source_entity_uuid": obj.source.uuid,
-                "target_entity": obj.target.name, 
-                "target_entity_uuid": obj.target.uuid ,
-                "allocated_exchange_items": [{"name": ei.name, "uuid": ei.uuid} for ei in obj.allocated_exchange_items],
-                "allocated_interactions": [{"name": fe.name, "uuid": fe.uuid} for fe in obj.allocated_interactions],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(communication_mean_template)
-
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-        elif obj.__class__.__name__ ==  "PhysicalLink" : 
-            #print(obj)
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "source_component": obj.source.owner.name,
-                "source_component_uuid": obj.source.owner.uuid,
-                "target_component": obj.target.owner.name, 
-                "target_component_uuid": obj.target.owner.uuid ,
-                "allocated_component_exchanges": [{"name": ce.name, "uuid": ce.uuid} for ce in obj.exchanges],
-                "physical_paths": [{"name": pp.name, "uuid": pp.uuid} for pp in obj.physical_paths],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(physical_link_template)
-
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-
-        elif obj.__class__.__name__ ==  "PhysicalPath" : 
-            #print(obj)
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "involved_items": [{"name": inv.name , "uuid": inv.uuid} for inv in obj.involved_items],
-                "allocated_component_exchanges": [{"name": ce.name, "uuid": ce.uuid} for ce in obj.exchanges],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(physicalpath_template)
-
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-
-             
-        elif obj.__class__.__name__  ==  "PhysicalComponent" and obj.nature  ==  "NODE":  
-                data = {
-                    "type" : obj.__class__.__name__,
-                    "parent_uuid": obj.parent.uuid if obj.parent else None,
-                    "name": obj.name,
-                    "uuid" : obj.uuid,
-                    "is_human":obj.is_human,
-                    "description" :obj.description,
-                    "components" : [{"name": c.name , "uuid": c.uuid} for c in obj.components],
-                    "deployed_components": [
-                        {"name": getattr(dc, "name", None), "uuid": getattr(dc, "uuid", None)}
-                        for dc in getattr(obj, "deployed_components", [])  # Ensure it's iterable
-                        if hasattr(dc, "name") and hasattr(dc, "uuid")  # Avoid AttributeError
-                    ],
-                    "physical_ports": [{
-                        "name": p.name,
-                        "uuid": p.uuid,
-                        "description": p.description,
-                        "links": [{"name": link.name, "uuid": link.uuid, "description": link.description,"source_component": link.source.owner.name, "source_component_uuid": link.source.owner.uuid, "target_component": link.target.owner.name, "target_component_uuid": link.target.owner.uuid} for link in p.links]
-                             } for p in obj.physical_ports],
-                     "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                     "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                     "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
-                     "realized_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_components] if self.realized_refs else []
-
-                }
-                # Add referenced objects for expansion
-                self._track_referenced_objects(obj)
+            add_unique_object(object_data, obj)
+        for obj in model.oa.all_capabilities:  
         
-                # Render the template
-                template = Template(node_component_template)
-                data["description"] = sanitize_description_images(data["description"], img_dir)
-                self.yaml_content = self.yaml_content + template.render(data)
-                self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-                
-               
-        elif obj.__class__.__name__  ==  "PhysicalComponent" and obj.nature  ==  "BEHAVIOR":  
-                data = {
-                "type" : obj.__class__.__name__,
-                "parent_uuid": obj.parent.uuid if obj.parent else None,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "is_human":obj.is_human,
-                "description" :obj.description,
-                "components" : [{"name": c.name , "uuid": c.uuid} for c in obj.components],
-                "allocated_functions": [{"name": f.name , "uuid": f.uuid} for f in obj.allocated_functions],
-                "ports": [{
-                    "name": p.name,
-                    "uuid": p.uuid,
-                    "description": p.description,
-                    "exchanges": [{"name": e.name, "uuid": e.uuid, "description": e.description,"source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid} for e in getattr(p, 'exchanges', [])]
-                         } for p in obj.ports],
-                 "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                 "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                 "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
-                 "realized_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_components] if self.realized_refs else []
-                }
+            add_unique_object(object_data, obj)
+        for obj in model.oa.all_entity_exchanges:  
         
-                # Add referenced objects for expansion
-                self._track_referenced_objects(obj)
+            add_unique_object(object_data, obj)
+        for obj in model.oa.all_processes:  
         
-                # Render the template
-                template = Template(logical_component_template)
-                data["description"] = sanitize_description_images(data["description"], img_dir)
-                self.yaml_content = self.yaml_content + template.render(data)
-                self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-                
-              
-        elif obj.__class__.__name__  ==  "FunctionInputPort" or obj.__class__.__name__  ==  "FunctionOutputPort"  or obj.__class__.__name__  ==  "PhysicalPort" or obj.__class__.__name__  ==  "ComponentPort": 
-
-                data = {
-                "type" : obj.__class__.__name__,
-                "owner_name": obj.owner.name if obj.parent else None,                
-                "owner_uuid": obj.owner.uuid if obj.parent else None,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-                }
+            add_unique_object(object_data, obj)
+        #SA
+        phase = "System Analysis SA"
+        for component in model.sa.all_components: 
         
-                # Add referenced objects for expansion
-                self._track_referenced_objects(obj)
+            add_unique_object(object_data, component)
+        for obj in model.sa.all_capabilities:  
         
-                # Render the template
-                template = Template(port_template)
-                data["description"] = sanitize_description_images(data["description"], img_dir)
-                self.yaml_content = self.yaml_content + template.render(data)
-                self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-
-                
-        elif obj.__class__.__name__ ==  "StringPropertyValue"  or obj.__class__.__name__ ==  "FloatPropertyValue" or obj.__class__.__name__ ==  "IntegerPropertyValue":    
-            data = {
-                "type" : obj.__class__.__name__,
-                "parent_uuid": obj.parent.uuid if obj.parent else None,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "value" : obj.value,
-                "description" :obj.description,
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid ,"value": pv.value } for apv in obj.applied_property_values],
-                "property_values": [{"name": pv.name, "uuid": pv.uuid , "value": pv.value} for pv in obj.property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(property_value_template)
-            #print(template)
-            #print(data)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content +  template.render(data)
-            
-          
-            
-
-        elif obj.__class__.__name__ ==  "PropertyValueGroup" :    
-            data = {
-                "type" : obj.__class__.__name__,
-                "parent_uuid": obj.parent.uuid if obj.parent else None,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
-                "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
-               
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(property_value_group_template)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-            
-        elif obj.__class__.__name__ ==  "StateMachine" :   
-            data = {
-                "type" : obj.__class__.__name__,
-                "parent_uuid": obj.parent.uuid if obj.parent else None,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "regions": [{
-                    "name": region.name,
-                    "uuid": region.uuid,
-                    "description": region.description,
-                    "states": [{"name": s.name, "uuid": s.uuid, "description": s.description} 
-                        for s in getattr(region, 'states', [])],      
-                    "transitions": [{"name": t.name, "uuid": t.uuid, "description": t.description} 
-                               for t in getattr(region, 'transitions', [])],
-                
-                    } for region in obj.regions],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
-                "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(state_machine_template)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-
-        elif obj.__class__.__name__ ==  "State" :  
-            data = {
-                "type" : obj.__class__.__name__,
-                "parent_uuid": obj.parent.uuid if obj.parent else None,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "outgoing_transitions": [{"name": og.name, "uuid": og.uuid} for og in obj.outgoing_transitions],
-                "incoming_transitions": [{"name": inc.name, "uuid": inc.uuid} for inc in obj.incoming_transitions],
-                "do_activity": [{"name": da.name, "uuid": da.uuid} for da in obj.do_activity],
-                "exits": [{"name": ex.name, "uuid": ex.uuid} for ex in obj.exits],
-                "entries": [{"name": en.name, "uuid": en.uuid} for en in obj.entries],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
-                "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid,"value": cons.value} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(state_template)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)           
-        elif obj.__class__.__name__ ==  "InitialPseudoState" :    
-            data = {
-                "type" : obj.__class__.__name__,
-                "parent_uuid": obj.parent.uuid if obj.parent else None,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "outgoing_transitions": [{"name": og.name, "uuid": og.uuid} for og in obj.outgoing_transitions],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
-                "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid,"value": cons.value} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(psusdo_state_template)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)           
-
+            add_unique_object(object_data, obj )
+        for obj in model.sa.all_function_exchanges:  
         
-        elif obj.__class__.__name__ ==  "StateTransition" :    
-            data = {
-                "type" : obj.__class__.__name__,
-                "parent_uuid": obj.parent.uuid if obj.parent else None,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "source" :obj.source,
-                "triggers": [{"name": t.name, "uuid": t.uuid} for t in obj.triggers],
-                "effects": [{"name": ef.name, "uuid": ef.uuid} for ef in obj.effects],
-                "source_name":  obj.source.name,
-                "source_uuid":  obj.source.uuid,
-                "dest_name":  obj.destination.name,
-                "dest_uuid":  obj.destination.uuid,
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
-                "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(transition_template)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)           
-                      
-        elif obj.__class__.__name__ ==  "ExchangeItem" :   
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "elements": [{"name": e.name, "uuid": e.uuid} for e in obj.elements],
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
-                "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(exchangeitem_template)
-            data["description"] = sanitize_description_images(data["description"], img_dir)    
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-
-        elif obj.__class__.__name__ ==  "ExchangeItemElement" :   
-            
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid" : obj.uuid,
-                "description" :obj.description,
-                "abstract_type_name" : obj.abstract_type.name if obj.abstract_type else None,
-                "abstract_type_uuid" : obj.abstract_type.uuid if obj.abstract_type else None,
-                "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
-                "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
-                "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
-                "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
-                "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
-            }
-    
-            # Add referenced objects for expansion
-            self._track_referenced_objects(obj)
-    
-            # Render the template
-            template = Template(exchangeitemelement_template)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)     
-   
-        elif obj.__class__.__name__ ==  "Traceability_Artifact" :   
-            #print("This is a Pub4C Artifact",obj)   
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "uuid":obj.uuid,
-                "url" :obj.url,
-                "identifier" :obj.identifier,
-                "artifact_links": [{  "name": link.link_type.name, "model_element_uuid": link.model_element_uuid} for link in obj.artifact_links],
-            }
-            # Render the template
-            template = Template( Traceability_artifact)
-            self.yaml_content = self.yaml_content + template.render(data)
-            
-
-        elif obj.__class__.__name__ ==  "Diagram" :   
-
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "description" :obj.description,
-                "uuid":obj.uuid,
-                "nodes":obj.nodes              
-            }
-            # Render the template
-            self._track_referenced_objects(obj)
-            template = Template(diagram)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)     
-
-        elif obj.__class__.__name__ ==  "Part" : 
-            #print("printing Part:",obj)
-            #print("printing Part type:",obj.type)
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "description" :obj.description,
-                "uuid":obj.uuid,
-                "type_name":obj.type.name,
-                "type_uuid":obj.type.uuid
-
-                
-            }
-            # Render the template
-            self._track_referenced_objects(obj)
-            template = Template(part)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)                     
-
-        elif obj.__class__.__name__ ==  "Requirement" : 
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,
-                "long_name": obj.long_name,
-                "prefix": obj.prefix,
-                "chapter_name" : obj.chapter_name,    
-                "text" : obj.text,
-                "uuid": obj.uuid,
-                "type_name": obj.type.long_name if obj.type else "None",
-                "type_uuid": obj.type.uuid if obj.type else "None",
-                "relations": [{"name": r.name , "uuid": r.uuid} for r in obj.relations]            
-            }
-            # Render the template
-            self._track_referenced_objects(obj)
-            template = Template(Requirement_template)
-            data["text"] = sanitize_description_images(data["text"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-            self.yaml_content += "\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n"
-            
-            
-        elif obj.__class__.__name__ ==  "CapellaOutgoingRelation" : 
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": obj.name,  
-                "long_name": obj.long_name,   
-                "description" :obj.description,
-                "uuid":obj.uuid,
-                "source_name":  obj.source.long_name,
-                "source_uuid":  obj.source.uuid,
-                "target_name":  obj.target.name,
-                "target_uuid":  obj.target.uuid,
-                "type_name": obj.type.long_name if obj.type else "None",
-                "type_uuid": obj.type.uuid if obj.type else "None",
-            }
-            # Render the template
-            self._track_referenced_objects(obj)
-            template = Template(CapellaOutgoingRelation_template)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data) 
-
-        else :
-            #print(obj.name, "is be formatted with default properties, its type", obj.__class__.__name__," is not supported with tailored processing.")
-           # print(obj)
-            data = {
-                "type" : obj.__class__.__name__,
-                "name": getattr(obj, "name", None), # Safe access to name
-                "uuid":  getattr(obj, "uuid", None),  # Safe access to uuid
-                "description" : getattr(obj, "description", None),  # Safe access to description
-                "applied_property_value_groups": [
-                    {"name": getattr(apvg, "name", None), "uuid": getattr(apvg, "uuid", None)}
-                    for apvg in getattr(obj, "applied_property_value_groups", [])
-                ],
-                "applied_property_values": [
-                    {"name": getattr(apv, "name", None), "uuid": getattr(apv, "uuid", None)}
-                    for apv in getattr(obj, "applied_property_values", [])
-                ],
-                "constraints": [
-                    {"name": getattr(cons, "name", None), "uuid": getattr(cons, "uuid", None)}
-                    for cons in getattr(obj, "constraints", [])
-                ]
-            }
-            # Render the template
-            template = Template(default_template)
-            data["description"] = sanitize_description_images(data["description"], img_dir)
-            self.yaml_content = self.yaml_content + template.render(data)
-
+            add_unique_object(object_data,obj )
+        for obj in model.sa.all_functions:  
         
-    
+            add_unique_object(object_data,obj )
+        for obj in model.sa.all_missions:  
+        
+            add_unique_object(object_data,obj )
+        for obj in model.sa.all_functional_chains:  
+        
+            add_unique_object(object_data,obj )
+        #LA
+        phase = "Logical Architecture LA"
+        for obj in model.la.all_capabilities:  
+        
+            add_unique_object(object_data, obj)
+        for component in model.la.all_components:  
+        
+            add_unique_object(object_data, obj )
+        for obj in model.la.all_functions:  
+        
+            add_unique_object(object_data, obj )
+        for obj in model.la.all_functional_chains:  
+        
+            add_unique_object(object_data, obj )
+        for obj in model.la.all_interfaces:  
+        
+            add_unique_object(object_data, obj )
+        for obj in model.la.component_exchanges:  
+        
+            add_unique_object(object_data, obj )
+        for obj in model.la.actor_exchanges:  
+        
+            add_unique_object(object_data, obj )
+        #PA
+        phase = "Physical Architecture PA"
+        for component in model.pa.all_components:  
+        
+            add_unique_object(object_data,component )
+        for obj in model.pa.all_functions:  
+        
+            add_unique_object(object_data,obj)
+        for obj in model.pa.all_functional_chains:  
+            add_unique_object(object_data,obj)
+        for obj in model.pa.all_capabilities:  
+            add_unique_object(object_data,obj)
+        for obj in model.pa.all_component_exchanges:  
+            add_unique_object(object_data,obj)
+        for obj in model.pa.all_physical_exchanges:  
+            add_unique_object(object_data,obj)
+        for obj in model.pa.all_physical_links:  
+            add_unique_object(object_data,obj)
+        for obj in model.pa.all_physical_paths:  
+            add_unique_object(object_data,obj)
+        for obj in model.pa.all_physical_exchanges:  
+            add_unique_object(object_data,obj)
+        num_elements = len(object_data)
 
+        print("Number of model objects:", num_elements)
+        return list(object_data)
+         
+    def generate_yaml_referenced_objects(self):
+        """generate YAML content of referenced objects."""
+        for ref_obj in self.referenced_objects:
+            if ref_obj not in self.primary_objects :
+                self.generate_yaml(ref_obj) 
 
+    def generate_traceability_related_objects(self, model, Tstore):
+        """generate YAML content of referenced objects."""
+        #for ref_obj in self.referenced_objects:
+        #            self.generate_yaml(ref_obj)  
+        artifacts = Tstore.all_artifacts
+        for artifact in artifacts:      
+            for link in artifact.artifact_links :
+                 #print(link.link_type, link.artifact_uuid,link.model_element_uuid)
+                 model_element = model.by_uuid(link.model_element_uuid)
+                 #print("Linked Model Element",model_element.name)
+                 if model_element in self.referenced_objects or  model_element in self.primary_objects :
+                    #print("Adding Artifact",artifact.name,artifact.uuid)
+                    self.referenced_objects.add(artifact)
+      
+    def _track_referenced_objects(self, obj):
+        """Track referenced objects to allow further expansion as primary objects."""
+        walker = get_handler(obj).walker
+        if walker:
+            getattr(self, walker)(obj)
+
+    def _track_component(self, obj):
+        """Track the references of a LogicalComponent or SystemComponent."""
+        for comp in obj.components:
+            self.referenced_objects.add(comp)
+        for port in obj.ports:
+            self.referenced_objects.add(port)
+            for e in port.exchanges:
+                self.referenced_objects.add(e)
+        for func in obj.allocated_functions:
+            self.referenced_objects.add(func)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+            for pv in apvg.property_values:
+                self.referenced_objects.add(pv)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for sm in obj.state_machines:
+            self.referenced_objects.add(sm)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+        if self.realizing_refs:
+            for rr in obj.realizing_components:
+                self.referenced_objects.add(rr)
+        if self.realized_refs:
+            for rr in obj.realized_components:
+                self.referenced_objects.add(rr)
+
+    def _track_entity(self, obj):
+        """Track the references of an Entity."""
+        for ent in obj.entities:
+            self.referenced_objects.add(ent)
+        for act in obj.activities:
+            self.referenced_objects.add(act)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+            for pv in apvg.property_values:
+                self.referenced_objects.add(pv)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for sm in obj.state_machines:
+            self.referenced_objects.add(sm)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+        if self.realizing_refs:
+            for rr in obj.realizing_components:
+                self.referenced_objects.add(rr)
+        if self.realized_refs:
+            for rr in obj.realized_components:
+                self.referenced_objects.add(rr)
+
+    def _track_node_component(self, obj):
+        """Track the references of a PhysicalComponent of nature NODE."""
+        for dc in getattr(obj, "deployed_components", []):  # Ensure it's iterable
+            if hasattr(dc, "name") and hasattr(dc, "uuid"):  # Avoid AttributeError
+                self.referenced_objects.add(dc)
+        for comp in obj.components:
+            self.referenced_objects.add(comp)
+        for physical_port in obj.physical_ports:
+            self.referenced_objects.add(physical_port)
+            for link in physical_port.links:
+                self.referenced_objects.add(link)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+        if self.realized_refs:
+            for rr in obj.realized_components:
+                self.referenced_objects.add(rr)
+
+    def _track_behavior_component(self, obj):
+        """Track the references of a PhysicalComponent of nature BEHAVIOR."""
+        for dc in obj.deployed_components:
+                self.referenced_objects.add(dc)
+        for comp in obj.components:
+            self.referenced_objects.add(comp)
+        for port in obj.ports:
+            self.referenced_objects.add(port)
+            for e in port.exchanges:
+                self.referenced_objects.add(e)
+        for func in obj.allocated_functions:
+            self.referenced_objects.add(func)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+        if self.realized_refs:
+            for rr in obj.realized_components:
+                self.referenced_objects.add(rr)
+
+    def _track_requirement(self, obj):
+        """Track the references of a Requirement."""
+        for rel in obj.relations:
+                self.referenced_objects.add(rel)
+
+    def _track_function(self, obj):
+        """Track the references of a LogicalFunction, SystemFunction or PhysicalFunction."""
+        self.referenced_objects.add(obj.owner)
+        for port in obj.inputs:
+            self.referenced_objects.add(port)
+            for e in port.exchanges:
+                self.referenced_objects.add(e)
+        for port in obj.outputs:
+            self.referenced_objects.add(port)
+            for e in port.exchanges:
+                self.referenced_objects.add(e)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+        if self.realizing_refs:
+            for rr in obj.realizing_functions:
+                self.referenced_objects.add(rr)
+        if self.realized_refs:
+            for rr in obj.realized_functions:
+                self.referenced_objects.add(rr)
+
+    def _track_operational_activity(self, obj):
+        """Track the references of an OperationalActivity."""
+        self.referenced_objects.add(obj.owner)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for ain in obj.inputs:
+            self.referenced_objects.add(ain)
+        for out in obj.outputs:
+            self.referenced_objects.add(out)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+        if self.realizing_refs:
+            for rr in obj.realizing_system_functions:
+                self.referenced_objects.add(rr)
+
+    def _track_operational_capability(self, obj):
+        """Track the references of an OperationalCapability."""
+        for this_obj in obj.includes:
+            self.referenced_objects.add(this_obj.target)
+        for this_obj in obj.extends:
+            self.referenced_objects.add(this_obj.target)
+        for this_obj in obj.involved_entities:
+            self.referenced_objects.add(this_obj)
+        for this_obj in obj.involved_activities:
+            self.referenced_objects.add(this_obj)
+        for this_obj in obj.involved_processes:
+            self.referenced_objects.add(this_obj)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+        if self.realizing_refs:
+            for rr in obj.realizing_capabilities:
+                self.referenced_objects.add(rr)
+
+    def _track_capability(self, obj):
+        """Track the references of a Capability."""
+        for this_obj in obj.includes:
+            self.referenced_objects.add(this_obj.target)
+        for this_obj in obj.extends:
+            self.referenced_objects.add(this_obj.target)
+        for this_obj in obj.involved_components:
+            self.referenced_objects.add(this_obj)
+        for this_obj in obj.involved_functions:
+            self.referenced_objects.add(this_obj)
+        for this_obj in obj.involved_chains:
+            self.referenced_objects.add(this_obj)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_capability_realization(self, obj):
+        """Track the references of a CapabilityRealization."""
+
+        for this_obj in obj.involved_components:
+            self.referenced_objects.add(this_obj)
+        for this_obj in obj.involved_functions:
+            self.referenced_objects.add(this_obj)
+        for this_obj in obj.involved_chains:
+            self.referenced_objects.add(this_obj)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_operational_process(self, obj):
+        """Track the references of an OperationalProcess."""
+        for inv in obj.involved:
+            self.referenced_objects.add(inv)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+        if self.realizing_refs:
+            for rr in obj.realizing_chains:
+                self.referenced_objects.add(rr)
+        if self.realized_refs:
+            for rr in obj.realized_chains:
+                self.referenced_objects.add(rr)
+
+    def _track_functional_chain(self, obj):
+        """Track the references of a FunctionalChain."""
+        for inv in obj.involved:
+            self.referenced_objects.add(inv)
+        for inv in obj.involved_chains:
+            self.referenced_objects.add(inv)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+        if self.realizing_refs:
+            for rr in obj.realizing_chains:
+                self.referenced_objects.add(rr)
+        if self.realized_refs:
+            for rr in obj.realized_chains:
+                self.referenced_objects.add(rr)
+
+    def _track_state_transition(self, obj):
+        """Track the references of a StateTransition."""
+        for eff in obj.effects:
+            self.referenced_objects.add(eff)
+        for t in obj.triggers:
+            self.referenced_objects.add(t)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_state(self, obj):
+        """Track the references of a State."""
+        for og in obj.outgoing_transitions:
+            self.referenced_objects.add(og)
+        for inc in obj.incoming_transitions:
+            self.referenced_objects.add(inc)
+        for da in obj.do_activity:
+            self.referenced_objects.add(da)
+        for en in obj.entries:
+            self.referenced_objects.add(en)
+        for ex in obj.exits:
+            self.referenced_objects.add(ex)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_initial_pseudo_state(self, obj):
+        """Track the references of an InitialPseudoState."""
+        for og in obj.outgoing_transitions:
+            self.referenced_objects.add(og)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_state_machine(self, obj):
+        """Track the references of a StateMachine."""
+        for region in obj.regions:
+            for state in region.states:
+                self.referenced_objects.add(state)
+            for transition in region.transitions:
+                self.referenced_objects.add(transition)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_property_value_group(self, obj):
+        """Track the references of a PropertyValueGroup."""
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for pvg in obj.property_value_groups:
+            self.referenced_objects.add(pvg)
+        for pv in obj.property_values:
+            self.referenced_objects.add(pv)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_functional_exchange(self, obj):
+        """Track the references of a FunctionalExchange."""
+        for ei in obj.exchange_items:
+            self.referenced_objects.add(ei)
+        #for fc in obj.involving_functional_chains:
+        #    if fc not in self.referenced_objects:
+        #        self.referenced_objects.append(fc)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for pvg in obj.property_value_groups:
+            self.referenced_objects.add(pvg)
+        for pv in obj.property_values:
+            self.referenced_objects.add(pv)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+        if self.realizing_refs:
+            for rr in obj.realizing_functional_exchanges:
+                self.referenced_objects.add(rr)
+        if self.realized_refs:
+            for rr in obj.realized_functional_exchanges:
+                self.referenced_objects.add(rr)
+
+    def _track_interaction(self, obj):
+        """Track the references of an Interaction."""
+        for ei in obj.exchange_items:
+            self.referenced_objects.add(ei)
+        #for op in obj.involving_operational_processes:
+        #    if op not in self.referenced_objects:
+        #        self.referenced_objects.append(op)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for pvg in obj.property_value_groups:
+            self.referenced_objects.add(pvg)
+        for pv in obj.property_values:
+            self.referenced_objects.add(pv)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_physical_link(self, obj):
+        """Track the references of a PhysicalLink."""
+        #print(obj)
+        for ex in obj.exchanges:
+            self.referenced_objects.add(ex)
+         # Only attempt to access `physical_paths` if the object has that attribute
+        if hasattr(obj, "physical_paths"):
+            for ppath in obj.physical_paths:
+                self.referenced_objects.add(ppath)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for pvg in obj.property_value_groups:
+            self.referenced_objects.add(pvg)
+        for pv in obj.property_values:
+            self.referenced_objects.add(pv)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_physical_path(self, obj):
+        """Track the references of a PhysicalPath."""
+        for inv in obj.involved_items:
+            self.referenced_objects.add(inv)
+        for ex in obj.exchanges:
+            self.referenced_objects.add(ex)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for pvg in obj.property_value_groups:
+            self.referenced_objects.add(pvg)
+        for pv in obj.property_values:
+            self.referenced_objects.add(pv)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_component_exchange(self, obj):
+        """Track the references of a ComponentExchange."""
+        for ei in obj.exchange_items:
+            self.referenced_objects.add(ei)
+        for afe in obj.allocated_functional_exchanges:
+            self.referenced_objects.add(afe)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for pvg in obj.property_value_groups:
+            self.referenced_objects.add(pvg)
+        for pv in obj.property_values:
+            self.referenced_objects.add(pv)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+        if self.realizing_refs:
+            for rr in obj.realizing_component_exchanges:
+                self.referenced_objects.add(rr)
+        if self.realized_refs:
+            for rr in obj.realized_component_exchanges:
+                self.referenced_objects.add(rr)
+
+    def _track_exchange_item(self, obj):
+        """Track the references of an ExchangeItem."""
+        for e in obj.elements:
+            self.referenced_objects.add(e)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for pvg in obj.property_value_groups:
+            self.referenced_objects.add(pvg)
+        for pv in obj.property_values:
+            self.referenced_objects.add(pv)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_exchange_item_element(self, obj):
+        """Track the references of an ExchangeItemElement."""
+        self.referenced_objects.add(obj.abstract_type)
+        for apvg in obj.applied_property_value_groups:
+            self.referenced_objects.add(apvg)
+        for apv in obj.applied_property_values:
+            self.referenced_objects.add(apv)
+        for con in obj.constraints:
+            self.referenced_objects.add(con)
+        for pvg in obj.property_value_groups:
+            self.referenced_objects.add(pvg)
+        for pv in obj.property_values:
+            self.referenced_objects.add(pv)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def _track_diagram(self, obj):
+        """Track the references of a Diagram."""
+        for node in obj.nodes:
+            self.referenced_objects.add(node)
+
+    def _track_part(self, obj):
+        """Track the references of a Part."""
+        self.referenced_objects.add(obj.type)
+
+    def _track_port(self, obj):
+        """Track the references of a FunctionInputPort, FunctionOutputPort, PhysicalPort or ComponentPort."""
+        self.referenced_objects.add(obj.owner)
+        for req in obj.requirements:
+            self.referenced_objects.add(req)
+
+    def generate_yaml(self, obj):
+        """Generate YAML for primary objects and manage references."""
+        cache = self._incremental
+        key = self._incremental_key(obj) if cache is not None else None
+        if key is None:
+            self._render_yaml(obj)
+            return
+
+        entry = cache.lookup(obj.uuid, key)
+        if entry is not None:
+            self.primary_objects.add(obj)
+            for uuid in entry["refs"]:
+                self.referenced_objects.add(obj._model.by_uuid(uuid) if uuid else None)
+            self._write(entry["yaml"])
+            cache.reused += 1
+            return
+
+        # Render into a raw writer and a fresh reference set to record what
+        # this object emits, then pass both on as if rendered directly.
+        writer, references = self._writer, self.referenced_objects
+        self._writer = YAMLChunkWriter(strip_blank_lines=False)
+        self.referenced_objects = UUIDOrderedSet()
+        rendered = False
+        try:
+            self._render_yaml(obj)
+            rendered = True
+        finally:
+            fragment = "".join(self._writer._chunks)
+            tracked = self.referenced_objects
+            self._writer, self.referenced_objects = writer, references
+            for ref in tracked:
+                references.add(ref)
+            self._write(fragment)
+        cache.rendered += 1
+        if rendered and all(ref is None or getattr(ref, "_element", None) is not None for ref in tracked):
+            cache.store(obj.uuid, key, fragment, [getattr(ref, "uuid", None) for ref in tracked])
+
+    def _render_yaml(self, obj):
+        """Render the YAML of one object and track its references."""
+        #print("Type:", obj.__class__.__name__)
+        self.primary_objects.add(obj)
+        renderer = get_handler(obj).renderer or "_render_default"
+        getattr(self, renderer)(obj)
+
+    def _render_component(self, obj):
+        """Render the YAML of a LogicalComponent or SystemComponent."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "parent_uuid": obj.parent.uuid if obj.parent else None,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "is_human":obj.is_human,
+            "description" :obj.description,
+            "components" : [{"name": c.name , "uuid": c.uuid} for c in obj.components],
+            "allocated_functions": [{"name": f.name , "uuid": f.uuid} for f in obj.allocated_functions],
+            "ports": [{
+                "name": p.name,
+                "uuid": p.uuid,
+                "description": p.description,
+                "exchanges": [{"name": e.name, "uuid": e.uuid, "description": e.description,"source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid} for e in getattr(p, 'exchanges', [])]
+                     } for p in obj.ports],
+             "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+             "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+             "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
+             "state_machines": [{"name": sm.name, "uuid": sm.uuid} for sm in obj.state_machines],
+             "realizing_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realizing_components] if self.realizing_refs else [],
+             "realized_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_components] if self.realized_refs else []
+
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_entity(self, obj):
+        """Render the YAML of an Entity."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "parent_uuid": obj.parent.uuid if obj.parent else None,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "is_human":obj.is_human,
+            "is_actor":obj.is_actor,
+            "description" :obj.description,
+            "entities": [{"name": ent.name , "uuid": ent.uuid} for ent in obj.entities],
+            "allocated_activities": [{"name": a.name , "uuid": a.uuid} for a in obj.activities],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
+            "state_machines": [{"name": sm.name, "uuid": sm.uuid} for sm in obj.state_machines],
+            "realizing_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realizing_components] if self.realizing_refs else [],
+            "realized_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_components] if self.realized_refs else []
+
+        }
+        #print(data)
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_operational_process(self, obj):
+        """Render the YAML of an OperationalProcess."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "involved": [{"name": inv.name , "uuid": inv.uuid, "type": inv.__class__.__name__ } for inv in obj.involved],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
+            "realizing_chains": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realizing_chains] if self.realizing_refs else [],
+            "realized_chains": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realized_chains] if self.realized_refs else []
+        }
+
+
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_functional_chain(self, obj):
+        """Render the YAML of a FunctionalChain."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "involved": [{"name": inv.name , "uuid": inv.uuid, "type": inv.__class__.__name__ } for inv in obj.involved],
+            "involved_chains": [{"name": inv.name , "uuid": inv.uuid, "type": inv.__class__.__name__ } for inv in obj.involved_chains],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
+            "realizing_chains": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realizing_chains] if self.realizing_refs else [],
+            "realized_chains": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realized_chains] if self.realized_refs else []
+        }
+
+
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_function(self, obj):
+        """Render the YAML of a SystemFunction, LogicalFunction or PhysicalFunction."""
+
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "owner_name" :obj.owner.name if obj.owner else None,
+            "owner_uuid" :obj.owner.uuid if obj.owner else None,
+            "child_functions" :[{"name": func.name, "uuid": func.uuid} for func in obj.functions],
+            "inputs": [{
+                "name": p.name,
+                "uuid": p.uuid,
+                "description": p.description,
+                "exchanges": [{"name": e.name, "uuid": e.uuid, "description":e.description, "source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid  } for e in getattr(p, 'exchanges', [])]
+                     } for p in obj.inputs],
+            "outputs": [{
+                "name": p.name,
+                "uuid": p.uuid,
+                "description": p.description,
+                "exchanges": [{"name": e.name, "uuid": e.uuid, "description":e.description, "source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid } for e in getattr(p, 'exchanges', [])]
+                     } for p in obj.outputs],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
+            "realizing_funcs": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realizing_functions] if self.realizing_refs else [],
+            "realized_funcs": [{"name": rf.name, "uuid": rf.uuid} for rf in obj.realized_functions] if self.realized_refs else []
+        }
+
+        # Add referenced objects for expansion  
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_operational_activity(self, obj):
+        """Render the YAML of an OperationalActivity."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "owner_name" :obj.owner.name if obj.owner else None,
+            "owner_uuid" :obj.owner.uuid if obj.owner else None,
+            "child activities" :[{"name": func.name, "uuid": func.uuid} for func in obj.activities],
+            "inputs": [{
+                "name": p.name,
+                "uuid": p.uuid,
+                "description": p.description,
+                "exchanges": [{"name": e.name, "uuid": e.uuid, "description":e.description, "source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid  } for e in getattr(p, 'exchanges', [])]
+                     } for p in obj.inputs],
+            "outputs": [{
+                "name": p.name,
+                "uuid": p.uuid,
+                "description": p.description,
+                "exchanges": [{"name": e.name, "uuid": e.uuid, "description":e.description, "source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid } for e in getattr(p, 'exchanges', [])]
+                     } for p in obj.outputs],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
+            "realizing_sys_funcs": [{"name": rr.name, "uuid": rr.uuid} for rr in obj.realizing_system_functions] if self.realizing_refs else []
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_operational_capability(self, obj):
+        """Render the YAML of an OperationalCapability."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "includes_capabilities" :[{"name": t_obj.target.name, "uuid": t_obj.target.uuid} for t_obj in obj.includes],
+            "extended_capabilities" :[{"name": t_obj.target.name, "uuid": t_obj.target.uuid} for t_obj in obj.extends],
+            "involved_activities" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_activities],
+            "involved_entities" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_entities],
+            "involved_operational_processes" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_processes],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
+            "realizing_caps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realizing_capabilities] if self.realizing_refs else []
+
+
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_capability(self, obj):
+        """Render the YAML of a Capability."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "includes_capabilities" :[{"name": t_obj.target.name, "uuid": t_obj.target.uuid} for t_obj in obj.includes],
+            "extended_capabilities" :[{"name": t_obj.target.name, "uuid": t_obj.target.uuid} for t_obj in obj.extends],
+            "involved_functions" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_functions],
+            "involved_components" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_components],
+            "involved_chains" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_chains],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_capability_realization(self, obj):
+        """Render the YAML of a CapabilityRealization."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "involved_functions" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_functions],
+            "involved_components" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_components],
+            "involved_chains" :[{"name": t_obj.name, "uuid": t_obj.uuid} for t_obj in obj.involved_chains],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_interaction(self, obj):
+        """Render the YAML of an Interaction."""
+
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "source_activity": obj.source.owner.name,
+            "source_activity_uuid": obj.source.owner.uuid,
+            "target_activity": obj.target.owner.name, 
+            "target_activity_uuid": obj.target.owner.uuid ,
+            "involving_ops" :[{"name": op.name, "uuid": op.uuid} for op in obj.involving_operational_processes ],
+            "exchange_items": [{"name": ei.name, "uuid": ei.uuid} for ei in obj.exchange_items],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_functional_exchange(self, obj):
+        """Render the YAML of a FunctionalExchange."""
+        #print(obj)
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "source_function": obj.source.name,
+            "source_function_uuid": obj.source.uuid,
+            "target_function": obj.target.name , 
+            "target_function_uuid": obj.target.uuid ,
+            "involving_fcs" :[{"name": fc.name, "uuid": fc.uuid} for fc in obj.involving_functional_chains ],
+            "exchange_items": [{"name": ei.name, "uuid": ei.uuid} for ei in obj.exchange_items],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
+            "realizing_func_exchs": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realizing_functional_exchanges] if self.realizing_refs else [],
+            "realized_func_exchs": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_functional_exchanges] if self.realized_refs else []
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_component_exchange(self, obj):
+        """Render the YAML of a ComponentExchange."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "source_component": obj.source.owner.name,
+            "source_component_uuid": obj.source.owner.uuid,
+            "target_component": obj.target.owner.name, 
+            "target_component_uuid": obj.target.owner.uuid ,
+            "exchange_items": [{"name": ei.name, "uuid": ei.uuid} for ei in obj.exchange_items],
+            "allocated_functional_exchanges": [{"name": fe.name, "uuid": fe.uuid} for fe in obj.allocated_functional_exchanges],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
+            "realizing_comp_exchs": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realizing_component_exchanges] if self.realizing_refs else [],
+            "realized_comp_exchs": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_component_exchanges] if self.realized_refs else []
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_communication_mean(self, obj):
+        """Render the YAML of a CommunicationMean."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "source_entity": obj.source.name,
+            "source_entity_uuid": obj.source.uuid,
+            "target_entity": obj.target.name, 
+            "target_entity_uuid": obj.target.uuid ,
+            "allocated_exchange_items": [{"name": ei.name, "uuid": ei.uuid} for ei in obj.allocated_exchange_items],
+            "allocated_interactions": [{"name": fe.name, "uuid": fe.uuid} for fe in obj.allocated_interactions],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_physical_link(self, obj):
+        """Render the YAML of a PhysicalLink."""
+        #print(obj)
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "source_component": obj.source.owner.name,
+            "source_component_uuid": obj.source.owner.uuid,
+            "target_component": obj.target.owner.name, 
+            "target_component_uuid": obj.target.owner.uuid ,
+            "allocated_component_exchanges": [{"name": ce.name, "uuid": ce.uuid} for ce in obj.exchanges],
+            "physical_paths": [{"name": pp.name, "uuid": pp.uuid} for pp in obj.physical_paths],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_physical_path(self, obj):
+        """Render the YAML of a PhysicalPath."""
+        #print(obj)
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "involved_items": [{"name": inv.name , "uuid": inv.uuid} for inv in obj.involved_items],
+            "allocated_component_exchanges": [{"name": ce.name, "uuid": ce.uuid} for ce in obj.exchanges],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_node_component(self, obj):
+        """Render the YAML of a PhysicalComponent of nature NODE."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "parent_uuid": obj.parent.uuid if obj.parent else None,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "is_human":obj.is_human,
+            "description" :obj.description,
+            "components" : [{"name": c.name , "uuid": c.uuid} for c in obj.components],
+            "deployed_components": [
+                {"name": getattr(dc, "name", None), "uuid": getattr(dc, "uuid", None)}
+                for dc in getattr(obj, "deployed_components", [])  # Ensure it's iterable
+                if hasattr(dc, "name") and hasattr(dc, "uuid")  # Avoid AttributeError
+            ],
+            "physical_ports": [{
+                "name": p.name,
+                "uuid": p.uuid,
+                "description": p.description,
+                "links": [{"name": link.name, "uuid": link.uuid, "description": link.description,"source_component": link.source.owner.name, "source_component_uuid": link.source.owner.uuid, "target_component": link.target.owner.name, "target_component_uuid": link.target.owner.uuid} for link in p.links]
+                     } for p in obj.physical_ports],
+             "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+             "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+             "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
+             "realized_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_components] if self.realized_refs else []
+
+        }
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template("PhysicalComponent:NODE")
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_behavior_component(self, obj):
+        """Render the YAML of a PhysicalComponent of nature BEHAVIOR."""
+        data = {
+        "type" : obj.__class__.__name__,
+        "parent_uuid": obj.parent.uuid if obj.parent else None,
+        "name": obj.name,
+        "uuid" : obj.uuid,
+        "is_human":obj.is_human,
+        "description" :obj.description,
+        "components" : [{"name": c.name , "uuid": c.uuid} for c in obj.components],
+        "allocated_functions": [{"name": f.name , "uuid": f.uuid} for f in obj.allocated_functions],
+        "ports": [{
+            "name": p.name,
+            "uuid": p.uuid,
+            "description": p.description,
+            "exchanges": [{"name": e.name, "uuid": e.uuid, "description": e.description,"source_component": e.source.owner.name, "source_component_uuid": e.source.owner.uuid, "target_component": e.target.owner.name, "target_component_uuid": e.target.owner.uuid} for e in getattr(p, 'exchanges', [])]
+                 } for p in obj.ports],
+         "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+         "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+         "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints],
+         "realized_comps": [{"name": rc.name, "uuid": rc.uuid} for rc in obj.realized_components] if self.realized_refs else []
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template("PhysicalComponent:BEHAVIOR")
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_port(self, obj):
+        """Render the YAML of a FunctionInputPort, FunctionOutputPort, PhysicalPort or ComponentPort."""
+
+        data = {
+        "type" : obj.__class__.__name__,
+        "owner_name": obj.owner.name if obj.parent else None,                
+        "owner_uuid": obj.owner.uuid if obj.parent else None,
+        "name": obj.name,
+        "uuid" : obj.uuid,
+        "description" :obj.description,
+        "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+        "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+        "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_property_value(self, obj):
+        """Render the YAML of a StringPropertyValue, FloatPropertyValue or IntegerPropertyValue."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "parent_uuid": obj.parent.uuid if obj.parent else None,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "value" : obj.value,
+            "description" :obj.description,
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid ,"value": pv.value } for apv in obj.applied_property_values],
+            "property_values": [{"name": pv.name, "uuid": pv.uuid , "value": pv.value} for pv in obj.property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        #print(template)
+        #print(data)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+
+    def _render_property_value_group(self, obj):
+        """Render the YAML of a PropertyValueGroup."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "parent_uuid": obj.parent.uuid if obj.parent else None,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
+            "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
+
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_state_machine(self, obj):
+        """Render the YAML of a StateMachine."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "parent_uuid": obj.parent.uuid if obj.parent else None,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "regions": [{
+                "name": region.name,
+                "uuid": region.uuid,
+                "description": region.description,
+                "states": [{"name": s.name, "uuid": s.uuid, "description": s.description} 
+                    for s in getattr(region, 'states', [])],      
+                "transitions": [{"name": t.name, "uuid": t.uuid, "description": t.description} 
+                           for t in getattr(region, 'transitions', [])],
+
+                } for region in obj.regions],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
+            "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+
+    def _render_state(self, obj):
+        """Render the YAML of a State."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "parent_uuid": obj.parent.uuid if obj.parent else None,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "outgoing_transitions": [{"name": og.name, "uuid": og.uuid} for og in obj.outgoing_transitions],
+            "incoming_transitions": [{"name": inc.name, "uuid": inc.uuid} for inc in obj.incoming_transitions],
+            "do_activity": [{"name": da.name, "uuid": da.uuid} for da in obj.do_activity],
+            "exits": [{"name": ex.name, "uuid": ex.uuid} for ex in obj.exits],
+            "entries": [{"name": en.name, "uuid": en.uuid} for en in obj.entries],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
+            "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid,"value": cons.value} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+
+    def _render_initial_pseudo_state(self, obj):
+        """Render the YAML of an InitialPseudoState."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "parent_uuid": obj.parent.uuid if obj.parent else None,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "outgoing_transitions": [{"name": og.name, "uuid": og.uuid} for og in obj.outgoing_transitions],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
+            "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid,"value": cons.value} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+
+    def _render_state_transition(self, obj):
+        """Render the YAML of a StateTransition."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "parent_uuid": obj.parent.uuid if obj.parent else None,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "source" :obj.source,
+            "triggers": [{"name": t.name, "uuid": t.uuid} for t in obj.triggers],
+            "effects": [{"name": ef.name, "uuid": ef.uuid} for ef in obj.effects],
+            "source_name":  obj.source.name,
+            "source_uuid":  obj.source.uuid,
+            "dest_name":  obj.destination.name,
+            "dest_uuid":  obj.destination.uuid,
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
+            "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+
+    def _render_exchange_item(self, obj):
+        """Render the YAML of an ExchangeItem."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "elements": [{"name": e.name, "uuid": e.uuid} for e in obj.elements],
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
+            "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])    
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_exchange_item_element(self, obj):
+        """Render the YAML of an ExchangeItemElement."""
+
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid" : obj.uuid,
+            "description" :obj.description,
+            "abstract_type_name" : obj.abstract_type.name if obj.abstract_type else None,
+            "abstract_type_uuid" : obj.abstract_type.uuid if obj.abstract_type else None,
+            "applied_property_value_groups": [{"name": apvg.name, "uuid": apvg.uuid} for apvg in obj.applied_property_value_groups],
+            "applied_property_values": [{"name": apv.name, "uuid": apv.uuid} for apv in obj.applied_property_values],
+            "property_value_groups": [{"name": pvg.name, "uuid": pvg.uuid} for pvg in obj.property_value_groups],
+            "property_values": [{"name": pv.name, "uuid": pv.uuid} for pv in obj.property_values],
+            "constraints": [{"name": cons.name, "uuid": cons.uuid} for cons in obj.constraints]
+        }
+
+        # Add referenced objects for expansion
+        self._track_referenced_objects(obj)
+
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+
+    def _render_traceability_artifact(self, obj):
+        """Render the YAML of a Traceability_Artifact."""
+        #print("This is a Pub4C Artifact",obj)   
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "uuid":obj.uuid,
+            "url" :obj.url,
+            "identifier" :obj.identifier,
+            "artifact_links": [{  "name": link.link_type.name, "model_element_uuid": link.model_element_uuid} for link in obj.artifact_links],
+        }
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__)
+        self._write(template.render(data))
+
+    def _render_diagram(self, obj):
+        """Render the YAML of a Diagram."""
+
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "description" :obj.description,
+            "uuid":obj.uuid,
+            "nodes":obj.nodes              
+        }
+        # Render the template
+        self._track_referenced_objects(obj)
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+
+    def _render_part(self, obj):
+        """Render the YAML of a Part."""
+        #print("printing Part:",obj)
+        #print("printing Part type:",obj.type)
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "description" :obj.description,
+            "uuid":obj.uuid,
+            "type_name":obj.type.name,
+            "type_uuid":obj.type.uuid
+
+
+        }
+        # Render the template
+        self._track_referenced_objects(obj)
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+
+    def _render_requirement(self, obj):
+        """Render the YAML of a Requirement."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,
+            "long_name": obj.long_name,
+            "prefix": obj.prefix,
+            "chapter_name" : obj.chapter_name,    
+            "text" : obj.text,
+            "uuid": obj.uuid,
+            "type_name": obj.type.long_name if obj.type else "None",
+            "type_uuid": obj.type.uuid if obj.type else "None",
+            "relations": [{"name": r.name , "uuid": r.uuid} for r in obj.relations]            
+        }
+        # Render the template
+        self._track_referenced_objects(obj)
+        template = get_yaml_template(obj.__class__.__name__)
+        data["text"] = self.image_store.sanitize_description_images(data["text"])
+        self._write(template.render(data))
+        self._write("\n" + self.generate_teamcenter_yaml_snippet(obj.uuid, indent="      ") + "\n")
+
+    def _render_capella_outgoing_relation(self, obj):
+        """Render the YAML of a CapellaOutgoingRelation."""
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": obj.name,  
+            "long_name": obj.long_name,   
+            "description" :obj.description,
+            "uuid":obj.uuid,
+            "source_name":  obj.source.long_name,
+            "source_uuid":  obj.source.uuid,
+            "target_name":  obj.target.name,
+            "target_uuid":  obj.target.uuid,
+            "type_name": obj.type.long_name if obj.type else "None",
+            "type_uuid": obj.type.uuid if obj.type else "None",
+        }
+        # Render the template
+        self._track_referenced_objects(obj)
+        template = get_yaml_template(obj.__class__.__name__)
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data))
+
+    def _render_default(self, obj):
+        """Render the YAML of an object of any other type."""
+        #print(obj.name, "is be formatted with default properties, its type", obj.__class__.__name__," is not supported with tailored processing.")
+        # print(obj)
+        data = {
+            "type" : obj.__class__.__name__,
+            "name": getattr(obj, "name", None), # Safe access to name
+            "uuid":  getattr(obj, "uuid", None),  # Safe access to uuid
+            "description" : getattr(obj, "description", None),  # Safe access to description
+            "applied_property_value_groups": [
+                {"name": getattr(apvg, "name", None), "uuid": getattr(apvg, "uuid", None)}
+                for apvg in getattr(obj, "applied_property_value_groups", [])
+            ],
+            "applied_property_values": [
+                {"name": getattr(apv, "name", None), "uuid": getattr(apv, "uuid", None)}
+                for apv in getattr(obj, "applied_property_values", [])
+            ],
+            "constraints": [
+                {"name": getattr(cons, "name", None), "uuid": getattr(cons, "uuid", None)}
+                for cons in getattr(obj, "constraints", [])
+            ]
+        }
+        # Render the template
+        template = get_yaml_template(obj.__class__.__name__) or get_yaml_template("_default")
+        data["description"] = self.image_store.sanitize_description_images(data["description"])
+        self._write(template.render(data, obj=obj))
+
+
+# State of an export_model worker process, set up once by _init_export_worker.
+_EXPORT_WORKER = {}
+
+
+def _init_export_worker(model_path, model_kwargs, parser, realizing_refs, realized_refs):
+    """Load the model once per worker process."""
+    _EXPORT_WORKER["model"] = capellambse.MelodyModel(model_path, **model_kwargs)
+    _EXPORT_WORKER["parser"] = parser
+    _EXPORT_WORKER["realizing_refs"] = realizing_refs
+    _EXPORT_WORKER["realized_refs"] = realized_refs
+
+
+def _render_export_chunk(uuids):
+    """Render the YAML of a chunk of objects in a worker process, blank lines included."""
+    model = _EXPORT_WORKER["model"]
+    handler = CapellaYAMLHandler(parser=_EXPORT_WORKER["parser"])
+    handler.set_realizing_refs(_EXPORT_WORKER["realizing_refs"])
+    handler.set_realized_refs(_EXPORT_WORKER["realized_refs"])
+    # Raw output: blank lines are removed when the chunks are merged in order.
+    handler._writer = YAMLChunkWriter(strip_blank_lines=False)
+    for uuid in uuids:
+        handler.generate_yaml(model.by_uuid(uuid))
+    handler.image_store.close()
+    return "".join(handler._writer._chunks)
+
+
+def export_model(model, path="capella_model.yaml", workers=1, *, model_path=None, model_kwargs=None,
+                 chunk_size=None, parser=None, realizing_refs=False, realized_refs=False, cache_file=None):
+    """
+    Export every OA/SA/LA/PA element of a model to one YAML file.
+
+    The elements are the ones returned by CapellaYAMLHandler.get_entire_model.
+    With workers > 1 the element list is split into chunks that are rendered
+    in a process pool, each worker loading the model once. The chunks are
+    merged in element order, so the file matches the serial output byte for
+    byte. Embedded description images are named after their content, so the
+    workers write the same image files as a serial run.
+
+    :param model: capellambse.MelodyModel, or the path of the .aird file to load.
+    :param path: Output YAML file.
+    :param workers: Number of worker processes (1 renders in this process).
+    :param model_path: Path of the .aird file for the workers. Required when
+        workers > 1 and ``model`` is an already loaded MelodyModel.
+    :param model_kwargs: Extra keyword arguments for capellambse.MelodyModel
+        (e.g. resources), used wherever the model is loaded from a path.
+    :param chunk_size: Objects per worker task (default: about 4 tasks per worker).
+    :param parser: Optional TcItemRevisionParser for Teamcenter metadata.
+    :param realizing_refs: Include realizing references (see set_realizing_refs).
+    :param realized_refs: Include realized references (see set_realized_refs).
+    :param cache_file: Side-car cache for an incremental export (see
+        set_incremental_cache). Rendered in this process, so workers must be 1.
+    :return: Path of the written YAML file.
+    """
+    model_kwargs = model_kwargs or {}
+    if isinstance(model, (str, os.PathLike)):
+        model_path = model_path or model
+        model = capellambse.MelodyModel(model, **model_kwargs)
+    if workers > 1 and model_path is None:
+        raise ValueError("export_model needs model_path when workers > 1 and a loaded model is passed.")
+    if workers > 1 and cache_file is not None:
+        raise ValueError("export_model renders incrementally in this process only, use workers=1 with cache_file.")
+
+    handler = CapellaYAMLHandler(parser=parser)
+    handler.set_realizing_refs(realizing_refs)
+    handler.set_realized_refs(realized_refs)
+    if cache_file is not None:
+        handler.set_incremental_cache(cache_file)
+    objects = handler.get_entire_model(model)
+    handler.open_output_file(path)
+    try:
+        if workers <= 1:
+            for obj in objects:
+                handler.generate_yaml(obj)
+        else:
+            uuids = [obj.uuid for obj in objects]
+            chunk_size = chunk_size or max(1, math.ceil(len(uuids) / (workers * 4)))
+            chunks = [uuids[i:i + chunk_size] for i in range(0, len(uuids), chunk_size)]
+            initargs = (str(model_path), model_kwargs, parser, realizing_refs, realized_refs)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_export_worker, initargs=initargs) as pool:
+                for rendered in pool.map(_render_export_chunk, chunks):
+                    handler._write(rendered)
+    finally:
+        handler.write_output_file()
+    print(f"✅ Exported {len(objects)} model objects to {path}")
+    return path
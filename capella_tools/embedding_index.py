@@ -0,0 +1,489 @@
+# Copyright Siemens AG
+# Licensed under the Apache License, Version 2.0 (see full text in LICENSES/Apache-2.0.txt)
+
+# Dot-files are licensed under CC0-1.0 (see full text in LICENSES/CC0-1.0.txt)
+
+# To provide the same look and feel across platforms, this library is bundled
+# with the OpenSans font (capellambse/OpenSans-Regular.ttf).
+# The OpenSans font is Copyright 2020 The Open Sans Project Authors,
+# licensed under OFL-1.1 (see full text in LICENSES/OFL-1.1.txt)
+
+
+#embedding_index
+"""
+Search indexes for EmbeddingManager: approximate nearest-neighbour and lexical.
+
+IVFIndex only needs NumPy: the vectors are clustered with spherical k-means
+and a query only scores the rows of its n_probe closest clusters. HNSWIndex
+wraps hnswlib when it is installed. Both return matrix row numbers and cosine
+similarities, so EmbeddingManager can map them back to its items.
+CompressedIndex scans a PCA / random projection and/or int8 copy of the
+vectors and reranks its candidates with the full ones; recall_at_k measures
+any of them against exact search.
+
+BM25Index is the lexical counterpart: an inverted index over the item texts,
+returning row numbers and BM25 scores.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+def rows_checksum(uuids):
+    """Checksum of the row order an index was built for, to detect stale indexes."""
+    return hashlib.sha1("\n".join(str(uuid) for uuid in uuids).encode("utf-8")).hexdigest()
+
+
+def _top(scores, top_n):
+    """Positions of the top_n highest scores, best first."""
+    if top_n < len(scores):
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class IVFIndex:
+    """
+    Inverted-file index (NumPy only).
+
+    :param n_lists: Number of clusters (default: sqrt of the row count).
+    :param n_probe: Clusters scored per query; higher means better recall and slower queries.
+    :param n_iter: k-means iterations when building.
+    :param seed: Random seed for the k-means start.
+    """
+
+    kind = "ivf"
+    suffix = ".ivf.npz"
+
+    def __init__(self, n_lists=None, n_probe=8, n_iter=10, seed=0):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.seed = seed
+        self.matrix = None
+        self.centroids = None
+        self.order = None
+        self.offsets = None
+        self.checksum = None
+
+    @property
+    def count(self):
+        return 0 if self.order is None else len(self.order)
+
+    def _assign(self, vectors, chunk=8192):
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk):
+            labels[start:start + chunk] = np.argmax(vectors[start:start + chunk] @ self.centroids.T, axis=1)
+        return labels
+
+    def build(self, matrix, checksum=None):
+        """Cluster the rows of a row-normalized matrix."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        n_rows = len(matrix)
+        n_lists = max(1, min(self.n_lists or int(np.sqrt(n_rows)), n_rows))
+        rng = np.random.default_rng(self.seed)
+        # Train on a sample: ~256 rows per cluster is plenty for the centroids.
+        sample_size = min(n_rows, 256 * n_lists)
+        sample = matrix[rng.choice(n_rows, sample_size, replace=False)] if sample_size < n_rows else matrix
+        self.centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            labels = self._assign(sample)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, labels, sample)
+            empty = ~np.bincount(labels, minlength=n_lists).astype(bool)
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]  # re-seed empty clusters
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self.centroids = sums / norms
+        labels = self._assign(matrix)
+        self.order = np.argsort(labels, kind="stable")
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=n_lists))))
+        self.matrix = matrix
+        self.checksum = checksum
+        return self
+
+    def search(self, query, top_n, n_probe=None):
+        """Return (row numbers, similarities) of the best top_n rows for a normalized query."""
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        lists = _top(self.centroids @ query, n_probe)
+        rows = np.concatenate([self.order[self.offsets[l]:self.offsets[l + 1]] for l in lists])
+        scores = self.matrix[rows] @ query
+        top = _top(scores, top_n)
+        return rows[top], scores[top]
+
+    def save(self, path):
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, centroids=self.centroids, order=self.order, offsets=self.offsets,
+                     params=np.array(json.dumps({"n_probe": self.n_probe, "checksum": self.checksum})))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, matrix, n_probe=None):
+        with np.load(path) as data:
+            params = json.loads(str(data["params"]))
+            index = cls(n_lists=len(data["centroids"]), n_probe=n_probe or params["n_probe"])
+            index.centroids = data["centroids"]
+            index.order = data["order"]
+            index.offsets = data["offsets"]
+        index.checksum = params.get("checksum")
+        index.matrix = matrix
+        return index
+
+
+class HNSWIndex:
+    """
+    HNSW graph index (requires hnswlib).
+
+    :param M: Graph degree; higher means better recall and more memory.
+    :param ef_construction: Build-time search width.
+    :param ef: Query-time search width; higher means better recall and slower queries.
+    """
+
+    kind = "hnsw"
+    suffix = ".hnsw.bin"
+
+    def __init__(self, M=16, ef_construction=200, ef=64):
+        if hnswlib is None:
+            raise ImportError("HNSWIndex needs hnswlib (pip install hnswlib); use IVFIndex otherwise.")
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef = ef
+        self.index = None
+        self.checksum = None
+
+    @property
+    def count(self):
+        return 0 if self.index is None else self.index.get_current_count()
+
+    def build(self, matrix, checksum=None):
+        matrix = np.asarray(matrix, dtype=np.float32)
+        self.index = hnswlib.Index(space="ip", dim=matrix.shape[1])
+        self.index.init_index(max_elements=len(matrix), ef_construction=self.ef_construction, M=self.M)
+        self.index.add_items(matrix, np.arange(len(matrix)))
+        self.index.set_ef(self.ef)
+        self.checksum = checksum
+        return self
+
+    def search(self, query, top_n, ef=None):
+        top_n = min(top_n, self.count)
+        self.index.set_ef(max(ef or self.ef, top_n))
+        labels, distances = self.index.knn_query(query, k=top_n)
+        # "ip" distance is 1 - inner product.
+        return labels[0].astype(np.int64), 1.0 - distances[0]
+
+    def save(self, path):
+        self.index.save_index(str(path))
+        with open(str(path) + ".json", "w", encoding="utf-8") as f:
+            json.dump({"ef": self.ef, "checksum": self.checksum}, f)
+
+    @classmethod
+    def load(cls, path, matrix, ef=None):
+        with open(str(path) + ".json", "r", encoding="utf-8") as f:
+            params = json.load(f)
+        index = cls(ef=ef or params["ef"])
+        index.index = hnswlib.Index(space="ip", dim=matrix.shape[1])
+        index.index.load_index(str(path), max_elements=len(matrix))
+        index.index.set_ef(index.ef)
+        index.checksum = params.get("checksum")
+        return index
+
+
+class CompressedIndex:
+    """
+    Compressed copy of the vectors, scanned instead of the full matrix.
+
+    The vectors are projected to fewer dimensions (PCA fitted on the vectors
+    themselves, or a random Gaussian projection) and/or quantized to int8 with
+    one scale per row. Searches score the compressed rows, then rescore the
+    best top_n * rerank candidates with the full vectors when the full matrix
+    is available.
+
+    :param reduce: None, "pca" or "random".
+    :param dim: Dimensions after the projection.
+    :param quantize: None or "int8".
+    :param rerank: Candidates per result rescored with the full vectors (0 turns reranking off).
+    :param seed: Random seed for the sample and the random projection.
+    """
+
+    kind = "compressed"
+    suffix = ".cmp.npz"
+
+    def __init__(self, reduce="pca", dim=256, quantize="int8", rerank=4, seed=0):
+        if reduce not in (None, "pca", "random"):
+            raise ValueError(f"Unknown reduction: {reduce}")
+        if quantize not in (None, "int8"):
+            raise ValueError(f"Unknown quantization: {quantize}")
+        self.reduce = reduce
+        self.dim = dim
+        self.quantize = quantize
+        self.rerank = rerank
+        self.seed = seed
+        self.projection = None
+        self.codes = None
+        self.scales = None
+        self.explained_variance = None
+        self.matrix = None
+        self.checksum = None
+
+    @property
+    def count(self):
+        return 0 if self.codes is None else len(self.codes)
+
+    @property
+    def bytes_per_vector(self):
+        """Stored bytes per vector (codes plus the int8 scale)."""
+        if self.codes is None:
+            return 0
+        return self.codes.shape[1] * self.codes.itemsize + (4 if self.scales is not None else 0)
+
+    def _fit(self, matrix):
+        n_rows, n_dims = matrix.shape
+        rng = np.random.default_rng(self.seed)
+        dim = min(self.dim, n_dims)
+        if self.reduce == "random":
+            self.projection = (rng.standard_normal((n_dims, dim)) / np.sqrt(dim)).astype(np.float32)
+        elif self.reduce == "pca":
+            # Uncentered PCA: the best rank-dim approximation of the dot products.
+            sample = matrix[rng.choice(n_rows, 20000, replace=False)] if n_rows > 20000 else matrix
+            _, singular, components = np.linalg.svd(np.asarray(sample, dtype=np.float32), full_matrices=False)
+            self.projection = np.ascontiguousarray(components[:dim].T)
+            energy = singular ** 2
+            self.explained_variance = float(energy[:dim].sum() / energy.sum()) if energy.sum() else 1.0
+        else:
+            self.projection = None
+
+    def _project(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return vectors if self.projection is None else vectors @ self.projection
+
+    def build(self, matrix, checksum=None, chunk=8192):
+        """Fit the projection on a row-normalized matrix and encode its rows."""
+        self._fit(matrix)
+        reduced = np.concatenate([self._project(matrix[start:start + chunk])
+                                  for start in range(0, len(matrix), chunk)]) if len(matrix) else np.zeros((0, 0))
+        if self.quantize == "int8":
+            scales = np.abs(reduced).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self.codes = np.round(reduced / scales[:, None]).astype(np.int8)
+            self.scales = scales.astype(np.float32)
+        else:
+            self.codes = reduced.astype(np.float32)
+            self.scales = None
+        self.matrix = matrix
+        self.checksum = checksum
+        return self
+
+    def approximate_scores(self, query, chunk=1024):
+        """Approximate similarity of every row to a normalized query."""
+        query = self._project(query)
+        if self.scales is None:
+            return self.codes @ query
+        # Cache-sized chunks: converting the whole int8 matrix per query is slower.
+        scores = np.empty(len(self.codes), dtype=np.float32)
+        for start in range(0, len(self.codes), chunk):
+            scores[start:start + chunk] = self.codes[start:start + chunk].astype(np.float32) @ query
+        return scores * self.scales
+
+    def search(self, query, top_n, rerank=None):
+        """
+        Return (row numbers, similarities) of the best top_n rows.
+
+        With reranking, the similarities are the exact cosine similarities of
+        the full vectors; otherwise they are the approximate scores.
+        """
+        rerank = self.rerank if rerank is None else rerank
+        scores = self.approximate_scores(query)
+        if not rerank or self.matrix is None:
+            top = _top(scores, top_n)
+            return top, scores[top]
+        # Sorted rows read a memory-mapped matrix front to back.
+        candidates = np.sort(_top(scores, top_n * rerank))
+        exact = np.asarray(self.matrix[candidates]) @ query
+        top = _top(exact, top_n)
+        return candidates[top], exact[top]
+
+    def save(self, path):
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        params = {"reduce": self.reduce, "dim": self.dim, "quantize": self.quantize, "rerank": self.rerank,
+                  "seed": self.seed, "explained_variance": self.explained_variance, "checksum": self.checksum}
+        arrays = {"codes": self.codes, "params": np.array(json.dumps(params))}
+        if self.projection is not None:
+            arrays["projection"] = self.projection
+        if self.scales is not None:
+            arrays["scales"] = self.scales
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, matrix=None, rerank=None):
+        with np.load(path) as data:
+            params = json.loads(str(data["params"]))
+            index = cls(reduce=params["reduce"], dim=params["dim"], quantize=params["quantize"],
+                        rerank=params["rerank"] if rerank is None else rerank, seed=params["seed"])
+            index.codes = data["codes"]
+            index.projection = data["projection"] if "projection" in data else None
+            index.scales = data["scales"] if "scales" in data else None
+        index.explained_variance = params.get("explained_variance")
+        index.checksum = params.get("checksum")
+        index.matrix = matrix
+        return index
+
+
+def recall_at_k(index, matrix, queries, ks=(1, 5, 10, 20)):
+    """
+    Recall@k of an index against exact search.
+
+    :param index: Any index of this module, built over ``matrix``.
+    :param matrix: The row-normalized matrix (exact search reference).
+    :param queries: Normalized query vectors, one per row.
+    :return: {k: fraction of the exact top k found in the index's top k}, plus
+        "ms_per_query" (mean index search time).
+    """
+    ks = [k for k in ks if k <= len(matrix)]
+    if not ks:
+        return {}
+    k_max = max(ks)
+    found = {k: 0 for k in ks}
+    elapsed = 0.0
+    for query in queries:
+        exact = _top(np.asarray(matrix) @ query, k_max)
+        start = time.perf_counter()
+        rows, _ = index.search(query, k_max)
+        elapsed += time.perf_counter() - start
+        for k in ks:
+            found[k] += len(set(exact[:k].tolist()) & set(np.asarray(rows[:k]).tolist()))
+    result = {k: found[k] / (k * len(queries)) for k in ks}
+    result["ms_per_query"] = 1000 * elapsed / max(1, len(queries))
+    return result
+
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+(?:[-_./:][0-9a-z]+)*")
+_TOKEN_SPLIT_RE = re.compile(r"[-_./:]")
+
+
+def tokenize(text):
+    """
+    Lower-case word tokens of a text.
+
+    Compound tokens such as part numbers ("PN-1234.5") are kept whole and
+    also split into their parts, so both forms match.
+    """
+    tokens = []
+    for token in _TOKEN_RE.findall(str(text).casefold()):
+        tokens.append(token)
+        parts = _TOKEN_SPLIT_RE.split(token)
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if part)
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index over short documents (one per matrix row).
+
+    :param k1: Term frequency saturation.
+    :param b: Document length normalization.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.count = 0
+        self._postings = {}
+        self._idf = {}
+        self._norm = None
+
+    def build(self, documents):
+        """Index a list of texts; row i is documents[i]."""
+        postings = {}
+        lengths = np.zeros(len(documents), dtype=np.float32)
+        for row, text in enumerate(documents):
+            tokens = tokenize(text)
+            lengths[row] = len(tokens)
+            for token in tokens:
+                term_rows = postings.setdefault(token, {})
+                term_rows[row] = term_rows.get(row, 0) + 1
+        self.count = len(documents)
+        average = float(lengths.mean()) if len(documents) and lengths.mean() > 0 else 1.0
+        # Per-row part of the BM25 denominator: k1 * (1 - b + b * len / avg_len)
+        self._norm = self.k1 * (1 - self.b + self.b * lengths / average)
+        self._postings = {}
+        self._idf = {}
+        for token, term_rows in postings.items():
+            rows = np.fromiter(term_rows.keys(), dtype=np.int64, count=len(term_rows))
+            freqs = np.fromiter(term_rows.values(), dtype=np.float32, count=len(term_rows))
+            self._postings[token] = (rows, freqs)
+            self._idf[token] = float(np.log(1 + (self.count - len(rows) + 0.5) / (len(rows) + 0.5)))
+        return self
+
+    def scores(self, query):
+        """BM25 score of every row for a query."""
+        scores = np.zeros(self.count, dtype=np.float32)
+        for token in set(tokenize(query)):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            rows, freqs = posting
+            scores[rows] += self._idf[token] * freqs * (self.k1 + 1) / (freqs + self._norm[rows])
+        return scores
+
+    def search(self, query, top_n, rows=None):
+        """
+        Return (row numbers, scores) of the best top_n rows with a positive score.
+
+        :param rows: Only consider these rows; None considers all.
+        """
+        scores = self.scores(query)
+        if rows is not None:
+            scores = scores[rows]
+        candidates = np.flatnonzero(scores > 0)
+        top = candidates[_top(scores[candidates], top_n)]
+        found = top if rows is None else np.asarray(rows)[top]
+        return found, scores[top]
+
+
+def reciprocal_rank_fusion(*rankings, k=60):
+    """
+    Fuse rankings (sequences of row numbers, best first) by reciprocal rank.
+
+    :return: Row numbers ordered by their summed 1 / (k + rank).
+    """
+    fused = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            fused[int(row)] = fused.get(int(row), 0.0) + 1.0 / (k + rank)
+    return sorted(fused, key=fused.get, reverse=True)
+
+
+INDEX_TYPES = {IVFIndex.kind: IVFIndex, HNSWIndex.kind: HNSWIndex, CompressedIndex.kind: CompressedIndex}
+
+
+def build_index(matrix, kind="ivf", checksum=None, **params):
+    """Build an index of the given kind ("ivf", "hnsw" or "compressed") over a row-normalized matrix."""
+    return INDEX_TYPES[kind](**params).build(matrix, checksum=checksum)
+
+
+def index_file(embedding_file, kind="ivf"):
+    """Index file next to an embedding file: model.json -> model.ivf.npz / model.hnsw.bin / model.cmp.npz."""
+    return Path(embedding_file).with_suffix(INDEX_TYPES[kind].suffix)
+
+
+def load_index(path, matrix, kind="ivf", **params):
+    """Load an index saved with ``index.save(path)`` for the given matrix."""
+    return INDEX_TYPES[kind].load(path, matrix, **params)
@@ -9,6 +9,7 @@
 # licensed under OFL-1.1 (see full text in LICENSES/OFL-1.1.txt)
 
 import json
+import threading
 from pathlib import Path
 from getpass import getpass
 from IPython.display import display, Markdown
@@ -37,6 +38,60 @@ def get_model():
     path = Path.home() / ".secrets" / "openai_model.txt"
     return path.read_text().strip() if path.exists() else "gpt-4o"  # fallback default
 
+# Shared OpenAI clients, one per (base_url, api_key), so chat turns and embedding
+# requests reuse keep-alive connections instead of a new pool and TLS handshake.
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+CLIENT_OPTIONS = {
+    "timeout": 600.0,                 # Seconds for a whole request (long completions)
+    "connect_timeout": 10.0,          # Seconds to establish a connection
+    "max_connections": 20,            # Open connections per client
+    "max_keepalive_connections": 10,  # Idle connections kept for reuse
+    "keepalive_expiry": 60.0,         # Seconds an idle connection is kept
+}
+
+def set_client_options(**options):
+    """
+    Change the timeouts and connection limits of the shared OpenAI clients.
+
+    Accepts the keys of CLIENT_OPTIONS. Clients created before keep their
+    settings; the next get_openai_client call creates new ones.
+    """
+    unknown = set(options) - set(CLIENT_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown client option(s): {', '.join(sorted(unknown))}")
+    with _CLIENTS_LOCK:
+        CLIENT_OPTIONS.update(options)
+        _CLIENTS.clear()
+
+def get_openai_client(api_key=None, base_url=None):
+    """
+    Return the shared OpenAI client for a base URL and API key, creating it on first use.
+
+    The client keeps its HTTP connections alive between requests and is safe
+    to use from several threads.
+    """
+    key = (base_url or None, api_key or None)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            try:
+                import httpx
+            except ImportError:  # newer openai releases are built on httpx2
+                import httpx2 as httpx
+            from openai import OpenAI
+            options = dict(CLIENT_OPTIONS)
+            http_client = httpx.Client(
+                timeout=httpx.Timeout(options["timeout"], connect=options["connect_timeout"]),
+                limits=httpx.Limits(
+                    max_connections=options["max_connections"],
+                    max_keepalive_connections=options["max_keepalive_connections"],
+                    keepalive_expiry=options["keepalive_expiry"],
+                ),
+            )
+            client = _CLIENTS[key] = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+        return client
+
 def load_configs():
     if CONFIG_FILE.exists():
         with CONFIG_FILE.open() as f:
@@ -0,0 +1,342 @@
+# Copyright Siemens AG
+# Licensed under the Apache License, Version 2.0 (see full text in LICENSES/Apache-2.0.txt)
+
+# Dot-files are licensed under CC0-1.0 (see full text in LICENSES/CC0-1.0.txt)
+
+# To provide the same look and feel across platforms, this library is bundled
+# with the OpenSans font (capellambse/OpenSans-Regular.ttf).
+# The OpenSans font is Copyright 2020 The Open Sans Project Authors,
+# licensed under OFL-1.1 (see full text in LICENSES/OFL-1.1.txt)
+
+
+#rag_context
+"""
+Token-budgeted context for ChatGPTAnalyzer prompts.
+
+The YAML of CapellaYAMLHandler lists one object per item under
+``model.objects``. YAMLContextBuilder splits it into those items, ranks them
+by BM25 relevance to the prompt and packs the best ones into a token budget,
+keeping the schema header and the original item order so the result is still
+valid YAML.
+
+DocumentRetriever does the same for attached files: they are split into
+chunks, embedded once and stored on disk by file hash, and only the chunks
+closest to each prompt are sent.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+
+from capella_tools.embedding_index import BM25Index
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+_ENCODINGS = {}
+
+
+def count_tokens(text, model=None):
+    """
+    Tokens of a text: exact with tiktoken when it is installed, else about 4 characters per token.
+
+    :param model: Model name used to pick the tiktoken encoding.
+    """
+    if not text:
+        return 0
+    if tiktoken is None:
+        return len(text) // 4 + 1
+    encoding = _ENCODINGS.get(model)
+    if encoding is None:
+        try:
+            encoding = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("cl100k_base")
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        _ENCODINGS[model] = encoding
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+_ITEM_RE = re.compile(r"^(\s*)- ")
+_FIELD_RE = re.compile(r"^\s*-?\s*(name|type|primary_uuid):\s*(.*?)\s*$")
+
+
+def split_yaml_objects(yaml_content):
+    """
+    Split CapellaYAMLHandler YAML into the header and one text chunk per object.
+
+    :return: (header, chunks); header is everything up to the first object,
+        each chunk is the lines of one ``objects`` item.
+    """
+    lines = yaml_content.splitlines(keepends=True)
+    start = None
+    for i, line in enumerate(lines):
+        if line.strip() == "objects:":
+            start = i + 1
+            break
+    if start is None:
+        return yaml_content, []
+    indent = None
+    chunks = []
+    for line in lines[start:]:
+        match = _ITEM_RE.match(line)
+        if indent is None:
+            if match is None:
+                start += 1
+                continue
+            indent = match.group(1)
+        if match is not None and match.group(1) == indent:
+            chunks.append([line])
+        elif chunks:
+            chunks[-1].append(line)
+    return "".join(lines[:start]), ["".join(chunk) for chunk in chunks]
+
+
+def _chunk_fields(chunk):
+    """name, type and primary_uuid of an object chunk (from its own lines, not its references)."""
+    fields = {}
+    for line in chunk.splitlines():
+        match = _FIELD_RE.match(line)
+        if match and match.group(1) not in fields:
+            fields[match.group(1)] = match.group(2)
+        if len(fields) == 3:
+            break
+    return fields
+
+
+class YAMLContextBuilder:
+    """
+    Pack the objects of a YAML model export most relevant to a prompt into a token budget.
+
+    :param yaml_content: YAML from CapellaYAMLHandler.
+    :param model: LLM model name, for token counting.
+    """
+
+    def __init__(self, yaml_content, model=None):
+        self.model = model
+        self.header, self.chunks = split_yaml_objects(yaml_content)
+        self.header_tokens = count_tokens(self.header, model)
+        self.chunk_tokens = [count_tokens(chunk, model) for chunk in self.chunks]
+        self.fields = [_chunk_fields(chunk) for chunk in self.chunks]
+        self.index = BM25Index().build(self.chunks)
+        self.total_tokens = self.header_tokens + sum(self.chunk_tokens)
+        self.last_report = None
+
+    def build(self, query, budget_tokens):
+        """
+        Return the YAML of the objects that fit in budget_tokens, most relevant first.
+
+        Objects are taken by BM25 score against the query, then (for objects
+        without a match) in their export order; an object that does not fit
+        is skipped in favour of smaller ones further down. The selected
+        objects keep their original order in the output.
+        The report of what was included and dropped is kept in last_report.
+        """
+        scores = self.index.scores(query) if query else None
+        order = list(range(len(self.chunks)))
+        if scores is not None:
+            order.sort(key=lambda i: -scores[i])
+        remaining = budget_tokens - self.header_tokens
+        selected = []
+        for i in order:
+            if self.chunk_tokens[i] <= remaining:
+                selected.append(i)
+                remaining -= self.chunk_tokens[i]
+        selected.sort()
+        chosen = set(selected)
+        dropped = [i for i in order if i not in chosen]
+        self.last_report = {
+            "budget_tokens": budget_tokens,
+            "total_objects": len(self.chunks),
+            "total_tokens": self.total_tokens,
+            "included_objects": len(selected),
+            "included_tokens": self.header_tokens + sum(self.chunk_tokens[i] for i in selected),
+            "dropped_objects": len(dropped),
+            "dropped_tokens": sum(self.chunk_tokens[i] for i in dropped),
+            # Most relevant first, so the report shows what mattered most.
+            "dropped": [
+                dict(self.fields[i], tokens=self.chunk_tokens[i],
+                     score=float(scores[i]) if scores is not None else 0.0)
+                for i in dropped
+            ],
+        }
+        return self.header + "".join(self.chunks[i] for i in selected)
+
+    def print_report(self, max_dropped=10):
+        report = self.last_report
+        if report is None:
+            return
+        print(f"📐 Context: {report['included_objects']}/{report['total_objects']} objects, "
+              f"{report['included_tokens']}/{report['total_tokens']} tokens (budget {report['budget_tokens']})")
+        if report["dropped_objects"]:
+            print(f"✂️ Dropped {report['dropped_objects']} object(s), {report['dropped_tokens']} tokens")
+            relevant = [obj for obj in report["dropped"] if obj["score"] > 0][:max_dropped]
+            for obj in relevant:
+                print(f"   - {obj.get('name', '?')} ({obj.get('type', '?')}), "
+                      f"{obj['tokens']} tokens, score {obj['score']:.2f}")
+
+
+def split_text(text, chunk_tokens=400, overlap_tokens=50, model=None):
+    """
+    Split a text into chunks of about chunk_tokens tokens on line boundaries.
+
+    Consecutive chunks share about overlap_tokens tokens, so a passage cut at
+    a chunk boundary is still found whole in one of them. Lines longer than a
+    chunk are cut by characters.
+    """
+    max_chars = chunk_tokens * 4
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        while len(line) > max_chars:
+            lines.append(line[:max_chars])
+            line = line[max_chars:]
+        if line:
+            lines.append(line)
+    chunks = []
+    current = []
+    current_tokens = 0
+    for line in lines:
+        tokens = count_tokens(line, model)
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append("\n".join(current))
+            # Carry the tail of the chunk over as overlap.
+            overlap = []
+            overlap_count = 0
+            for previous in reversed(current):
+                overlap_count += count_tokens(previous, model)
+                if overlap_count > overlap_tokens:
+                    break
+                overlap.insert(0, previous)
+            current_tokens = sum(count_tokens(previous, model) for previous in overlap)
+            if current_tokens + tokens > chunk_tokens:
+                overlap, current_tokens = [], 0  # no room for an overlap before this line
+            current = overlap
+        current.append(line)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def file_hash(path):
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DocumentRetriever:
+    """
+    Chunked vector retrieval over attached documents.
+
+    Chunks are embedded through an EmbeddingManager and stored in store_dir
+    as <file hash>.npy (row-normalized vectors, memory-mapped on load) plus
+    <file hash>.json (chunks and settings). Attaching a file with the same
+    content again, in this or a later session, reuses the stored vectors.
+
+    :param embedding_manager: EmbeddingManager providing embed_texts/embed_query.
+    :param store_dir: Directory of the vector store.
+    :param chunk_tokens: Tokens per chunk.
+    :param overlap_tokens: Tokens shared by consecutive chunks.
+    """
+
+    def __init__(self, embedding_manager, store_dir="document_store", chunk_tokens=400, overlap_tokens=50):
+        self.embedding_manager = embedding_manager
+        self.store_dir = Path(store_dir)
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.documents = {}  # file hash -> {"path", "chunks", "matrix"}
+
+    def _settings(self):
+        return {
+            "llm_model": self.embedding_manager.model,
+            "chunk_tokens": self.chunk_tokens,
+            "overlap_tokens": self.overlap_tokens,
+        }
+
+    def _load(self, key):
+        meta_file = self.store_dir / f"{key}.json"
+        npy_file = self.store_dir / f"{key}.npy"
+        if not meta_file.exists() or not npy_file.exists():
+            return None
+        with open(meta_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("settings") != self._settings():
+            return None
+        matrix = np.load(npy_file, mmap_mode="r")
+        if len(matrix) != len(data.get("chunks", [])):
+            return None
+        return data["chunks"], matrix
+
+    def _save(self, key, path, chunks, matrix):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        npy_file = self.store_dir / f"{key}.npy"
+        tmp_file = npy_file.with_name(npy_file.name + ".tmp")
+        with open(tmp_file, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp_file, npy_file)
+        with open(self.store_dir / f"{key}.json", "w", encoding="utf-8") as f:
+            json.dump({"file": str(path), "settings": self._settings(), "chunks": chunks}, f)
+
+    def add_file(self, path, text):
+        """
+        Make a document searchable.
+
+        :param path: The attached file (its bytes are hashed).
+        :param text: Its extracted text.
+        :return: Number of chunks.
+        """
+        key = file_hash(path)
+        if key in self.documents:
+            print(f"♻️ `{path}` is already attached.")
+            return len(self.documents[key]["chunks"])
+        stored = self._load(key)
+        if stored is not None:
+            chunks, matrix = stored
+            print(f"♻️ `{path}`: {len(chunks)} chunk(s) loaded from the document store.")
+        else:
+            chunks = split_text(text, self.chunk_tokens, self.overlap_tokens, self.embedding_manager.model)
+            if chunks:
+                vectors = self.embedding_manager.embed_texts(chunks, context=Path(path).name)
+                matrix = np.asarray(vectors, dtype=np.float32)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                matrix /= norms
+            else:
+                matrix = np.zeros((0, 0), dtype=np.float32)
+            self._save(key, path, chunks, matrix)
+            print(f"✅ `{path}`: {len(chunks)} chunk(s) embedded and stored.")
+        self.documents[key] = {"path": str(path), "chunks": chunks, "matrix": matrix}
+        return len(chunks)
+
+    def search(self, query, top_k=5):
+        """Return the top_k (file path, chunk, similarity) over all attached documents, best first."""
+        documents = [document for document in self.documents.values() if document["chunks"]]
+        if not documents or top_k <= 0:
+            return []
+        query_vector = np.asarray(self.embedding_manager.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        if norm:
+            query_vector = query_vector / norm
+        scores = np.concatenate([np.asarray(document["matrix"]) @ query_vector for document in documents])
+        owners = [(document, i) for document in documents for i in range(len(document["chunks"]))]
+        return [
+            (owners[row][0]["path"], owners[row][0]["chunks"][owners[row][1]], float(scores[row]))
+            for row in np.argsort(-scores, kind="stable")[:top_k]
+        ]
+
+    def context(self, query, top_k=5):
+        """The top_k chunks for a query as one text block for the prompt ("" if nothing is attached)."""
+        results = self.search(query, top_k)
+        return "\n\n".join(
+            f"[{Path(path).name}, relevance {score:.2f}]\n{chunk}" for path, chunk, score in results
+        )